@@ -0,0 +1,77 @@
+import time
+import logging
+import threading
+
+from .config import MARKET_DATA_SETTINGS
+
+
+class AccountSnapshot:
+    """/v1/accounts 응답 한 번으로 만든 계좌 스냅샷"""
+    def __init__(self, accounts, fetched_at=None):
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+        self.accounts = {}
+        for account in accounts:
+            self.accounts[account['currency']] = {
+                'balance': float(account.get('balance', 0) or 0),
+                'locked': float(account.get('locked', 0) or 0),
+                'avg_buy_price': float(account.get('avg_buy_price', 0) or 0),
+                'unit_currency': account.get('unit_currency', 'KRW')
+            }
+
+    @staticmethod
+    def _currency(ticker):
+        # KRW-BTC -> BTC, BTC -> BTC
+        return ticker.split('-')[1] if '-' in ticker else ticker
+
+    def _get(self, ticker, field):
+        account = self.accounts.get(self._currency(ticker))
+        return account[field] if account else 0.0
+
+    def balance(self, ticker):
+        """주문 가능 수량"""
+        return self._get(ticker, 'balance')
+
+    def locked(self, ticker):
+        """주문 중 묶여 있는 수량"""
+        return self._get(ticker, 'locked')
+
+    def total(self, ticker):
+        """보유 수량 (주문 가능 + 묶여 있는 수량)"""
+        return self.balance(ticker) + self.locked(ticker)
+
+    def avg_buy_price(self, ticker):
+        """매수 평균가"""
+        return self._get(ticker, 'avg_buy_price')
+
+    def currencies(self):
+        """보유 중인 통화 목록"""
+        return list(self.accounts)
+
+    def age(self):
+        return time.monotonic() - self.fetched_at
+
+
+class AccountBook:
+    """짧은 TTL 동안 계좌 스냅샷을 재사용하는 계좌 조회기
+
+    같은 주기 안의 잔고 조회는 모두 메모리의 스냅샷으로 처리하고,
+    TTL이 지나거나 주문 후 invalidate()되면 /v1/accounts를 한 번만 다시 받는다.
+    """
+    def __init__(self, client, ttl=None):
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.ttl = MARKET_DATA_SETTINGS['ACCOUNT_TTL'] if ttl is None else ttl
+        self.snapshot = None
+        self._lock = threading.Lock()
+
+    def get(self, force=False):
+        """계좌 스냅샷 반환 (필요할 때만 새로 조회)"""
+        with self._lock:
+            if force or self.snapshot is None or self.snapshot.age() > self.ttl:
+                self.snapshot = AccountSnapshot(self.client.get_accounts())
+            return self.snapshot
+
+    def invalidate(self):
+        """주문 등으로 잔고가 바뀌었을 때 스냅샷 폐기"""
+        with self._lock:
+            self.snapshot = None
@@ -0,0 +1,152 @@
+import time
+import logging
+import threading
+from collections import deque
+
+import pandas as pd
+
+from .config import CANDLE_SETTINGS
+
+KST_OFFSET = 9 * 3600
+DEFAULT_INTERVALS = (1, 3, 5, 15, 60)
+
+
+def interval_key(minutes):
+    """분 단위 간격 -> 'minute5' 형식 키"""
+    return f"minute{minutes}"
+
+
+class CandleAggregator:
+    """체결(trade) 틱을 받아 여러 간격의 캔들을 로컬에서 만드는 집계기
+
+    (마켓, 간격)마다 만들어지는 중인 캔들 하나와 완성된 캔들 history개를 보관한다.
+    새 구간의 체결이 들어오거나 close_due()가 호출되면 캔들을 닫고
+    subscribe()로 등록한 콜백에 (market, interval, candle)을 전달한다.
+    체결이 없던 구간은 업비트와 같이 캔들을 만들지 않는다.
+
+    사용 예:
+        aggregator = CandleAggregator()
+        stream.subscribe('trade', aggregator.on_trade)
+        aggregator.subscribe(on_candle_closed)
+    """
+    def __init__(self, intervals=DEFAULT_INTERVALS, history=None):
+        self.logger = logging.getLogger(__name__)
+        self.steps = {interval_key(minutes): minutes * 60 for minutes in intervals}
+        self.history = history or CANDLE_SETTINGS['CAPACITY']
+        self.current = {}
+        self.closed = {}
+        self.callbacks = []
+        self.late_trades = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """캔들 완성 이벤트 콜백 등록: callback(market, interval, candle)"""
+        self.callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    def _emit(self, events):
+        for market, interval, candle in events:
+            for callback in list(self.callbacks):
+                try:
+                    callback(market, interval, candle)
+                except Exception as e:
+                    self.logger.error(f"캔들 완성 콜백 처리 실패: {str(e)}")
+
+    def _close(self, key, events):
+        candle = self.current.pop(key)
+        closed = self.closed.get(key)
+        if closed is None:
+            closed = self.closed[key] = deque(maxlen=self.history)
+        closed.append(candle)
+        events.append((key[0], key[1], candle))
+
+    def add_trade(self, market, price, volume, timestamp):
+        """체결 1건 반영 (timestamp: 초 단위 epoch)"""
+        events = []
+        with self._lock:
+            for interval, step in self.steps.items():
+                key = (market, interval)
+                start = int(timestamp) // step * step
+                candle = self.current.get(key)
+                if candle is not None and start > candle['start']:
+                    self._close(key, events)
+                    candle = None
+                if candle is None:
+                    closed = self.closed.get(key)
+                    if closed and start <= closed[-1]['start']:
+                        # 이미 닫힌 구간의 늦은 체결은 버린다
+                        self.late_trades += 1
+                        continue
+                    self.current[key] = {
+                        'start': start,
+                        'open': price,
+                        'high': price,
+                        'low': price,
+                        'close': price,
+                        'volume': volume,
+                        'value': price * volume
+                    }
+                elif start < candle['start']:
+                    self.late_trades += 1
+                else:
+                    if price > candle['high']:
+                        candle['high'] = price
+                    if price < candle['low']:
+                        candle['low'] = price
+                    candle['close'] = price
+                    candle['volume'] += volume
+                    candle['value'] += price * volume
+        self._emit(events)
+
+    def on_trade(self, message):
+        """WebSocket trade 메시지 또는 /v1/trades/ticks 항목 콜백
+
+        REST 체결 항목에는 code/trade_timestamp 대신 market/timestamp가 있다.
+        """
+        market = message.get('code') or message.get('market')
+        timestamp = message.get('trade_timestamp', message.get('timestamp'))
+        self.add_trade(market, float(message['trade_price']), float(message['trade_volume']),
+                       timestamp / 1000.0)
+
+    def close_due(self, now=None):
+        """구간이 끝났는데 다음 체결이 없어 열려 있는 캔들을 닫음"""
+        now = time.time() if now is None else now
+        events = []
+        with self._lock:
+            for key in list(self.current):
+                if self.current[key]['start'] + self.steps[key[1]] <= now:
+                    self._close(key, events)
+        self._emit(events)
+
+    def get_current(self, market, interval):
+        """만들어지는 중인 캔들 (없으면 None)"""
+        with self._lock:
+            candle = self.current.get((market, interval))
+            return dict(candle) if candle else None
+
+    def get_closed(self, market, interval, count=None):
+        """완성된 캔들 목록 (오래된 순)"""
+        with self._lock:
+            closed = list(self.closed.get((market, interval), []))
+        return closed[-count:] if count else closed
+
+    def to_frame(self, market, interval, include_current=True):
+        """전략에서 쓰는 캔들 DataFrame (KST 인덱스, candles_to_frame과 같은 컬럼)"""
+        with self._lock:
+            candles = list(self.closed.get((market, interval), []))
+            current = self.current.get((market, interval))
+            if include_current and current is not None:
+                candles.append(dict(current))
+        index = pd.to_datetime([c['start'] + KST_OFFSET for c in candles], unit='s')
+        df = pd.DataFrame(
+            [[c['open'], c['high'], c['low'], c['close'], c['volume'], c['value']] for c in candles],
+            columns=['open', 'high', 'low', 'close', 'volume', 'value'],
+            index=index,
+            dtype='float64'
+        )
+        df.attrs['market'] = market
+        df.attrs['interval'] = interval
+        return df
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .trader import UpbitTrader
+from .config import EXCHANGE_CLIENT_SETTINGS
+
+ORDER_DONE_STATES = ('done', 'cancel')
+
+
+class AsyncUpbitTrader:
+    """UpbitTrader와 같은 기능을 코루틴으로 제공하는 asyncio용 트레이더
+
+    네트워크 호출은 UpbitTrader(공유 커넥션 풀, 요청 수 제한, 캐시)를 그대로 쓰고
+    전용 스레드 풀에서 실행하므로, 여러 마켓 요청을 asyncio.gather로 동시에
+    보내도 이벤트 루프가 막히지 않는다.
+
+    사용 예:
+        async with AsyncUpbitTrader() as trader:
+            prices = await trader.get_current_prices(markets)
+            frames = await trader.get_candles_many(markets, 'minute5')
+    """
+    def __init__(self, trader=None, max_workers=None):
+        self.logger = logging.getLogger(__name__)
+        self.trader = trader or UpbitTrader()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or EXCHANGE_CLIENT_SETTINGS['POOL_MAXSIZE'],
+            thread_name_prefix='AsyncUpbit'
+        )
+
+    async def _run(self, fn, *args, priority=None, **kwargs):
+        call = functools.partial(fn, *args, **kwargs)
+        if priority is not None:
+            # 요청 우선순위는 스레드별로 적용되므로 실행 스레드 안에서 지정
+            call = functools.partial(self._with_priority, priority, call)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, call)
+
+    def _with_priority(self, priority, call):
+        with self.trader.request_priority(priority):
+            return call()
+
+    def close(self):
+        """스레드 풀 정리"""
+        self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def set_api_keys(self, access, secret):
+        """API 키 설정 (네트워크 호출 없음)"""
+        return self.trader.set_api_keys(access, secret)
+
+    # ------------------------------------------------------------------
+    # 시세
+    # ------------------------------------------------------------------
+    async def get_current_price(self, coin=None, priority=None):
+        """현재가 조회"""
+        return await self._run(self.trader.get_current_price, coin, priority=priority)
+
+    async def get_current_prices(self, markets, priority=None):
+        """여러 마켓 현재가를 /v1/ticker 일괄 조회로 갱신해 마켓별 dict로 반환"""
+        try:
+            refreshed = await self._run(self.trader.refresh_quotes, list(markets), priority=priority)
+            return {market: snapshot.to_dict() for market, snapshot in refreshed.items()}
+        except Exception as e:
+            self.logger.error(f"현재가 일괄 조회 실패: {str(e)}")
+            return {}
+
+    async def get_orderbook(self, coin=None, priority=None):
+        """로컬 호가창 조회"""
+        return await self._run(self.trader.get_orderbook, coin, priority=priority)
+
+    async def estimate_fill(self, amount, coin=None, side='bid'):
+        """시장가 주문 예상 체결가"""
+        return await self._run(self.trader.estimate_fill, amount, coin, side)
+
+    async def get_candles(self, coin=None, interval='minute5', count=None, priority=None):
+        """캔들 조회"""
+        return await self._run(self.trader.get_candles, coin, interval, count, priority=priority)
+
+    async def get_candles_many(self, markets, interval='minute5', count=None, priority=None):
+        """여러 마켓 캔들을 동시에 조회해 마켓별 dict로 반환"""
+        frames = await asyncio.gather(
+            *(self.get_candles(market, interval, count, priority=priority) for market in markets)
+        )
+        return dict(zip(markets, frames))
+
+    # ------------------------------------------------------------------
+    # 계좌
+    # ------------------------------------------------------------------
+    async def get_account_snapshot(self, force=False):
+        """계좌 스냅샷 조회"""
+        return await self._run(self.trader.get_account_snapshot, force)
+
+    async def get_balance(self, coin=None):
+        """잔고 조회"""
+        return await self._run(self.trader.get_balance, coin)
+
+    async def get_balances(self, coins):
+        """여러 코인 잔고 조회 (계좌 1회, 시세 일괄 조회 1회)"""
+        await self.get_current_prices(coins)
+        balances = await asyncio.gather(*(self.get_balance(coin) for coin in coins))
+        return dict(zip(coins, balances))
+
+    # ------------------------------------------------------------------
+    # 주문
+    # ------------------------------------------------------------------
+    async def buy_market_order(self, coin, amount):
+        """시장가 매수 (KRW 금액)"""
+        return await self._run(self.trader.buy_market_order, coin, amount)
+
+    async def sell_market_order(self, coin, volume):
+        """시장가 매도 (코인 수량)"""
+        return await self._run(self.trader.sell_market_order, coin, volume)
+
+    async def buy_limit_order(self, coin, price, volume):
+        """지정가 매수"""
+        return await self._run(self.trader.buy_limit_order, coin, price, volume)
+
+    async def sell_limit_order(self, coin, price, volume):
+        """지정가 매도"""
+        return await self._run(self.trader.sell_limit_order, coin, price, volume)
+
+    async def get_order(self, order_uuid):
+        """주문 상태 조회"""
+        return await self._run(self.trader.get_order, order_uuid)
+
+    async def get_orders(self, order_uuids):
+        """여러 주문 상태를 동시에 조회"""
+        return await asyncio.gather(*(self.get_order(order_uuid) for order_uuid in order_uuids))
+
+    async def cancel_order(self, order_uuid):
+        """주문 취소"""
+        return await self._run(self.trader.cancel_order, order_uuid)
+
+    async def wait_order(self, order_uuid, timeout=30.0, poll_interval=0.5):
+        """주문이 체결 완료/취소될 때까지 대기 후 마지막 주문 상태 반환"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        order = None
+        while True:
+            order = await self.get_order(order_uuid)
+            if order and order.get('state') in ORDER_DONE_STATES:
+                return order
+            if loop.time() + poll_interval > deadline:
+                self.logger.warning(f"주문 대기 시간 초과: {order_uuid}")
+                return order
+            await asyncio.sleep(poll_interval)
@@ -1,17 +1,33 @@
+import math
 import time
 import threading
 import pandas as pd
 from datetime import datetime
-from .strategies import RSIStrategy, MACDStrategy, AIStrategy
+from .strategies import RSIStrategy, MACDStrategy, AIStrategy, evaluate_strategy, BUY, SELL
+from .config import TRADE_SETTINGS
 import logging
 
+# check_exit()가 돌려주는 청산 사유 (backtest의 거래 사유와 같은 값)
+EXIT_STOP_LOSS = 'stop_loss'
+EXIT_TAKE_PROFIT = 'take_profit'
+
 class AutoTrader:
     def __init__(self, trader, strategy, settings):
         self.trader = trader
         self.strategy = strategy
         self.settings = settings
         self.running = False
+        self.last_decision = None
+        self.last_exit = None
         self.logger = logging.getLogger(__name__)
+        self.coin = settings.get('coin') or getattr(trader, 'coin', None)
+        self.amount = settings.get('amount') or TRADE_SETTINGS['DEFAULT_AMOUNT']
+        self.fee = settings.get('fee', TRADE_SETTINGS['FEE_RATE'])
+        # 손절/익절 비율(%)은 설정값, 없으면 TRADE_SETTINGS (None이면 사용 안 함)
+        self.stop_loss = settings.get('stop_loss', TRADE_SETTINGS['STOP_LOSS']
+                                      if TRADE_SETTINGS['USE_STOP_LOSS'] else None)
+        self.take_profit = settings.get('take_profit', TRADE_SETTINGS['TAKE_PROFIT']
+                                        if TRADE_SETTINGS['USE_TAKE_PROFIT'] else None)
         
     def start(self):
         """자동매매 시작"""
@@ -29,17 +45,59 @@ class AutoTrader:
             return
             
         try:
-            if self.strategy.should_buy(data):
-                self.execute_buy()
-            elif self.strategy.should_sell(data):
-                self.execute_sell()
+            # 지표를 한 번만 계산해 매수/매도/관망을 함께 판단
+            decision = evaluate_strategy(self.strategy, data)
+            self.last_decision = decision
+            balance = self.trader.get_balance(self.coin)
+            if balance is None:
+                return
+            # 손절/익절이 전략 신호보다 우선
+            self.last_exit = self.check_exit(balance)
+            if self.last_exit:
+                self.execute_sell(balance)
+            elif decision['action'] == BUY:
+                self.execute_buy(balance)
+            elif decision['action'] == SELL:
+                self.execute_sell(balance)
         except Exception as e:
             self.logger.error(f"거래 실행 중 오류 발생: {str(e)}")
             
-    def execute_buy(self):
-        """매수 실행"""
-        pass  # 실제 매수 로직 구현 필요
+    def holding(self, balance):
+        """최소 거래금액 이상 코인을 보유 중인지 (매도할 수 없는 잔량은 제외)"""
+        return balance['coin_value'] >= TRADE_SETTINGS['MIN_AMOUNT']
+        
+    def check_exit(self, balance):
+        """평균 매수가 대비 손익률이 손절/익절 비율에 닿았으면 그 사유, 아니면 None"""
+        if not self.holding(balance) or not balance['avg_buy_price']:
+            return None
+        cost = balance['coin_amount'] * balance['avg_buy_price']
+        rate = (balance['coin_value'] / cost - 1.0) * 100
+        if self.stop_loss and rate <= -self.stop_loss:
+            self.logger.info(f"손절 조건 도달 - {self.coin} 손익률: {rate:.2f}%")
+            return EXIT_STOP_LOSS
+        if self.take_profit and rate >= self.take_profit:
+            self.logger.info(f"익절 조건 도달 - {self.coin} 손익률: {rate:.2f}%")
+            return EXIT_TAKE_PROFIT
+        return None
+        
+    def execute_buy(self, balance=None):
+        """매수 실행 (보유 중이 아니면 설정 금액만큼 시장가 매수)"""
+        balance = balance or self.trader.get_balance(self.coin)
+        if balance is None or self.holding(balance):
+            return None
+        # 수수료까지 낼 수 있는 금액 안에서 원 단위로 주문
+        amount = math.floor(min(self.amount, balance['krw'] / (1 + self.fee)))
+        if amount < TRADE_SETTINGS['MIN_AMOUNT']:
+            self.logger.warning(f"매수 가능 금액 부족 - {self.coin} 보유 KRW: {balance['krw']:,.0f}원")
+            return None
+        return self.trader.buy_market_order(self.coin, amount)
         
-    def execute_sell(self):
-        """매도 실행"""
-        pass  # 실제 매도 로직 구현 필요 
\ No newline at end of file
+    def execute_sell(self, balance=None):
+        """매도 실행 (주문 가능한 보유 수량 전부 시장가 매도)"""
+        balance = balance or self.trader.get_balance(self.coin)
+        if balance is None or not self.holding(balance):
+            return None
+        volume = balance['coin_amount'] - balance['coin_locked']
+        if volume <= 0:
+            return None
+        return self.trader.sell_market_order(self.coin, volume) 
\ No newline at end of file
@@ -0,0 +1,160 @@
+import sys
+import time
+import logging
+import argparse
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .config import COIN_GROUPS
+from .candles import INTERVAL_SECONDS, MAX_CANDLES_PER_CALL, candles_to_frame, now_kst
+from .candle_db import CandleDatabase, to_timestamps
+from .exchange_client import UpbitClient
+
+KST_OFFSET = 9 * 3600
+
+
+def kst_to_utc_param(ts):
+    """KST epoch 초 -> 캔들 조회 'to' 파라미터 (UTC)"""
+    return datetime.fromtimestamp(ts - KST_OFFSET, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def kst_timestamp(value):
+    """datetime(KST, naive) -> epoch 초"""
+    return int((value - datetime(1970, 1, 1)).total_seconds())
+
+
+class Backfiller:
+    """여러 마켓의 과거 캔들을 병렬로 받아 로컬 DB에 채우는 백필러
+
+    마켓마다 최신 구간부터 과거로 200개씩 내려가며 저장하고, 페이지마다
+    진행 위치(backfill_progress)를 기록해 중단되어도 이어서 받는다.
+    마지막에 빈 구간을 찾아 다시 받고, 다시 받아도 비어 있는 구간(거래 없음)은
+    기록해 두어 다음 실행에서 건너뛴다. 요청 수 제한은 클라이언트의 스케줄러가 지킨다.
+    """
+    def __init__(self, client, db, interval='minute1', workers=4):
+        if interval not in INTERVAL_SECONDS:
+            raise ValueError(f"백필을 지원하지 않는 캔들 간격: {interval}")
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.db = db
+        self.interval = interval
+        self.step = INTERVAL_SECONDS[interval]
+        self.workers = workers
+
+    def _page_down(self, market, upper_ts, lower_ts, on_page=None):
+        """upper_ts(미포함) 이전부터 lower_ts까지 과거로 내려가며 저장
+
+        반환값: (저장 건수, 가장 오래된 캔들 ts, 더 이상 과거 캔들이 없는지 여부)
+        """
+        cursor = upper_ts
+        saved = 0
+        while cursor > lower_ts:
+            contents = self.client.get_candles(market, self.interval, MAX_CANDLES_PER_CALL,
+                                               to=kst_to_utc_param(cursor))
+            if not contents:
+                return saved, cursor, True
+            df = candles_to_frame(contents, market, self.interval)
+            ts = to_timestamps(df.index)
+            saved += self.db.upsert(market, self.interval, df[ts >= lower_ts])
+            oldest = int(ts.min())
+            if oldest >= cursor:
+                # 서버가 같은 구간을 반복해서 주면 중단
+                return saved, cursor, True
+            cursor = oldest
+            if on_page is not None:
+                on_page(cursor)
+            if len(contents) < MAX_CANDLES_PER_CALL:
+                return saved, cursor, True
+        return saved, cursor, False
+
+    def backfill_market(self, market, start_ts, end_ts):
+        """한 마켓의 [start_ts, end_ts] 구간 백필 후 결과 dict 반환"""
+        result = {'market': market, 'saved': 0, 'gaps_filled': 0, 'gaps_empty': 0}
+        upper = end_ts - end_ts % self.step + self.step
+
+        # 1) 최신 구간부터 과거로 (같은 구간의 중단된 작업이면 기록된 위치부터)
+        progress = self.db.get_progress(market, self.interval)
+        if progress and progress['start_ts'] == start_ts and progress['end_ts'] == end_ts:
+            cursor, done = progress['cursor_ts'], progress['done']
+        else:
+            cursor, done = upper, False
+            last = self.db.last_timestamp(market, self.interval)
+            if last is not None and start_ts <= last < upper:
+                # 이미 받아 둔 구간 위쪽만 새로 받고, 나머지는 빈 구간 검사로 채운다
+                saved, _, _ = self._page_down(market, upper, last)
+                result['saved'] += saved
+                cursor = self.db.first_timestamp(market, self.interval)
+                if cursor <= start_ts:
+                    done = True
+            self.db.save_progress(market, self.interval, start_ts, end_ts, cursor, done)
+
+        if not done:
+            saved, cursor, _ = self._page_down(
+                market, cursor, start_ts,
+                on_page=lambda ts: self.db.save_progress(market, self.interval, start_ts, end_ts, ts)
+            )
+            result['saved'] += saved
+            self.db.save_progress(market, self.interval, start_ts, end_ts, cursor, True)
+
+        # 2) 빈 구간 다시 받기
+        for gap_start, gap_end in self.db.find_gaps(market, self.interval, self.step, start_ts, end_ts):
+            self._page_down(market, gap_end + self.step, gap_start)
+            filled = self.db.count(market, self.interval, gap_start, gap_end)
+            if filled:
+                result['gaps_filled'] += 1
+                result['saved'] += filled
+            else:
+                self.db.mark_empty_gap(market, self.interval, gap_start, gap_end)
+                result['gaps_empty'] += 1
+        return result
+
+    def run(self, markets, start, end=None):
+        """여러 마켓을 병렬로 백필 (start/end: KST datetime)"""
+        end = end or now_kst()
+        start_ts, end_ts = kst_timestamp(start), kst_timestamp(end)
+        results = []
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.backfill_market, market, start_ts, end_ts): market
+                       for market in markets}
+            for future in as_completed(futures):
+                market = futures[future]
+                try:
+                    result = future.result()
+                    self.logger.info(f"백필 완료: {market} {result['saved']}건 저장, "
+                                     f"빈 구간 {result['gaps_filled']}개 채움")
+                except Exception as e:
+                    self.logger.error(f"백필 실패 ({market}): {str(e)}")
+                    result = {'market': market, 'error': str(e)}
+                results.append(result)
+        self.logger.info(f"전체 백필 {len(markets)}개 마켓, {time.perf_counter() - began:.1f}초")
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='업비트 과거 캔들 백필')
+    parser.add_argument('--markets', default='all',
+                        help="쉼표로 구분한 마켓 목록 또는 all (COIN_GROUPS 전체)")
+    parser.add_argument('--interval', default='minute1')
+    parser.add_argument('--days', type=float, default=30)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--db', default=None, help='캔들 DB 경로 (기본: CANDLE_SETTINGS)')
+    parser.add_argument('--base-url', default=None, help='API 주소 (로컬 대체 서버 테스트용)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    if args.markets == 'all':
+        markets = list(dict.fromkeys(m for group in COIN_GROUPS.values() for m in group))
+    else:
+        markets = [m.strip() for m in args.markets.split(',') if m.strip()]
+
+    client = UpbitClient(base_url=args.base_url, pool_maxsize=max(args.workers, 1))
+    db = CandleDatabase(args.db)
+    end = now_kst()
+    results = Backfiller(client, db, args.interval, args.workers).run(
+        markets, end - timedelta(days=args.days), end)
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+import sys
+import math
+import logging
+import argparse
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from . import kernels
+from .config import TRADE_SETTINGS, DEFAULT_FEE
+from .utils import round_to_tick, round_to_ticks
+from .candles import now_kst
+from .candle_db import CandleDatabase, to_timestamps
+from .registry import strategy_registry
+
+# 벡터 백테스트
+#
+# 전략의 봉별 매수/매도 신호를 전체 구간에서 한 번에 계산한 뒤 거래를 만든다.
+# 현물 매수 전략으로 보고 신호가 난 봉의 종가에 전 자산으로 진입/청산하며,
+# 매수가는 호가 단위로 올리고 매도가는 내려 체결가를 정한다. 보유 중에는
+# 다음 봉부터 고가/저가로 손절/익절 도달을 확인하고(같은 봉이면 손절 우선),
+# 손절/익절은 해당 가격(갭이면 시가)에 체결된다. 거래는 보유 구간 단위로만
+# 파이썬 반복을 돌고, 구간 안의 청산 위치는 배열 검색으로 찾는다.
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+EXIT_SIGNAL = 'signal'
+EXIT_STOP_LOSS = 'stop_loss'
+EXIT_TAKE_PROFIT = 'take_profit'
+EXIT_OPEN = 'open'
+
+logger = logging.getLogger(__name__)
+
+
+def signal_series(strategy, arrays):
+    """전략의 봉별 (매수, 매도) 신호 bool 배열 (같은 봉이면 매수가 우선)"""
+    signals = getattr(strategy, 'signals', None)
+    if signals is None:
+        raise ValueError(f"봉별 신호를 지원하지 않는 전략: {type(strategy).__name__}")
+    buy, sell = signals(arrays)
+    buy = np.asarray(buy, dtype=bool)
+    return buy, np.asarray(sell, dtype=bool) & ~buy
+
+
+def next_true(mask):
+    """각 위치에서 그 위치 이후(포함) 처음 True인 위치 (없으면 len(mask))"""
+    n = len(mask)
+    index = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(index[::-1])[::-1]
+
+
+def exit_rates(stop_loss=None, take_profit=None):
+    """손절/익절 비율(%)을 소수로 (None이면 TRADE_SETTINGS, 0/False면 사용 안 함)"""
+    if stop_loss is None:
+        stop_loss = TRADE_SETTINGS['STOP_LOSS'] if TRADE_SETTINGS['USE_STOP_LOSS'] else 0
+    if take_profit is None:
+        take_profit = TRADE_SETTINGS['TAKE_PROFIT'] if TRADE_SETTINGS['USE_TAKE_PROFIT'] else 0
+    return (stop_loss or 0) / 100.0, (take_profit or 0) / 100.0
+
+
+def to_arrays(data):
+    """캔들 DataFrame 또는 컬럼 배열 dict를 float64 컬럼 배열 dict로 (DatetimeIndex면 ts 포함)"""
+    if isinstance(data, pd.DataFrame):
+        arrays = {column: data[column].to_numpy(dtype=np.float64) for column in data.columns
+                  if column in ('open', 'high', 'low', 'close', 'volume', 'value')}
+        if isinstance(data.index, pd.DatetimeIndex):
+            arrays['ts'] = to_timestamps(data.index)
+        return arrays
+    return {column: (np.asarray(value) if column == 'ts' else kernels.as_array(value))
+            for column, value in data.items()}
+
+
+# 진입 직후 이만큼은 봉별로 비교하고, 그 뒤로는 배열 검색 구간을 4배씩 늘린다
+SCAN_WINDOW = 16
+
+
+def _exit_at(j, open_, low, stop, take):
+    if low[j] <= stop:
+        return j, min(open_[j], stop), EXIT_STOP_LOSS
+    return j, max(open_[j], take), EXIT_TAKE_PROFIT
+
+
+def _find_exit(start, end, low, high, open_, stop, take):
+    """start~end-1 봉에서 처음 손절/익절에 닿는 (위치, 체결가, 사유) (없으면 None)
+
+    매도 신호까지의 구간이 길어도 실제 청산 위치 근처까지만 검색하도록
+    검색 구간을 점점 늘려 가며 찾는다.
+    """
+    scan_end = min(end, start + SCAN_WINDOW)
+    for j in range(start, scan_end):
+        if low[j] <= stop or high[j] >= take:
+            return _exit_at(j, open_, low, stop, take)
+    pos, size = scan_end, SCAN_WINDOW * 4
+    while pos < end:
+        upto = min(end, pos + size)
+        hit = low[pos:upto] <= stop
+        hit |= high[pos:upto] >= take
+        if hit.any():
+            return _exit_at(pos + int(hit.argmax()), open_, low, stop, take)
+        pos, size = upto, size * 4
+    return None
+
+
+def simulate(arrays, buy, sell, fee=DEFAULT_FEE, stop_loss=None, take_profit=None, initial=1.0):
+    """신호 배열로 거래를 시뮬레이션해 (거래 목록, 봉별 자산) 반환
+
+    청산한 봉에서는 다시 진입하지 않는다. 마지막 봉까지 보유 중인 거래는
+    종가로 평가만 하고 사유를 'open'으로 남긴다.
+    """
+    close = arrays['close']
+    n = len(close)
+    low = arrays.get('low', close)
+    high = arrays.get('high', close)
+    open_ = arrays.get('open', close)
+    stop_rate, take_rate = exit_rates(stop_loss, take_profit)
+    next_buy = next_true(buy)
+    next_sell = next_true(sell)
+    # 신호 봉 종가 체결가는 한 번에 호가 단위로 맞춘다
+    entry_prices = np.zeros(n)
+    entry_prices[buy] = round_to_ticks(close[buy], 'ceil')
+    exit_prices = np.zeros(n)
+    exit_prices[sell] = round_to_ticks(close[sell], 'floor')
+    # 사용하지 않는 손절/익절은 닿을 수 없는 가격으로 둔다
+    no_stop, no_take = -np.inf, np.inf
+
+    quantity = np.zeros(n)
+    # 현금은 진입/청산 봉에만 기록한 뒤 앞으로 채운다
+    cash = np.full(n, np.nan)
+    cash[0] = initial
+    capital = initial
+    trades = []
+    i = int(next_buy[0]) if n else 0
+    while i < n:
+        entry = float(entry_prices[i])
+        units = capital * (1.0 - fee) / entry
+        stop = entry * (1.0 - stop_rate) if stop_rate else no_stop
+        take = entry * (1.0 + take_rate) if take_rate else no_take
+        signal_exit = int(next_sell[i + 1]) if i + 1 < n else n
+        found = None
+        if stop_rate or take_rate:
+            found = _find_exit(i + 1, min(signal_exit + 1, n), low, high, open_, stop, take)
+        if found is not None:
+            j, price, reason = found
+            price = round_to_tick(price, 'floor')
+        elif signal_exit < n:
+            j, price, reason = signal_exit, float(exit_prices[signal_exit]), EXIT_SIGNAL
+        else:
+            j, price, reason = n, None, EXIT_OPEN
+
+        quantity[i:j] = units
+        cash[i] = 0.0
+        trade = {'entry_index': i, 'entry_price': entry, 'quantity': units, 'exit_index': None,
+                 'exit_price': None, 'return': None, 'reason': reason}
+        if j < n:
+            proceeds = units * price * (1.0 - fee)
+            trade.update(exit_index=j, exit_price=price)
+            trade['return'] = proceeds / capital - 1.0
+            capital = proceeds
+            cash[j] = capital
+            i = int(next_buy[j + 1]) if j + 1 < n else n
+        else:
+            i = n
+        trades.append(trade)
+
+    index = np.where(np.isnan(cash), 0, np.arange(n))
+    np.maximum.accumulate(index, out=index)
+    equity = cash[index] + quantity * close
+    return trades, equity
+
+
+def drawdown(equity):
+    """직전 최고 자산 대비 하락률 (0 이하)"""
+    peak = np.maximum.accumulate(equity)
+    return equity / peak - 1.0
+
+
+def periods_per_year(ts):
+    """봉 시각(epoch 초) 간격으로 1년 봉 수 추정 (알 수 없으면 None)"""
+    if ts is None or len(ts) < 2:
+        return None
+    step = float(np.median(np.diff(ts)))
+    return SECONDS_PER_YEAR / step if step > 0 else None
+
+
+def summarize(trades, equity, ts=None):
+    """자산 곡선과 거래 목록의 요약 통계 dict"""
+    closed = np.array([trade['return'] for trade in trades if trade['return'] is not None])
+    wins = closed[closed > 0]
+    losses = closed[closed <= 0]
+    held = np.array([(trade['exit_index'] if trade['exit_index'] is not None else len(equity))
+                     - trade['entry_index'] for trade in trades])
+    returns = np.diff(equity) / equity[:-1] if len(equity) > 1 else np.zeros(0)
+    std = returns.std() if len(returns) else 0.0
+    per_year = periods_per_year(ts)
+    stats = {
+        'total_return': float(equity[-1] / equity[0] - 1.0) if len(equity) else 0.0,
+        'max_drawdown': float(drawdown(equity).min()) if len(equity) else 0.0,
+        'trades': len(trades),
+        'win_rate': float(len(wins) / len(closed)) if len(closed) else 0.0,
+        'avg_trade_return': float(closed.mean()) if len(closed) else 0.0,
+        'best_trade': float(closed.max()) if len(closed) else 0.0,
+        'worst_trade': float(closed.min()) if len(closed) else 0.0,
+        'profit_factor': float(wins.sum() / -losses.sum()) if losses.sum() < 0 else math.inf if len(wins) else 0.0,
+        'avg_bars_held': float(held.mean()) if len(held) else 0.0,
+        'exposure': float(held.sum() / len(equity)) if len(equity) else 0.0,
+        # 봉 시각이 있으면 연율화하고, 없으면 봉 단위 값
+        'sharpe': float(returns.mean() / std * math.sqrt(per_year or 1)) if std > 0 else 0.0
+    }
+    if per_year and len(equity) > 1 and equity[-1] > 0:
+        stats['cagr'] = float((equity[-1] / equity[0]) ** (per_year / (len(equity) - 1)) - 1.0)
+    return stats
+
+
+def run_backtest(strategy, data, fee=DEFAULT_FEE, stop_loss=None, take_profit=None, initial=1.0):
+    """한 마켓 캔들(DataFrame 또는 컬럼 배열 dict)로 백테스트
+
+    반환값은 {'equity', 'drawdown', 'trades', 'stats'}이며 자산은 initial 기준이다.
+    stop_loss/take_profit(%)을 생략하면 TRADE_SETTINGS를 따른다.
+    """
+    arrays = to_arrays(data)
+    buy, sell = signal_series(strategy, arrays)
+    trades, equity = simulate(arrays, buy, sell, fee, stop_loss, take_profit, initial)
+    ts = arrays.get('ts')
+    if ts is not None:
+        for trade in trades:
+            trade['entry_ts'] = int(ts[trade['entry_index']])
+            trade['exit_ts'] = int(ts[trade['exit_index']]) if trade['exit_index'] is not None else None
+    return {
+        'equity': equity,
+        'drawdown': drawdown(equity),
+        'trades': trades,
+        'stats': summarize(trades, equity, ts)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='전략 백테스트 (캔들 DB)')
+    parser.add_argument('--strategy', required=True, help='STRATEGIES 키 (예: RSI)')
+    parser.add_argument('--market', default='KRW-BTC')
+    parser.add_argument('--interval', default='minute1')
+    parser.add_argument('--days', type=float, default=365)
+    parser.add_argument('--db', default=None, help='캔들 DB 경로 (기본: CANDLE_SETTINGS)')
+    parser.add_argument('--param', action='append', default=[], help='전략 파라미터 name=value (여러 번 지정 가능)')
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE)
+    parser.add_argument('--initial', type=float, default=TRADE_SETTINGS['DEFAULT_AMOUNT'], help='초기 자산 (원)')
+    parser.add_argument('--stop-loss', type=float, default=None, help='손절 비율 %% (0이면 사용 안 함)')
+    parser.add_argument('--take-profit', type=float, default=None, help='익절 비율 %% (0이면 사용 안 함)')
+    parser.add_argument('--trades', default=None, help='거래 목록 CSV 경로')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    params = dict(item.split('=', 1) for item in args.param)
+    strategy = strategy_registry.create(args.strategy, params)
+    db = CandleDatabase(args.db)
+    arrays = db.load_arrays(args.market, args.interval, start=now_kst() - timedelta(days=args.days))
+    db.close()
+    if not len(arrays['close']):
+        logger.error(f"{args.market} {args.interval} 캔들이 없습니다.")
+        return 1
+
+    result = run_backtest(strategy, arrays, args.fee, args.stop_loss, args.take_profit, args.initial)
+    for name, value in result['stats'].items():
+        print(f"{name:18s} {value:,.4f}" if isinstance(value, float) else f"{name:18s} {value}")
+    if args.trades:
+        pd.DataFrame(result['trades']).to_csv(args.trades, index=False)
+        logger.info(f"거래 목록 저장: {args.trades}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import logging
+
+import numpy as np
+
+from .strategies import BUY, SELL, HOLD, make_decision, evaluate_strategy
+from .config import COIN_GROUPS
+
+# 배치 판단에 쓰는 캔들 컬럼
+BATCH_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+# 판단 결과를 벡터로 나타낼 때의 코드
+ACTION_CODES = {BUY: 1, SELL: -1, HOLD: 0}
+
+logger = logging.getLogger(__name__)
+
+
+def group_markets():
+    """COIN_GROUPS 전체 마켓 (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(market for markets in COIN_GROUPS.values() for market in markets))
+
+
+def stack_frames(frames, columns=BATCH_COLUMNS):
+    """마켓별 캔들 DataFrame을 봉 수가 같은 마켓끼리 (마켓 x 봉) 배열 dict로 묶기
+
+    EMA처럼 전체 구간에 의존하는 지표가 마켓별 계산과 같은 값이 되도록
+    길이를 자르거나 NaN으로 채우지 않고 봉 수별로 묶는다.
+    반환값은 [(마켓 목록, {컬럼: 2차원 배열}), ...]이다.
+    """
+    groups = {}
+    for market, frame in frames.items():
+        if frame is None or len(frame) == 0:
+            continue
+        groups.setdefault(len(frame), []).append(market)
+
+    stacked = []
+    for markets in groups.values():
+        present = [column for column in columns if all(column in frames[market] for market in markets)]
+        # 캔들 DataFrame은 float64 블록 하나이므로 통째로 꺼낸 뒤 컬럼을 고르는 편이 빠르다
+        positions = {}
+        rows = []
+        for market in markets:
+            frame = frames[market]
+            layout = tuple(frame.columns)
+            if layout not in positions:
+                positions[layout] = [layout.index(column) for column in present]
+            rows.append(frame.to_numpy(dtype=np.float64)[:, positions[layout]])
+        block = np.stack(rows)
+        arrays = {column: np.ascontiguousarray(block[:, :, i]) for i, column in enumerate(present)}
+        stacked.append((markets, arrays))
+    return stacked
+
+
+def supports_batch(strategy):
+    """전략이 (마켓 x 봉) 배열 판단을 지원하는지"""
+    return bool(getattr(strategy, 'supports_batch', hasattr(strategy, 'evaluate_batch')))
+
+
+def evaluate_batch(strategy, frames, strategy_for=None):
+    """여러 마켓을 한 번에 판단해 {마켓: 판단 결과} 반환 (입력 순서 유지)
+
+    전략에 evaluate_batch(arrays)가 있으면 봉 수가 같은 마켓끼리 한 번의
+    벡터 연산으로 판단하고, 없거나 지원하지 않으면 마켓별 evaluate로 대신한다.
+    strategy_for(market)를 넘기면 마켓별 판단에 그 마켓 전용 전략 객체를 써서
+    스트리밍 전략이 마켓마다 이어 온 지표 상태를 그대로 쓴다.
+    """
+    def single(market):
+        target = strategy_for(market) if strategy_for is not None else strategy
+        return evaluate_strategy(target, frames[market])
+
+    results = {}
+    if supports_batch(strategy):
+        for markets, arrays in stack_frames(frames):
+            decisions = None
+            try:
+                decisions = strategy.evaluate_batch(arrays)
+            except Exception as e:
+                logger.error(f"배치 판단 실패 ({type(strategy).__name__}): {str(e)}")
+            if decisions is None:
+                decisions = [single(market) for market in markets]
+            results.update(zip(markets, decisions))
+    else:
+        # 배치 지표가 없는 전략은 마켓별 판단으로 대신
+        for market, frame in frames.items():
+            if frame is not None and len(frame):
+                results[market] = single(market)
+
+    return {
+        market: results.get(market) or make_decision(HOLD, reason='캔들 데이터가 없습니다.')
+        for market in frames
+    }
+
+
+def action_vector(decisions, markets=None):
+    """판단 결과를 마켓 순서대로 매수 1 / 매도 -1 / 관망 0 벡터로 변환"""
+    markets = list(decisions) if markets is None else markets
+    return np.array([ACTION_CODES[decisions[market]['action']] for market in markets], dtype=np.int8)
+
+
+def scan_markets(candles, strategy, markets=None, interval='minute5', strategy_for=None):
+    """캔들 저장소의 여러 마켓을 한 번에 판단 (기본: COIN_GROUPS 전체)
+
+    저장소의 DataFrame을 복사하지 않고 바로 배열로 묶는다.
+    """
+    markets = group_markets() if markets is None else list(markets)
+    frames = candles.get_many(markets, interval, copy=False)
+    return evaluate_batch(strategy, frames, strategy_for)
@@ -0,0 +1,161 @@
+import time
+import threading
+from collections import OrderedDict
+
+from .config import MARKET_DATA_SETTINGS, CANDLE_SETTINGS
+from .rate_limiter import SingleFlight
+
+
+class MarketDataCache:
+    """키별 TTL과 LRU 제거를 지원하는 시세 데이터 캐시
+
+    키의 첫 요소(예: ('ticker', 'KRW-BTC')의 'ticker')로 기본 TTL을 정한다.
+    같은 키를 동시에 또는 연달아 요청하면 진행 중인 조회 하나를 함께 기다려,
+    한 주기 안의 모든 소비자가 같은 스냅샷을 받는다.
+    """
+    def __init__(self, max_entries=None, ttls=None, default_ttl=1.0):
+        self.max_entries = max_entries or MARKET_DATA_SETTINGS['CACHE_MAX_ENTRIES']
+        self.ttls = dict(MARKET_DATA_SETTINGS['CACHE_TTLS'] if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def ttl_for(self, key):
+        kind = key[0] if isinstance(key, tuple) else key
+        return self.ttls.get(kind, self.default_ttl)
+
+    def get(self, key):
+        """유효한 값 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        """값 저장 (용량 초과 시 가장 오래 안 쓴 항목 제거)"""
+        if ttl is None:
+            ttl = self.ttl_for(key)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, key, fetch, ttl=None):
+        """캐시에 없으면 fetch()로 조회 (같은 키의 동시 조회는 하나로 합침)"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def load():
+            # 앞선 조회가 방금 채운 값이 있으면 그대로 사용
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            loaded = fetch()
+            if loaded is not None:
+                self.put(key, loaded, ttl)
+            return loaded
+
+        return self._flight.do(key, load)
+
+    def invalidate(self, key=None):
+        """특정 키 또는 전체 삭제"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+
+class IndicatorCache:
+    """봉 단위로 계산한 지표를 전략끼리 나눠 쓰는 캐시
+
+    키는 (마켓, 간격, 첫 봉 시각, 마지막 봉 시각, 봉 수, 마지막 봉 값, 지표, 파라미터)이다.
+    마켓/간격은 캔들 DataFrame의 attrs에서 읽고, 없으면 첫 종가로 대신 구분한다.
+    마지막 봉 값을 키에 넣어 진행 중인 봉이 바뀌면 다시 계산하고, 같은 봉 안에서는
+    모든 전략과 매수/매도 판단이 한 번 계산한 결과를 재사용한다.
+    결과는 공유되므로 꺼낸 값을 수정하면 안 된다.
+    """
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or CANDLE_SETTINGS['INDICATOR_CACHE_SIZE']
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bar_key(df):
+        """캔들 DataFrame이 가리키는 봉 구간 식별 키"""
+        index = df.index
+        close = df['close']
+        market = df.attrs.get('market')
+        if market is None:
+            market = ('close', float(close.iat[0]))
+        last = tuple(float(df[column].iat[-1]) for column in ('high', 'low', 'close', 'volume')
+                     if column in df)
+        return (market, df.attrs.get('interval'), index[0], index[-1], len(df), last)
+
+    def get(self, df, name, params, compute):
+        """지표 값 반환 (이 봉에서 처음 요청될 때만 compute() 실행)"""
+        return self.get_for_bar(self.bar_key(df), name, params, compute)
+
+    def get_for_bar(self, bar, name, params, compute):
+        """bar_key()로 미리 구한 봉 키로 조회 (여러 지표를 연달아 꺼낼 때)"""
+        key = (bar, name, params)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+
+# 전략 전체가 함께 쓰는 지표 캐시
+indicator_cache = IndicatorCache()
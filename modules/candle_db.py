@@ -0,0 +1,226 @@
+import os
+import sqlite3
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .config import CANDLE_SETTINGS
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'value')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    market   TEXT    NOT NULL,
+    interval TEXT    NOT NULL,
+    ts       INTEGER NOT NULL,
+    open     REAL    NOT NULL,
+    high     REAL    NOT NULL,
+    low      REAL    NOT NULL,
+    close    REAL    NOT NULL,
+    volume   REAL    NOT NULL,
+    value    REAL    NOT NULL,
+    PRIMARY KEY (market, interval, ts)
+) WITHOUT ROWID
+"""
+
+_PROGRESS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backfill_progress (
+    market     TEXT    NOT NULL,
+    interval   TEXT    NOT NULL,
+    start_ts   INTEGER NOT NULL,
+    end_ts     INTEGER NOT NULL,
+    cursor_ts  INTEGER NOT NULL,
+    done       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (market, interval)
+)
+"""
+
+_EMPTY_GAP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS empty_gaps (
+    market   TEXT    NOT NULL,
+    interval TEXT    NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts   INTEGER NOT NULL,
+    PRIMARY KEY (market, interval, start_ts)
+)
+"""
+
+
+def to_timestamps(index):
+    """DatetimeIndex(KST, naive) -> 초 단위 정수 배열"""
+    return np.asarray(index.values, dtype='datetime64[s]').astype(np.int64)
+
+
+def from_timestamps(ts):
+    """초 단위 정수 배열 -> DatetimeIndex(KST, naive)"""
+    return pd.DatetimeIndex(np.asarray(ts, dtype=np.int64).astype('datetime64[s]'))
+
+
+class CandleDatabase:
+    """(마켓, 간격, 시각)을 기본키로 하는 SQLite 캔들 저장소
+
+    기본키가 곧 클러스터 인덱스(WITHOUT ROWID)라 마켓/간격별 시간 구간 조회가
+    인덱스 범위 스캔으로 끝난다. 시각은 캔들 시작 시각(KST)의 epoch 초로 저장한다.
+    """
+    def __init__(self, path=None):
+        self.logger = logging.getLogger(__name__)
+        self.path = path or CANDLE_SETTINGS['DB_PATH']
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.execute(_PROGRESS_SCHEMA)
+        self.conn.execute(_EMPTY_GAP_SCHEMA)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def upsert(self, market, interval, df):
+        """캔들 DataFrame 일괄 저장 (같은 시각은 덮어씀), 저장 건수 반환"""
+        if df is None or df.empty:
+            return 0
+        ts = to_timestamps(df.index)
+        values = df[list(PRICE_COLUMNS)].to_numpy(dtype=np.float64)
+        rows = [(market, interval, int(t)) + tuple(v) for t, v in zip(ts, values.tolist())]
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO candles (market, interval, ts, open, high, low, close, volume, value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.commit()
+        return len(rows)
+
+    def _query(self, market, interval, start=None, end=None, limit=None):
+        sql = "SELECT ts, open, high, low, close, volume, value FROM candles WHERE market = ? AND interval = ?"
+        params = [market, interval]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(self._ts(start))
+        if end is not None:
+            sql += " AND ts <= ?"
+            params.append(self._ts(end))
+        if limit is not None:
+            # 최근 limit개를 구한 뒤 시간순으로 뒤집는다
+            sql = f"SELECT * FROM ({sql} ORDER BY ts DESC LIMIT ?) ORDER BY ts"
+            params.append(int(limit))
+        else:
+            sql += " ORDER BY ts"
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _ts(value):
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        return int(to_timestamps(pd.DatetimeIndex([pd.Timestamp(value)]))[0])
+
+    def load_arrays(self, market, interval, start=None, end=None, limit=None):
+        """시간 구간 조회 결과를 컬럼별 NumPy 배열 dict로 반환 (ts 포함)"""
+        rows = self._query(market, interval, start, end, limit)
+        data = np.asarray(rows, dtype=np.float64).reshape(-1, 1 + len(PRICE_COLUMNS))
+        arrays = {'ts': data[:, 0].astype(np.int64)}
+        for i, column in enumerate(PRICE_COLUMNS, start=1):
+            arrays[column] = np.ascontiguousarray(data[:, i])
+        return arrays
+
+    def load(self, market, interval, start=None, end=None, limit=None):
+        """시간 구간 조회 결과를 전략에서 바로 쓰는 DataFrame으로 반환"""
+        arrays = self.load_arrays(market, interval, start, end, limit)
+        df = pd.DataFrame({column: arrays[column] for column in PRICE_COLUMNS},
+                          index=from_timestamps(arrays['ts']))
+        df.attrs['market'] = market
+        df.attrs['interval'] = interval
+        return df
+
+    def first_timestamp(self, market, interval):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MIN(ts) FROM candles WHERE market = ? AND interval = ?", (market, interval)
+            ).fetchone()
+        return row[0]
+
+    def last_timestamp(self, market, interval):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MAX(ts) FROM candles WHERE market = ? AND interval = ?", (market, interval)
+            ).fetchone()
+        return row[0]
+
+    def count(self, market, interval, start=None, end=None):
+        sql = "SELECT COUNT(*) FROM candles WHERE market = ? AND interval = ?"
+        params = [market, interval]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(self._ts(start))
+        if end is not None:
+            sql += " AND ts <= ?"
+            params.append(self._ts(end))
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()[0]
+
+    def series(self):
+        """저장된 (마켓, 간격) 목록"""
+        with self._lock:
+            return self.conn.execute("SELECT DISTINCT market, interval FROM candles").fetchall()
+
+    def find_gaps(self, market, interval, step, start=None, end=None):
+        """연속 캔들 사이 빈 구간 목록 [(빈 구간 시작 ts, 빈 구간 끝 ts), ...]
+
+        거래가 없어 캔들이 만들어지지 않은 것으로 확인된 구간(empty_gaps)은 제외한다.
+        """
+        ts = self.load_arrays(market, interval, start, end)['ts']
+        if len(ts) < 2:
+            return []
+        idx = np.nonzero(np.diff(ts) > step)[0]
+        known = set(row[0] for row in self._empty_gaps(market, interval))
+        gaps = []
+        for i in idx:
+            gap = (int(ts[i]) + step, int(ts[i + 1]) - step)
+            if gap[0] not in known:
+                gaps.append(gap)
+        return gaps
+
+    def _empty_gaps(self, market, interval):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT start_ts, end_ts FROM empty_gaps WHERE market = ? AND interval = ?",
+                (market, interval)
+            ).fetchall()
+
+    def mark_empty_gap(self, market, interval, start_ts, end_ts):
+        """다시 받아도 캔들이 없는 구간 기록 (이후 빈 구간 검사에서 제외)"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO empty_gaps (market, interval, start_ts, end_ts) VALUES (?, ?, ?, ?)",
+                (market, interval, int(start_ts), int(end_ts))
+            )
+            self.conn.commit()
+
+    def get_progress(self, market, interval):
+        """백필 진행 상황 조회 (없으면 None)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT start_ts, end_ts, cursor_ts, done FROM backfill_progress "
+                "WHERE market = ? AND interval = ?", (market, interval)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'start_ts': row[0], 'end_ts': row[1], 'cursor_ts': row[2], 'done': bool(row[3])}
+
+    def save_progress(self, market, interval, start_ts, end_ts, cursor_ts, done=False):
+        """백필 진행 상황 저장"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO backfill_progress (market, interval, start_ts, end_ts, cursor_ts, done) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (market, interval, int(start_ts), int(end_ts), int(cursor_ts), int(done))
+            )
+            self.conn.commit()
@@ -0,0 +1,255 @@
+import time
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from .config import CANDLE_SETTINGS
+from .candle_db import from_timestamps
+from .exchange_client import get_default_client
+
+KST = timezone(timedelta(hours=9))
+
+INTERVAL_SECONDS = {
+    'minute1': 60,
+    'minute3': 180,
+    'minute5': 300,
+    'minute10': 600,
+    'minute15': 900,
+    'minute30': 1800,
+    'minute60': 3600,
+    'minute240': 14400,
+    'day': 86400,
+    'days': 86400,
+    'week': 604800,
+    'weeks': 604800
+}
+
+CANDLE_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'value']
+MAX_CANDLES_PER_CALL = 200
+
+
+def candles_to_frame(contents, market=None, interval=None):
+    """캔들 API 응답을 pyupbit.get_ohlcv와 같은 형식의 DataFrame으로 변환"""
+    index = [datetime.strptime(x['candle_date_time_kst'], "%Y-%m-%dT%H:%M:%S") for x in contents]
+    df = pd.DataFrame(
+        [[x['opening_price'], x['high_price'], x['low_price'], x['trade_price'],
+          x['candle_acc_trade_volume'], x['candle_acc_trade_price']] for x in contents],
+        columns=CANDLE_COLUMNS,
+        index=pd.DatetimeIndex(index),
+        dtype='float64'
+    ).sort_index()
+    df.attrs['market'] = market
+    df.attrs['interval'] = interval
+    return df
+
+
+def now_kst():
+    """현재 한국 시각 (캔들 인덱스와 같은 naive datetime)"""
+    return datetime.now(KST).replace(tzinfo=None)
+
+
+class CandleWindow:
+    """전체 캔들 배열 위를 움직이는 [start, end) 구간 (봉 재생용 캔들 데이터)
+
+    봉마다 DataFrame을 새로 만들지 않도록 컬럼 배열과 파이썬 리스트를 한 번만
+    만들어 두고 구간 위치만 옮긴다. ts는 캔들 DB와 같은 KST epoch 초이다.
+    스트리밍 전략은 이 구간에서 새 봉만 바로 읽고, 그 밖의 전략에는
+    to_frame()으로 같은 구간의 DataFrame을 넘긴다. closed=True면 마지막 봉도
+    이미 닫힌 봉이라 미리보기 대신 바로 반영해도 된다 (기록된 캔들 재생).
+    """
+    def __init__(self, arrays, market=None, interval=None, columns=CANDLE_COLUMNS, closed=False):
+        self.columns = [column for column in columns if column in arrays]
+        self.arrays = {column: arrays[column] for column in self.columns}
+        self.lists = {column: arrays[column].tolist() for column in self.columns}
+        self.ts = arrays['ts']
+        self.ts_list = arrays['ts'].tolist()
+        self.attrs = {'market': market, 'interval': interval}
+        self.closed = closed
+        self.start = 0
+        self.end = 0
+
+    @property
+    def market(self):
+        return self.attrs['market']
+
+    def move(self, end, size=None):
+        """구간 끝을 end로 옮기고 길이를 size 이하로 맞춤"""
+        self.end = end
+        self.start = 0 if size is None else max(0, end - size)
+        return self
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __contains__(self, column):
+        return column in self.arrays
+
+    def __getitem__(self, column):
+        return self.arrays[column][self.start:self.end]
+
+    def timestamp(self, i):
+        """구간 안 i번째 봉 시각"""
+        return self.ts_list[self.start + i]
+
+    def position(self, ts):
+        """구간 안에서 시각 ts인 봉 위치 (없으면 None)"""
+        # 봉을 차례로 재생할 때는 직전 구간의 마지막 봉이 대부분이다
+        ts_list = self.ts_list
+        for i in (self.end - 1, self.end - 2):
+            if i >= self.start and ts_list[i] == ts:
+                return i - self.start
+        pos = int(self.ts[self.start:self.end].searchsorted(ts))
+        if pos < len(self) and self.ts_list[self.start + pos] == ts:
+            return pos
+        return None
+
+    def bar(self, i, columns):
+        """구간 안 i번째 봉 {컬럼: 값}"""
+        i += self.start
+        lists = self.lists
+        return {column: lists[column][i] for column in columns}
+
+    def to_frame(self):
+        df = pd.DataFrame({column: self[column] for column in self.columns},
+                          index=from_timestamps(self.ts[self.start:self.end]))
+        df.attrs.update(self.attrs)
+        return df
+
+
+class CandleStore:
+    """(마켓, 간격)별 캔들을 메모리에 보관하고 새 캔들만 받아오는 저장소
+
+    처음에는 capacity만큼 받아오고, 이후에는 마지막 캔들 이후 경과한 개수
+    (+ 아직 만들어지는 중인 마지막 캔들)만 요청한다. 마지막 캔들은 제자리에서
+    갱신하고, 보관 개수는 capacity를 넘지 않는다.
+    """
+    def __init__(self, client=None, capacity=None, refresh_interval=None, db=None):
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.db = db
+        self.capacity = capacity or CANDLE_SETTINGS['CAPACITY']
+        self.refresh_interval = (CANDLE_SETTINGS['REFRESH_INTERVAL']
+                                 if refresh_interval is None else refresh_interval)
+        self.frames = {}
+        self.fetched_at = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _client(self):
+        return self.client or get_default_client()
+
+    def _key_lock(self, key):
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def _fetch(self, market, interval, count, to=None):
+        """count개 캔들을 200개 단위로 나눠 조회"""
+        frames = []
+        remaining = count
+        while remaining > 0:
+            contents = self._client().get_candles(market, interval, min(remaining, MAX_CANDLES_PER_CALL), to)
+            if not contents:
+                break
+            frames.append(candles_to_frame(contents, market, interval))
+            remaining -= len(contents)
+            if len(contents) < MAX_CANDLES_PER_CALL:
+                break
+            # 다음 페이지는 가장 오래된 캔들 이전 구간 (UTC 기준)
+            to = contents[-1]['candle_date_time_utc'].replace('T', ' ')
+        if not frames:
+            return None
+        df = pd.concat(frames).sort_index()
+        df = df[~df.index.duplicated(keep='last')]
+        df.attrs['market'] = market
+        df.attrs['interval'] = interval
+        return df
+
+    def _merge(self, frame, new):
+        """새로 받은 캔들 반영 (마지막 캔들은 제자리 갱신, 이후 캔들은 추가)"""
+        last_index = frame.index[-1]
+        overlap = new[new.index <= last_index]
+        for index, row in overlap.iterrows():
+            if index in frame.index:
+                frame.loc[index, CANDLE_COLUMNS] = row.values
+        newer = new[new.index > last_index]
+        if not newer.empty:
+            frame = pd.concat([frame, newer])
+            if len(frame) > self.capacity:
+                frame = frame.iloc[-self.capacity:]
+        return frame
+
+    def _delta_count(self, frame, interval):
+        seconds = INTERVAL_SECONDS.get(interval)
+        if seconds is None:
+            return None
+        elapsed = (now_kst() - frame.index[-1].to_pydatetime()).total_seconds()
+        return max(int(elapsed // seconds) + 2, 2)
+
+    def update(self, market, interval='minute5'):
+        """새 캔들만 받아와 저장소 갱신 후 DataFrame 반환"""
+        key = (market, interval)
+        with self._key_lock(key):
+            frame = self.frames.get(key)
+            if frame is None and self.db is not None:
+                # 시작 시에는 로컬 DB의 최근 캔들로 채우고 이후 구간만 받아온다
+                frame = self.db.load(market, interval, limit=self.capacity)
+                if frame.empty:
+                    frame = None
+            count = None if frame is None else self._delta_count(frame, interval)
+            if frame is None or count is None or count > MAX_CANDLES_PER_CALL:
+                new = frame = self._fetch(market, interval, self.capacity)
+            else:
+                new = self._fetch(market, interval, count)
+                if new is not None:
+                    frame = self._merge(frame, new)
+            if new is not None and self.db is not None:
+                self.db.upsert(market, interval, new)
+            if frame is not None:
+                frame.attrs['market'] = market
+                frame.attrs['interval'] = interval
+                self.frames[key] = frame
+                self.fetched_at[key] = time.monotonic()
+            return frame
+
+    def get(self, market, interval='minute5', count=None):
+        """캔들 DataFrame 조회 (refresh_interval 안에서는 네트워크 호출 없음)"""
+        frame = self._get_stored(market, interval)
+        if frame is None:
+            return None
+        if count is not None:
+            frame = frame.iloc[-count:]
+        # 호출 측에서 컬럼을 추가해도 저장소가 오염되지 않도록 복사본 반환
+        return frame.copy()
+
+    def get_many(self, markets, interval='minute5', copy=True):
+        """여러 마켓 캔들을 마켓별 dict로 조회 (없는 마켓은 None)
+
+        copy=False면 저장소의 DataFrame을 그대로 넘기므로 읽기 전용으로만 써야 한다.
+        """
+        frames = {}
+        for market in markets:
+            frame = self.get(market, interval) if copy else self._get_stored(market, interval)
+            frames[market] = frame
+        return frames
+
+    def _get_stored(self, market, interval):
+        key = (market, interval)
+        frame = self.frames.get(key)
+        try:
+            if frame is None or time.monotonic() - self.fetched_at.get(key, 0.0) >= self.refresh_interval:
+                frame = self.update(market, interval)
+        except Exception as e:
+            self.logger.error(f"캔들 갱신 실패 ({market}, {interval}): {str(e)}")
+        return frame
+
+    def clear(self, market=None, interval=None):
+        """보관 중인 캔들 삭제"""
+        for key in list(self.frames):
+            if (market is None or key[0] == market) and (interval is None or key[1] == interval):
+                del self.frames[key]
+                self.fetched_at.pop(key, None)
@@ -12,6 +12,17 @@ COIN_GROUPS = {
     '기타 알트코인': ['KRW-DOGE', 'KRW-SHIB', 'KRW-VET', 'KRW-CHZ', 'KRW-LINK']
 }
 
+# 거래 코인 선택 목록 (UI)
+TRADE_COINS = [
+    'KRW-BTC', 'KRW-ETH', 'KRW-XRP', 'KRW-DOGE', 'KRW-ADA',
+    'KRW-MATIC', 'KRW-SOL', 'KRW-DOT', 'KRW-AVAX'
+]
+
+# 시세 감시 대상 전체 마켓 (중복 제거, 순서 유지)
+WATCH_MARKETS = list(dict.fromkeys(
+    [market for markets in COIN_GROUPS.values() for market in markets] + TRADE_COINS
+))
+
 # 투자 전략 설정
 STRATEGIES = {
     'RSI': {'name': 'RSI 전략', 'desc': '과매수/과매도 구간 활용'},
@@ -39,6 +50,7 @@ TRADE_SETTINGS = {
     'DEFAULT_AMOUNT': 100000,  # 기본 거래금액 (10만원)
     'MAX_AMOUNT': 1000000,    # 최대 거래금액 (100만원)
     'MIN_AMOUNT': 5000,       # 최소 거래금액 (5천원)
+    'FEE_RATE': 0.0005,       # 거래 수수료율 (0.05%)
     'STOP_LOSS': 3.0,         # 손절 비율 (3%)
     'TAKE_PROFIT': 5.0,       # 익절 비율 (5%)
     'USE_STOP_LOSS': True,    # 손절 사용 여부
@@ -48,6 +60,9 @@ TRADE_SETTINGS = {
     'RISK_LEVEL': 'MEDIUM'    # 위험도 (LOW, MEDIUM, HIGH)
 }
 
+# 모의 거래소/백테스트 기본 수수료율 (실거래 설정과 같은 값)
+DEFAULT_FEE = TRADE_SETTINGS['FEE_RATE']
+
 # 위험도별 설정
 RISK_SETTINGS = {
     'LOW': {
@@ -65,4 +80,51 @@ RISK_SETTINGS = {
         'TAKE_PROFIT': 8.0,
         'MAX_AMOUNT_RATIO': 0.8  # 보유 금액의 최대 80%까지 투자
     }
-} 
\ No newline at end of file
+}
+
+# 시세 조회 설정
+MARKET_DATA_SETTINGS = {
+    'QUOTE_BATCH_SIZE': 100,  # /v1/ticker 1회 요청당 최대 마켓 수
+    'QUOTE_MAX_AGE': 1.0,     # 시세 재사용 허용 시간 (초)
+    'ACCOUNT_TTL': 1.0,       # 계좌 스냅샷 재사용 허용 시간 (초)
+    'CACHE_MAX_ENTRIES': 1024,  # 시세 캐시 최대 항목 수 (LRU)
+    'CACHE_TTLS': {           # 데이터 종류별 캐시 유지 시간 (초)
+        'ticker': 0.5,
+        'orderbook': 0.3,
+        'candles': 5.0
+    }
+}
+
+# 거래소 HTTP 클라이언트 설정
+EXCHANGE_CLIENT_SETTINGS = {
+    'BASE_URL': 'https://api.upbit.com',
+    'POOL_CONNECTIONS': 4,    # 호스트별 커넥션 풀 개수
+    'POOL_MAXSIZE': 16,       # 풀당 유지할 최대 keep-alive 연결 수
+    'CONNECT_TIMEOUT': 3.05,  # 연결 타임아웃 (초)
+    'READ_TIMEOUT': 5.0       # 응답 타임아웃 (초)
+}
+
+# 요청 수 제한 그룹별 초당 허용 요청 수
+RATE_LIMIT_SETTINGS = {
+    'market': 10,
+    'candle': 10,
+    'trade': 10,
+    'ticker': 10,
+    'orderbook': 10,
+    'default': 30,            # 계좌/주문 조회 등 거래 API
+    'order': 8                # 주문 생성/취소
+}
+
+# 캔들 저장소 설정
+CANDLE_SETTINGS = {
+    'CAPACITY': 200,          # (마켓, 간격)별 메모리에 보관할 최대 캔들 수
+    'REFRESH_INTERVAL': 1.0,  # 캔들 재조회 최소 간격 (초)
+    'DB_PATH': 'data/candles.db',  # 로컬 캔들 데이터베이스 경로
+    'INDICATOR_CACHE_SIZE': 512  # 봉별 지표 캐시 최대 항목 수 (LRU)
+}
+
+# 전략 레지스트리 설정
+STRATEGY_SETTINGS = {
+    'MAX_INSTANCES': 64,      # (전략, 파라미터, 마켓)별로 보관할 최대 전략 객체 수 (LRU)
+    'TARGET_RATE': 0.01,      # 목표 매수/매도가 기본 폭 (현재가 대비)
+}
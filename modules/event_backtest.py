@@ -0,0 +1,332 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .config import COIN_GROUPS, TRADE_SETTINGS, CANDLE_SETTINGS, DEFAULT_FEE
+from .candles import CandleWindow, INTERVAL_SECONDS, now_kst
+from .candle_db import CandleDatabase
+from .registry import strategy_registry
+from .auto_trader import AutoTrader
+from .sim_exchange import SimBroker, SimExchangeError, KST_OFFSET
+from .backtest import drawdown, summarize, EXIT_SIGNAL, EXIT_OPEN
+from .optimizer import SharedCandles, SWEEP_COLUMNS, load_candles
+
+# 이벤트 백테스트
+#
+# 실제 AutoTrader를 그대로 써서 봉을 하나씩 재생한다. 봉마다 시뮬레이션 시계를
+# 그 봉이 닫힌 시각으로 옮기고, 그 봉까지의 캔들 구간(CandleWindow)을
+# AutoTrader.update()에 넘긴다. 주문은 UpbitTrader와 같은 메서드를 가진
+# SimTrader가 모의 거래소 체결 엔진(SimBroker)에 바로 넣으므로 HTTP 왕복이 없고,
+# 시장가 주문은 닫힌 봉의 종가 호가로 체결된다 (다음 봉 시세를 미리 보지 않음).
+
+# 재생에 쓰는 캔들 컬럼 (ts는 캔들 DB와 같은 KST epoch 초)
+EVENT_COLUMNS = ('ts',) + SWEEP_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+class SimClock:
+    """재생 중인 봉의 마감 시각(UTC epoch 초)을 돌려주는 시뮬레이션 시계"""
+    def __init__(self, now=0.0):
+        self.now = now
+        self.index = -1
+
+    def set(self, now, index=None):
+        self.now = now
+        self.index = index
+
+    def __call__(self):
+        return self.now
+
+
+class BarPrices:
+    """닫힌 봉의 종가를 현재가로 제공하는 SimBroker 데이터 소스
+
+    시각 ts의 현재가는 ts까지 마감된 마지막 봉의 종가이며, 첫 봉이 닫히기
+    전에는 첫 봉 시가를 쓴다. 봉을 차례로 재생하므로 직전 위치부터 확인한다.
+    """
+    def __init__(self):
+        self.series = {}
+
+    def add(self, market, arrays, step):
+        close_ts = np.asarray(arrays['ts'], dtype=np.int64) - KST_OFFSET + step
+        self.series[market] = {
+            'ts': close_ts,
+            'close_ts': close_ts.tolist(),
+            'close': np.asarray(arrays['close'], dtype=np.float64).tolist(),
+            'first': float(arrays['open'][0]) if len(close_ts) else 0.0,
+            'cursor': -1
+        }
+
+    @staticmethod
+    def _contains(close_ts, i, ts):
+        return (i < 0 or close_ts[i] <= ts) and (i + 1 == len(close_ts) or close_ts[i + 1] > ts)
+
+    def price(self, market, ts):
+        series = self.series[market]
+        close_ts = series['close_ts']
+        i = series['cursor']
+        if not self._contains(close_ts, i, ts):
+            if self._contains(close_ts, i + 1, ts):
+                i += 1
+            else:
+                i = int(series['ts'].searchsorted(ts, side='right')) - 1
+            series['cursor'] = i
+        return series['close'][i] if i >= 0 else series['first']
+
+
+class SimTrader:
+    """AutoTrader가 쓰는 UpbitTrader 메서드를 SimBroker 계좌로 처리하는 모의 트레이더
+
+    반환 형식은 UpbitTrader와 같고, 주문 오류는 로그를 남기고 None을 반환한다.
+    체결된 주문은 (봉 위치, 주문) 순서로 fills에 쌓인다.
+    """
+    def __init__(self, broker, coin='KRW-BTC'):
+        self.broker = broker
+        self.coin = coin
+        self.fills = []
+        self.logger = logging.getLogger(__name__)
+
+    def get_balance(self, coin=None):
+        """잔고 조회"""
+        coin = coin or self.coin
+        accounts = self.broker.accounts
+        krw = accounts['KRW']
+        account = accounts.get(coin.split('-')[1])
+        coin_balance = account['balance'] + account['locked'] if account else 0.0
+        avg_buy_price = account['avg_buy_price'] if account else 0.0
+        coin_value = coin_balance * self.broker.price(coin) if coin_balance else 0.0
+        total_value = krw['balance'] + coin_value
+        initial_investment = krw['balance'] + coin_balance * avg_buy_price
+        return {
+            'krw': krw['balance'],
+            'krw_locked': krw['locked'],
+            'coin_amount': coin_balance,
+            'coin_locked': account['locked'] if account else 0.0,
+            'avg_buy_price': avg_buy_price,
+            'coin_value': coin_value,
+            'total_value': total_value,
+            'profit_rate': ((total_value - initial_investment) / initial_investment * 100)
+                          if initial_investment > 0 else 0.0
+        }
+
+    def get_current_price(self, coin=None):
+        """현재가 조회 (get_current_price 응답 중 체결가만)"""
+        return {'market': coin or self.coin, 'trade_price': self.broker.price(coin or self.coin)}
+
+    def _place_order(self, coin, side, volume=None, price=None, ord_type='limit'):
+        try:
+            order = self.broker.place_order({'market': coin, 'side': side, 'volume': volume,
+                                             'price': price, 'ord_type': ord_type})
+            self.fills.append((self.broker.clock.index, self.broker.orders[order['uuid']]))
+            return order
+        except SimExchangeError as e:
+            self.logger.error(f"주문 실패 ({coin} {side}): {str(e)}")
+            return None
+
+    def buy_market_order(self, coin, amount):
+        """시장가 매수 (KRW 금액)"""
+        return self._place_order(coin, 'bid', price=amount, ord_type='price')
+
+    def sell_market_order(self, coin, volume):
+        """시장가 매도 (코인 수량)"""
+        return self._place_order(coin, 'ask', volume=volume, ord_type='market')
+
+
+def _trades(fills, reasons):
+    """체결된 매수/매도 주문을 거래(보유 구간) 목록으로 묶음 (backtest.simulate와 같은 형식)
+
+    reasons는 손절/익절로 매도한 봉 위치별 사유이고, 그 밖의 매도는 전략 신호 매도이다.
+    """
+    trades = []
+    trade = None
+    for index, order in fills:
+        funds = order['executed_funds']
+        if order['side'] == 'bid':
+            trade = {'entry_index': index, 'entry_price': order['trades'][0]['price'],
+                     'quantity': order['executed_volume'], 'exit_index': None, 'exit_price': None,
+                     'return': None, 'reason': EXIT_OPEN, 'cost': funds + order['paid_fee']}
+            trades.append(trade)
+        elif trade is not None:
+            trade['return'] = (funds - order['paid_fee']) / trade['cost'] - 1.0
+            trade.update(exit_index=index, exit_price=order['trades'][0]['price'])
+            trade['reason'] = reasons.get(index, EXIT_SIGNAL)
+            trade = None
+    for trade in trades:
+        del trade['cost']
+    return trades
+
+
+def run_event_backtest(strategy, arrays, market='KRW-BTC', interval='minute1', settings=None,
+                       krw=None, fee=DEFAULT_FEE, window=None):
+    """캔들 배열을 봉 단위로 재생해 AutoTrader를 그대로 실행
+
+    arrays는 ts(KST epoch 초)를 포함한 컬럼 배열 dict이고, settings는 AutoTrader
+    설정이다 (amount를 생략하면 보유 KRW 전부로 매수). window는 봉마다 넘기는
+    최근 봉 수로 기본은 실거래 캔들 저장소 크기(CANDLE_SETTINGS['CAPACITY'])이다.
+    반환값은 {'equity', 'drawdown', 'trades', 'orders', 'stats'}이다.
+    """
+    krw = TRADE_SETTINGS['DEFAULT_AMOUNT'] if krw is None else krw
+    window = window or CANDLE_SETTINGS['CAPACITY']
+    step = INTERVAL_SECONDS[interval]
+    n = len(arrays['close'])
+
+    prices = BarPrices()
+    prices.add(market, arrays, step)
+    clock = SimClock()
+    broker = SimBroker(prices, clock=clock, krw=krw, fee=fee)
+    trader = SimTrader(broker, market)
+    auto_trader = AutoTrader(trader, strategy, dict({'amount': krw, 'fee': fee}, **(settings or {}), coin=market))
+    auto_trader.start()
+    candles = CandleWindow(arrays, market, interval, closed=True)
+
+    close_ts = (np.asarray(arrays['ts'], dtype=np.int64) - KST_OFFSET + step).tolist()
+    cash_account = broker._account('KRW')
+    coin_account = broker._account(market.split('-')[1])
+    fills = trader.fills
+    # 잔고는 주문이 체결된 봉에서만 바뀌므로 그 봉의 잔고만 기록한다
+    changes = [(0, krw, 0.0)]
+    reasons = {}
+    started = time.perf_counter()
+    for i in range(n):
+        clock.set(close_ts[i], i)
+        count = len(fills)
+        auto_trader.update(candles.move(i + 1, window))
+        if len(fills) != count:
+            if auto_trader.last_exit:
+                reasons[i] = auto_trader.last_exit
+            changes.append((i, cash_account['balance'] + cash_account['locked'],
+                            coin_account['balance'] + coin_account['locked']))
+    elapsed = time.perf_counter() - started
+
+    index, cash, quantity = (np.array(column) for column in zip(*changes))
+    position = np.searchsorted(index, np.arange(n), side='right') - 1
+    equity = cash[position] + quantity[position] * np.asarray(arrays['close'], dtype=np.float64)
+    trades = _trades(fills, reasons)
+    ts = np.asarray(arrays['ts'], dtype=np.int64)
+    for trade in trades:
+        trade['entry_ts'] = int(ts[trade['entry_index']])
+        trade['exit_ts'] = int(ts[trade['exit_index']]) if trade['exit_index'] is not None else None
+    stats = summarize(trades, equity, ts)
+    stats.update(orders=len(fills), bars=n, seconds=elapsed, bars_per_second=n / elapsed if elapsed else 0.0)
+    return {
+        'equity': equity,
+        'drawdown': drawdown(equity),
+        'trades': trades,
+        'orders': [order for _, order in fills],
+        'stats': stats
+    }
+
+
+# 워커 프로세스별 공유 캔들과 실행 설정 (초기화 함수에서 한 번 붙는다)
+_worker = {}
+
+
+def _init_worker(meta, options):
+    shm, data = SharedCandles.attach(meta)
+    _worker.update(shm=shm, data=data, options=options)
+
+
+def _run_market(market):
+    options = _worker['options']
+    arrays = dict(_worker['data'][market])
+    arrays['ts'] = arrays['ts'].astype(np.int64)
+    try:
+        strategy = strategy_registry.create(options['key'], options['params'])
+        result = run_event_backtest(strategy, arrays, market, options['interval'], options['settings'],
+                                    options['krw'], options['fee'], options['window'])
+        return dict({'market': market}, **result['stats'])
+    except Exception as e:
+        logger.error(f"이벤트 백테스트 실패 ({market}): {str(e)}")
+        return {'market': market, 'error': str(e)}
+
+
+def run_markets(key, data, params=None, interval='minute1', settings=None, krw=None, fee=DEFAULT_FEE,
+                window=None, workers=None):
+    """여러 마켓을 마켓별 프로세스로 나눠 이벤트 백테스트하고 마켓별 성과 DataFrame 반환
+
+    data는 {마켓: {컬럼: 1차원 배열}}(ts 포함)이다. 전략은 STRATEGIES 키와
+    파라미터로 마켓마다 새로 만든다. workers가 1이면 현재 프로세스에서 실행한다.
+    """
+    options = {'key': key, 'params': strategy_registry.resolve_params(key, params or {}),
+               'interval': interval, 'settings': settings, 'krw': krw, 'fee': fee, 'window': window}
+    data = {market: arrays for market, arrays in data.items() if len(arrays['close'])}
+    workers = min(workers or os.cpu_count() or 1, max(1, len(data)))
+
+    if workers == 1:
+        _worker.update(data=data, options=options)
+        try:
+            rows = [_run_market(market) for market in data]
+        finally:
+            _worker.clear()
+    else:
+        with SharedCandles(data, EVENT_COLUMNS) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.meta, options)) as executor:
+                rows = list(executor.map(_run_market, data))
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='이벤트 백테스트 (AutoTrader 봉 단위 재생)')
+    parser.add_argument('--strategy', required=True, help='STRATEGIES 키 (예: RSI)')
+    parser.add_argument('--markets', default='KRW-BTC',
+                        help="쉼표로 구분한 마켓 목록 또는 all (COIN_GROUPS 전체)")
+    parser.add_argument('--interval', default='minute1')
+    parser.add_argument('--days', type=float, default=365)
+    parser.add_argument('--db', default=None, help='캔들 DB 경로 (기본: CANDLE_SETTINGS)')
+    parser.add_argument('--param', action='append', default=[], help='전략 파라미터 name=value (여러 번 지정 가능)')
+    parser.add_argument('--krw', type=float, default=TRADE_SETTINGS['DEFAULT_AMOUNT'], help='초기 KRW (원)')
+    parser.add_argument('--amount', type=float, default=None, help='1회 매수 금액 (기본: 보유 KRW 전부)')
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE)
+    parser.add_argument('--stop-loss', type=float, default=None, help='손절 비율 %% (0이면 사용 안 함)')
+    parser.add_argument('--take-profit', type=float, default=None, help='익절 비율 %% (0이면 사용 안 함)')
+    parser.add_argument('--window', type=int, default=None, help='봉마다 넘기는 최근 봉 수')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--out', default=None, help='마켓별 결과 CSV 경로')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    if args.markets == 'all':
+        markets = list(dict.fromkeys(m for group in COIN_GROUPS.values() for m in group))
+    else:
+        markets = [m.strip() for m in args.markets.split(',') if m.strip()]
+    settings = {}
+    if args.amount:
+        settings['amount'] = args.amount
+    if args.stop_loss is not None:
+        settings['stop_loss'] = args.stop_loss or None
+    if args.take_profit is not None:
+        settings['take_profit'] = args.take_profit or None
+
+    db = CandleDatabase(args.db)
+    data = load_candles(db, markets, args.interval, now_kst() - timedelta(days=args.days), columns=EVENT_COLUMNS)
+    db.close()
+    if not data:
+        logger.error("백테스트할 캔들이 없습니다.")
+        return 1
+
+    # 재생 중 주문마다 남는 로그는 끄고 결과만 보여 준다
+    logging.getLogger(AutoTrader.__module__).setLevel(logging.WARNING)
+    params = dict(item.split('=', 1) for item in args.param)
+    started = time.time()
+    results = run_markets(args.strategy, data, params, args.interval, settings, args.krw, args.fee,
+                          args.window, args.workers)
+    elapsed = time.time() - started
+    bars = int(results['bars'].sum()) if 'bars' in results else 0
+    print(results.to_string(index=False))
+    print(f"{bars:,}개 봉 {elapsed:.1f}초 ({bars / elapsed:,.0f} 봉/초)")
+    if args.out:
+        results.to_csv(args.out, index=False)
+    return 0 if 'error' not in results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
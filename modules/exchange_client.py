@@ -0,0 +1,309 @@
+import re
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from urllib.parse import urlencode
+
+import jwt
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import EXCHANGE_CLIENT_SETTINGS
+from .rate_limiter import RequestScheduler, request_group
+
+CANDLE_PATHS = {
+    'day': '/v1/candles/days',
+    'days': '/v1/candles/days',
+    'minute1': '/v1/candles/minutes/1',
+    'minute3': '/v1/candles/minutes/3',
+    'minute5': '/v1/candles/minutes/5',
+    'minute10': '/v1/candles/minutes/10',
+    'minute15': '/v1/candles/minutes/15',
+    'minute30': '/v1/candles/minutes/30',
+    'minute60': '/v1/candles/minutes/60',
+    'minute240': '/v1/candles/minutes/240',
+    'week': '/v1/candles/weeks',
+    'weeks': '/v1/candles/weeks',
+    'month': '/v1/candles/months',
+    'months': '/v1/candles/months'
+}
+
+_REMAINING_REQ_PATTERN = re.compile(r"group=([a-z\-]+); min=([0-9]+); sec=([0-9]+)")
+
+
+class UpbitAPIError(Exception):
+    """업비트 API 오류 응답"""
+    def __init__(self, status, name='', message=''):
+        self.status = status
+        self.name = name
+        self.message = message
+        super().__init__(f"[{status}] {name}: {message}")
+
+
+class TooManyRequestsError(UpbitAPIError):
+    """요청 수 제한 초과 (HTTP 429)"""
+    pass
+
+
+def parse_remaining_req(header):
+    """Remaining-Req 헤더 파싱 ('group=market; min=573; sec=9')"""
+    if not header:
+        return None
+    matched = _REMAINING_REQ_PATTERN.search(header)
+    if matched is None:
+        return None
+    return {
+        'group': matched.group(1),
+        'min': int(matched.group(2)),
+        'sec': int(matched.group(3))
+    }
+
+
+def candle_path(interval):
+    """캔들 간격 문자열을 API 경로로 변환"""
+    path = CANDLE_PATHS.get(interval)
+    if path is None:
+        raise ValueError(f"지원하지 않는 캔들 간격: {interval}")
+    return path
+
+
+class LatencyStats:
+    """엔드포인트별 요청 지연 시간 집계"""
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, elapsed, error=False):
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total += elapsed
+        self.last = elapsed
+        self.max = max(self.max, elapsed)
+        self.min = elapsed if self.min is None else min(self.min, elapsed)
+
+    @property
+    def avg(self):
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'avg_ms': self.avg * 1000,
+            'min_ms': (self.min or 0.0) * 1000,
+            'max_ms': self.max * 1000,
+            'last_ms': self.last * 1000
+        }
+
+
+class UpbitClient:
+    """keep-alive 커넥션 풀을 공유하는 업비트 REST 클라이언트
+
+    시세(공개) API와 거래(인증) API를 하나의 requests.Session으로 처리해
+    요청마다 TLS 핸드셰이크를 다시 하지 않는다.
+    """
+    def __init__(self, access=None, secret=None, base_url=None, pool_connections=None,
+                 pool_maxsize=None, connect_timeout=None, read_timeout=None, max_retries=0,
+                 scheduler=None):
+        self.logger = logging.getLogger(__name__)
+        self.scheduler = scheduler or RequestScheduler()
+        self.access = access
+        self.secret = secret
+        self.base_url = (base_url or EXCHANGE_CLIENT_SETTINGS['BASE_URL']).rstrip('/')
+        self.timeout = (
+            connect_timeout or EXCHANGE_CLIENT_SETTINGS['CONNECT_TIMEOUT'],
+            read_timeout or EXCHANGE_CLIENT_SETTINGS['READ_TIMEOUT']
+        )
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections or EXCHANGE_CLIENT_SETTINGS['POOL_CONNECTIONS'],
+            pool_maxsize=pool_maxsize or EXCHANGE_CLIENT_SETTINGS['POOL_MAXSIZE'],
+            max_retries=max_retries
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept': 'application/json'})
+        self.stats = {}
+        self.last_remaining_req = {}
+        self._stats_lock = threading.Lock()
+
+    def set_credentials(self, access, secret):
+        """API 키 설정"""
+        self.access = access
+        self.secret = secret
+
+    @property
+    def has_credentials(self):
+        return bool(self.access and self.secret)
+
+    def close(self):
+        """커넥션 풀 정리"""
+        self.session.close()
+
+    def _auth_headers(self, query=None):
+        payload = {
+            'access_key': self.access,
+            'nonce': str(uuid.uuid4())
+        }
+        if query:
+            m = hashlib.sha512()
+            m.update(urlencode(query, doseq=True).replace("%5B%5D=", "[]=").encode())
+            payload['query_hash'] = m.hexdigest()
+            payload['query_hash_alg'] = 'SHA512'
+        token = jwt.encode(payload, self.secret, algorithm='HS256')
+        return {'Authorization': f'Bearer {token}'}
+
+    def _record(self, endpoint, elapsed, error=False):
+        with self._stats_lock:
+            stats = self.stats.get(endpoint)
+            if stats is None:
+                stats = self.stats[endpoint] = LatencyStats()
+            stats.add(elapsed, error)
+
+    def request(self, method, path, params=None, private=False, priority=None):
+        """요청 수 제한 스케줄러를 거쳐 API 호출 후 (응답 데이터, Remaining-Req 정보) 반환
+
+        같은 조회(GET) 요청이 동시에 들어오면 한 번만 호출해 결과를 나눠 쓴다.
+        """
+        group = request_group(method, path)
+        key = None
+        if method == 'GET':
+            key = (path, private, tuple(sorted((params or {}).items())))
+        return self.scheduler.submit(
+            group,
+            lambda: self._send(method, path, params, private),
+            key=key,
+            priority=priority,
+            retry_on=(TooManyRequestsError,)
+        )
+
+    def _send(self, method, path, params=None, private=False):
+        if private and not self.has_credentials:
+            raise UpbitAPIError(401, 'no_credentials', 'API 키가 설정되지 않았습니다.')
+
+        headers = self._auth_headers(params) if private else {}
+        kwargs = {'headers': headers, 'timeout': self.timeout}
+        if method == 'POST':
+            kwargs['json'] = params
+        else:
+            kwargs['params'] = params
+
+        endpoint = f"{method} {path}"
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(method, self.base_url + path, **kwargs)
+        except requests.RequestException:
+            self._record(endpoint, time.perf_counter() - start, error=True)
+            raise
+        self._record(endpoint, time.perf_counter() - start, error=not resp.ok)
+
+        remaining_req = parse_remaining_req(resp.headers.get('Remaining-Req'))
+        if remaining_req:
+            self.last_remaining_req[remaining_req['group']] = remaining_req
+            self.scheduler.update(remaining_req, request_group(method, path))
+
+        if not resp.ok:
+            name, message = '', resp.text
+            try:
+                error = resp.json().get('error', {})
+                name, message = error.get('name', ''), error.get('message', '')
+            except (ValueError, AttributeError):
+                pass
+            if resp.status_code == 429:
+                raise TooManyRequestsError(resp.status_code, name, message)
+            raise UpbitAPIError(resp.status_code, name, message)
+        return resp.json(), remaining_req
+
+    def get_latency_stats(self):
+        """엔드포인트별 지연 시간 통계 (ms)"""
+        with self._stats_lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in self.stats.items()}
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats = {}
+
+    # ------------------------------------------------------------------
+    # 시세 (공개 API)
+    # ------------------------------------------------------------------
+    def get_ticker(self, markets):
+        """현재가 조회 (/v1/ticker)"""
+        if not isinstance(markets, str):
+            markets = ','.join(markets)
+        data, _ = self.request('GET', '/v1/ticker', {'markets': markets})
+        return data
+
+    def get_orderbook(self, markets):
+        """호가 조회 (/v1/orderbook)"""
+        if not isinstance(markets, str):
+            markets = ','.join(markets)
+        data, _ = self.request('GET', '/v1/orderbook', {'markets': markets})
+        return data
+
+    def get_candles(self, market, interval='day', count=200, to=None):
+        """캔들 조회 (최신순 목록, 최대 200개)"""
+        params = {'market': market, 'count': min(int(count), 200)}
+        if to is not None:
+            params['to'] = to
+        data, _ = self.request('GET', candle_path(interval), params)
+        return data
+
+    def get_trades(self, market, count=100):
+        """최근 체결 내역 조회 (/v1/trades/ticks)"""
+        data, _ = self.request('GET', '/v1/trades/ticks', {'market': market, 'count': count})
+        return data
+
+    # ------------------------------------------------------------------
+    # 거래 (인증 API)
+    # ------------------------------------------------------------------
+    def get_accounts(self):
+        """전체 계좌 조회 (/v1/accounts)"""
+        data, _ = self.request('GET', '/v1/accounts', private=True)
+        return data
+
+    def get_order(self, order_uuid):
+        """개별 주문 조회"""
+        data, _ = self.request('GET', '/v1/order', {'uuid': order_uuid}, private=True)
+        return data
+
+    def get_orders(self, market, state='wait', page=1, limit=100):
+        """주문 목록 조회"""
+        params = {'market': market, 'state': state, 'page': page,
+                  'limit': limit, 'order_by': 'desc'}
+        data, _ = self.request('GET', '/v1/orders', params, private=True)
+        return data
+
+    def place_order(self, market, side, volume=None, price=None, ord_type='limit'):
+        """주문 (side: bid/ask, ord_type: limit/price/market)"""
+        params = {'market': market, 'side': side, 'ord_type': ord_type}
+        if volume is not None:
+            params['volume'] = str(volume)
+        if price is not None:
+            params['price'] = str(price)
+        data, _ = self.request('POST', '/v1/orders', params, private=True)
+        return data
+
+    def cancel_order(self, order_uuid):
+        """주문 취소"""
+        data, _ = self.request('DELETE', '/v1/order', {'uuid': order_uuid}, private=True)
+        return data
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """공개 API용 공유 클라이언트"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = UpbitClient()
+        return _default_client
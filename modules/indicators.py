@@ -0,0 +1,491 @@
+import math
+from collections import deque
+
+
+class RollingSum:
+    """고정 길이 구간의 이동 합계 (값 추가/제거 O(1))
+
+    부동소수점 오차가 쌓이지 않도록 resync_every번 갱신마다 버퍼로 합계를 다시 구한다.
+    """
+    def __init__(self, period, resync_every=None):
+        self.period = period
+        self.values = deque(maxlen=period)
+        self.total = 0.0
+        self.resync_every = resync_every or period * 64
+        self._updates = 0
+
+    @property
+    def ready(self):
+        return len(self.values) == self.period
+
+    def update(self, x):
+        values = self.values
+        full = len(values) == self.period
+        if full:
+            self.total -= values[0]
+        values.append(x)
+        self.total += x
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self.total = math.fsum(values)
+            self._updates = 0
+        return self.total if full or len(values) == self.period else None
+
+    def peek(self, x):
+        """x를 추가했을 때의 합계 (상태는 바꾸지 않음)"""
+        n = len(self.values)
+        if n + 1 < self.period:
+            return None
+        return self.total + x - (self.values[0] if n == self.period else 0.0)
+
+
+class EMA:
+    """지수이동평균 (pandas ewm(span=..., adjust=True).mean()과 같은 값)
+
+    adjust=True 가중합을 분자/분모 누적값 두 개로 유지해 한 봉당 O(1)로 갱신한다.
+    """
+    def __init__(self, span):
+        self.span = span
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.num = 0.0
+        self.den = 0.0
+        self.value = None
+
+    def update(self, x):
+        self.num = x + self.decay * self.num
+        self.den = 1.0 + self.decay * self.den
+        self.value = self.num / self.den
+        return self.value
+
+    def peek(self, x):
+        return (x + self.decay * self.num) / (1.0 + self.decay * self.den)
+
+
+class MACD:
+    """MACD / 시그널 / 히스토그램"""
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = None
+
+    def update(self, close):
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(macd)
+        self.value = (macd, signal, macd - signal)
+        return self.value
+
+    def peek(self, close):
+        macd = self.fast.peek(close) - self.slow.peek(close)
+        signal = self.signal.peek(macd)
+        return macd, signal, macd - signal
+
+
+def _rsi(gain, loss):
+    if loss == 0:
+        return None if gain == 0 else 100.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+class RSI:
+    """단순이동평균 RSI (기존 전략의 rolling(period).mean() 계산과 같은 값)
+
+    첫 봉은 변화량 0으로 계산에 포함된다 (pandas diff().where(...) 결과와 동일).
+    """
+    def __init__(self, period=14):
+        self.period = period
+        self.gains = RollingSum(period)
+        self.losses = RollingSum(period)
+        self.last_close = None
+        self.value = None
+
+    def _delta(self, close):
+        return 0.0 if self.last_close is None else close - self.last_close
+
+    def update(self, close):
+        delta = 0.0 if self.last_close is None else close - self.last_close
+        gain = self.gains.update(delta if delta > 0.0 else 0.0)
+        loss = self.losses.update(-delta if delta < 0.0 else 0.0)
+        self.last_close = close
+        self.value = _rsi(gain, loss) if gain is not None else None
+        return self.value
+
+    def peek(self, close):
+        delta = self._delta(close)
+        gain = self.gains.peek(max(delta, 0.0))
+        loss = self.losses.peek(max(-delta, 0.0))
+        return _rsi(gain, loss) if gain is not None else None
+
+
+class RollingMeanStd:
+    """이동평균과 표본 표준편차 (ddof=1, pandas rolling().std()와 같은 값)
+
+    값 합계 대신 평균과 편차제곱합을 Welford 방식으로 밀어 가며 갱신해
+    큰 가격대에서도 자릿수 손실 없이 한 봉당 O(1)로 계산한다.
+    """
+    def __init__(self, period=20):
+        self.period = period
+        self.values = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.value = None
+
+    def _next(self, x):
+        n = len(self.values)
+        if n < self.period:
+            mean = self.mean + (x - self.mean) / (n + 1)
+            m2 = self.m2 + (x - self.mean) * (x - mean)
+            return n + 1, mean, m2
+        old = self.values[0]
+        mean = self.mean + (x - old) / n
+        m2 = self.m2 + (x - old) * (x - mean + old - self.mean)
+        return n, mean, max(m2, 0.0)
+
+    def _result(self, n, mean, m2):
+        if n < self.period:
+            return None
+        std = math.sqrt(m2 / (n - 1)) if n > 1 else float('nan')
+        return mean, std
+
+    def update(self, x):
+        n, self.mean, self.m2 = self._next(x)
+        self.values.append(x)
+        self.value = self._result(n, self.mean, self.m2)
+        return self.value
+
+    def peek(self, x):
+        return self._result(*self._next(x))
+
+
+class BollingerBands:
+    """볼린저 밴드 (상단, 중심, 하단)"""
+    def __init__(self, period=20, std_dev=2):
+        self.std_dev = std_dev
+        self.stats = RollingMeanStd(period)
+        self.value = None
+
+    def _bands(self, stats):
+        if stats is None:
+            return None
+        mean, std = stats
+        return mean + std * self.std_dev, mean, mean - std * self.std_dev
+
+    def update(self, close):
+        self.value = self._bands(self.stats.update(close))
+        return self.value
+
+    def peek(self, close):
+        return self._bands(self.stats.peek(close))
+
+
+class RollingVWAP:
+    """이동 거래량가중평균가격 sum(가격*거래량) / sum(거래량)"""
+    def __init__(self, period=14):
+        self.pv = RollingSum(period)
+        self.volume = RollingSum(period)
+        self.value = None
+
+    @staticmethod
+    def _vwap(pv, volume):
+        if pv is None or not volume:
+            return None
+        return pv / volume
+
+    def update(self, price, volume):
+        self.value = self._vwap(self.pv.update(price * volume), self.volume.update(volume))
+        return self.value
+
+    def peek(self, price, volume):
+        return self._vwap(self.pv.peek(price * volume), self.volume.peek(volume))
+
+
+class RollingExtreme:
+    """단조 덱으로 유지하는 이동 최댓값/최솟값 (갱신 분할상환 O(1))"""
+    def __init__(self, period, mode='max'):
+        self.period = period
+        self.sign = 1.0 if mode == 'max' else -1.0
+        self.window = deque()
+        self.index = -1
+        self.value = None
+
+    @property
+    def ready(self):
+        return self.index + 1 >= self.period
+
+    def update(self, x):
+        index = self.index = self.index + 1
+        key = self.sign * x
+        window = self.window
+        while window and window[-1][1] <= key:
+            window.pop()
+        window.append((index, key))
+        if window[0][0] <= index - self.period:
+            window.popleft()
+        self.value = self.sign * window[0][1] if index + 1 >= self.period else None
+        return self.value
+
+    def peek(self, x):
+        index = self.index + 1
+        if index + 1 < self.period:
+            return None
+        key = self.sign * x
+        # 새 값이 들어오면 빠지는 맨 앞 원소를 건너뛴 나머지의 극값과 비교
+        for i, value in self.window:
+            if i > index - self.period:
+                key = max(key, value)
+                break
+        return self.sign * key
+
+
+class Stochastic:
+    """스토캐스틱 %K, %D (%D는 %K의 단순이동평균)"""
+    def __init__(self, k_period=14, d_period=3):
+        self.highs = RollingExtreme(k_period, 'max')
+        self.lows = RollingExtreme(k_period, 'min')
+        self.d = RollingSum(d_period)
+        self.d_period = d_period
+        self.value = None
+
+    @staticmethod
+    def _k(high_max, low_min, close):
+        if high_max is None or high_max == low_min:
+            return None
+        return 100.0 * (close - low_min) / (high_max - low_min)
+
+    def update(self, high, low, close):
+        k = self._k(self.highs.update(high), self.lows.update(low), close)
+        if k is None:
+            # %K가 없는 봉이 %D 구간에 있으면 %D도 없다
+            self.d = RollingSum(self.d_period)
+            self.value = None
+            return None
+        d = self.d.update(k)
+        self.value = (k, d / self.d_period if d is not None else None)
+        return self.value
+
+    def peek(self, high, low, close):
+        k = self._k(self.highs.peek(high), self.lows.peek(low), close)
+        if k is None:
+            return None
+        d = self.d.peek(k)
+        return k, d / self.d_period if d is not None else None
+
+
+class WilderAverage:
+    """Wilder 평활 이동평균 (첫 period개 단순평균으로 시작, 이후 (이전*(n-1)+x)/n)"""
+    def __init__(self, period=14):
+        self.period = period
+        self.count = 0
+        self.total = 0.0
+        self.value = None
+
+    def _next(self, x):
+        if self.value is None:
+            count, total = self.count + 1, self.total + x
+            return count, total, total / self.period if count >= self.period else None
+        return self.count, self.total, (self.value * (self.period - 1) + x) / self.period
+
+    def update(self, x):
+        self.count, self.total, self.value = self._next(x)
+        return self.value
+
+    def peek(self, x):
+        return self._next(x)[2]
+
+
+def true_range(high, low, prev_close):
+    """실제 범위 (첫 봉은 고가-저가)"""
+    if prev_close is None:
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class ATR:
+    """Wilder 평활 평균 실제 범위"""
+    def __init__(self, period=14):
+        self.average = WilderAverage(period)
+        self.prev_close = None
+        self.value = None
+
+    def update(self, high, low, close):
+        self.value = self.average.update(true_range(high, low, self.prev_close))
+        self.prev_close = close
+        return self.value
+
+    def peek(self, high, low, close):
+        return self.average.peek(true_range(high, low, self.prev_close))
+
+
+class SuperTrend:
+    """ATR 밴드 기반 수퍼트렌드 (선, 방향 1/-1, 상단 밴드, 하단 밴드)
+
+    하단 밴드는 직전 종가가 직전 하단 위에 있는 동안 내려가지 않고, 상단 밴드는
+    직전 종가가 직전 상단 아래에 있는 동안 올라가지 않는다. 종가가 직전 반대편
+    밴드를 넘으면 방향이 바뀐다.
+    """
+    def __init__(self, period=10, multiplier=3):
+        self.multiplier = multiplier
+        self.atr = ATR(period)
+        self.upper = None
+        self.lower = None
+        self.direction = 1
+        self.prev_close = None
+        self.value = None
+
+    def _next(self, high, low, close, atr):
+        if atr is None:
+            return None
+        mid = (high + low) / 2
+        upper = mid + self.multiplier * atr
+        lower = mid - self.multiplier * atr
+        direction = self.direction
+        if self.upper is not None:
+            if self.prev_close < self.upper:
+                upper = min(upper, self.upper)
+            if self.prev_close > self.lower:
+                lower = max(lower, self.lower)
+            if direction == -1 and close > self.upper:
+                direction = 1
+            elif direction == 1 and close < self.lower:
+                direction = -1
+        return (lower if direction == 1 else upper), direction, upper, lower
+
+    def update(self, high, low, close):
+        self.value = self._next(high, low, close, self.atr.update(high, low, close))
+        if self.value is not None:
+            _, self.direction, self.upper, self.lower = self.value
+        self.prev_close = close
+        return self.value
+
+    def peek(self, high, low, close):
+        return self._next(high, low, close, self.atr.peek(high, low, close))
+
+
+class DMI:
+    """Wilder 방향성 지수 (+DI, -DI, ADX)"""
+    def __init__(self, period=14):
+        self.tr = WilderAverage(period)
+        self.plus_dm = WilderAverage(period)
+        self.minus_dm = WilderAverage(period)
+        self.adx = WilderAverage(period)
+        self.prev = None
+        self.value = None
+
+    def _moves(self, high, low):
+        prev_high, prev_low, prev_close = self.prev
+        up, down = high - prev_high, prev_low - low
+        plus_dm = up if up > down and up > 0 else 0.0
+        minus_dm = down if down > up and down > 0 else 0.0
+        return true_range(high, low, prev_close), plus_dm, minus_dm
+
+    @staticmethod
+    def _di(tr, plus_dm, minus_dm):
+        if tr is None or plus_dm is None or tr == 0:
+            return None
+        plus_di, minus_di = 100.0 * plus_dm / tr, 100.0 * minus_dm / tr
+        total = plus_di + minus_di
+        return plus_di, minus_di, 100.0 * abs(plus_di - minus_di) / total if total else 0.0
+
+    def update(self, high, low, close):
+        if self.prev is not None:
+            tr, plus_dm, minus_dm = self._moves(high, low)
+            di = self._di(self.tr.update(tr), self.plus_dm.update(plus_dm), self.minus_dm.update(minus_dm))
+            adx = self.adx.update(di[2]) if di is not None else None
+            self.value = (di[0], di[1], adx) if adx is not None else None
+        self.prev = (high, low, close)
+        return self.value
+
+    def peek(self, high, low, close):
+        if self.prev is None:
+            return None
+        tr, plus_dm, minus_dm = self._moves(high, low)
+        di = self._di(self.tr.peek(tr), self.plus_dm.peek(plus_dm), self.minus_dm.peek(minus_dm))
+        adx = self.adx.peek(di[2]) if di is not None else None
+        return (di[0], di[1], adx) if adx is not None else None
+
+
+class DonchianChannel:
+    """period봉 최고가/최저가"""
+    def __init__(self, period=20):
+        self.highs = RollingExtreme(period, 'max')
+        self.lows = RollingExtreme(period, 'min')
+        self.value = None
+
+    @staticmethod
+    def _channel(high, low):
+        return None if high is None else (high, low)
+
+    def update(self, high, low):
+        self.value = self._channel(self.highs.update(high), self.lows.update(low))
+        return self.value
+
+    def peek(self, high, low):
+        return self._channel(self.highs.peek(high), self.lows.peek(low))
+
+
+class Ichimoku:
+    """일목균형표 (전환선, 기준선, 현재 봉의 선행스팬1, 선행스팬2)
+
+    선행스팬은 displacement봉 전에 계산한 값이 현재 봉 위치에 그려지므로
+    최근 displacement봉의 스팬 값을 덱에 보관해 맨 앞 값을 쓴다.
+    """
+    def __init__(self, conversion=9, base=26, span_b=52, displacement=26):
+        self.conversion = DonchianChannel(conversion)
+        self.base = DonchianChannel(base)
+        self.span_b = DonchianChannel(span_b)
+        self.spans = deque(maxlen=displacement)
+        self.value = None
+
+    @staticmethod
+    def _mid(channel):
+        return None if channel is None else (channel[0] + channel[1]) / 2
+
+    def _lines(self, conversion, base, span_b):
+        tenkan, kijun = self._mid(conversion), self._mid(base)
+        span_a = (tenkan + kijun) / 2 if tenkan is not None and kijun is not None else None
+        return tenkan, kijun, (span_a, self._mid(span_b))
+
+    def _visible(self):
+        if len(self.spans) < self.spans.maxlen:
+            return None
+        return self.spans[0]
+
+    @staticmethod
+    def _value(tenkan, kijun, visible):
+        if visible is None or None in visible or tenkan is None or kijun is None:
+            return None
+        return tenkan, kijun, visible[0], visible[1]
+
+    def update(self, high, low):
+        tenkan, kijun, spans = self._lines(self.conversion.update(high, low), self.base.update(high, low),
+                                           self.span_b.update(high, low))
+        visible = self._visible()
+        self.spans.append(spans)
+        self.value = self._value(tenkan, kijun, visible)
+        return self.value
+
+    def peek(self, high, low):
+        tenkan, kijun, _ = self._lines(self.conversion.peek(high, low), self.base.peek(high, low),
+                                       self.span_b.peek(high, low))
+        return self._value(tenkan, kijun, self._visible())
+
+
+class WilliamsR:
+    """윌리엄스 %R (-100 ~ 0)"""
+    def __init__(self, period=14):
+        self.channel = DonchianChannel(period)
+        self.value = None
+
+    @staticmethod
+    def _r(channel, close):
+        if channel is None or channel[0] == channel[1]:
+            return None
+        high, low = channel
+        return -100.0 * (high - close) / (high - low)
+
+    def update(self, high, low, close):
+        self.value = self._r(self.channel.update(high, low), close)
+        return self.value
+
+    def peek(self, high, low, close):
+        return self._r(self.channel.peek(high, low), close)
@@ -0,0 +1,411 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# NumPy 지표 커널
+#
+# 모든 함수는 float64 배열의 마지막 축(시간 축)을 따라 계산하므로 1차원(봉)과
+# 2차원(마켓 x 봉) 입력에 똑같이 쓸 수 있다. 결과는 pandas 계산과 같은 위치에 NaN을
+# 두며(rolling은 min_periods=window), out=에 미리 잡아 둔 배열을 넘기면 결과를
+# 그 배열에 써서 새로 할당하지 않는다.
+
+MARKET_PHASES = ('Strong Bear', 'Bear', 'Neutral', 'Bull', 'Strong Bull')
+MARKET_PHASE_BINS = np.array([-2.0, -0.5, 0.5, 2.0])
+
+
+def as_array(x):
+    """연속된 float64 배열로 변환 (이미 그렇다면 복사하지 않음)"""
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+def _out(out, shape, dtype=np.float64):
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        raise ValueError(f"out 배열 크기가 맞지 않습니다: {out.shape} != {shape}")
+    return out
+
+
+def shift(x, periods=1, out=None):
+    """시간 축으로 periods만큼 미룬 배열 (앞쪽은 NaN)"""
+    x = as_array(x)
+    out = _out(out, x.shape)
+    out[..., :periods] = np.nan
+    out[..., periods:] = x[..., :-periods]
+    return out
+
+
+def rolling_sum(x, window, out=None):
+    """이동 합계 (누적합 차분, 구간에 NaN이 있으면 NaN)"""
+    x = as_array(x)
+    out = _out(out, x.shape)
+    out[...] = np.nan
+    n = x.shape[-1]
+    if window > n:
+        return out
+    nan = np.isnan(x)
+    has_nan = nan.any()
+    values = np.where(nan, 0.0, x) if has_nan else x
+    # 첫 값을 빼고 누적해 큰 가격대에서 생기는 자릿수 손실을 줄인다
+    ref = values[..., :1]
+    csum = np.cumsum(values - ref, axis=-1)
+    result = out[..., window - 1:]
+    result[...] = csum[..., window - 1:]
+    result[..., 1:] -= csum[..., :-window]
+    result += ref * window
+    if has_nan:
+        count = np.cumsum(nan, axis=-1)
+        bad = count[..., window - 1:].copy()
+        bad[..., 1:] -= count[..., :-window]
+        result[bad > 0] = np.nan
+    return out
+
+
+def rolling_mean(x, window, out=None):
+    """이동평균 (pandas rolling(window).mean())"""
+    out = rolling_sum(x, window, out)
+    out /= window
+    return out
+
+
+def rolling_std(x, window, ddof=1, out=None):
+    """이동 표준편차 (pandas rolling(window).std(), 기본 ddof=1)"""
+    x = as_array(x)
+    out = _out(out, x.shape)
+    out[..., :window - 1] = np.nan
+    if window > x.shape[-1]:
+        out[...] = np.nan
+        return out
+    windows = sliding_window_view(x, window, axis=-1)
+    np.std(windows, axis=-1, ddof=ddof, out=out[..., window - 1:])
+    return out
+
+
+def rolling_max(x, window, out=None):
+    x = as_array(x)
+    out = _out(out, x.shape)
+    out[..., :window - 1] = np.nan
+    if window > x.shape[-1]:
+        out[...] = np.nan
+        return out
+    np.max(sliding_window_view(x, window, axis=-1), axis=-1, out=out[..., window - 1:])
+    return out
+
+
+def rolling_min(x, window, out=None):
+    x = as_array(x)
+    out = _out(out, x.shape)
+    out[..., :window - 1] = np.nan
+    if window > x.shape[-1]:
+        out[...] = np.nan
+        return out
+    np.min(sliding_window_view(x, window, axis=-1), axis=-1, out=out[..., window - 1:])
+    return out
+
+
+def ewm_mean(x, span, out=None):
+    """지수이동평균 (pandas ewm(span=span, adjust=True).mean(), 입력에 NaN이 없어야 함)
+
+    y_t = sum(d^(t-i) * x_i) / sum(d^(t-i)) 를 블록 단위 누적합으로 계산한다.
+    블록 길이는 d^-k가 넘치지 않도록 정하고, 블록 사이는 분자 누적값을 넘겨 잇는다.
+    """
+    x = as_array(x)
+    out = _out(out, x.shape)
+    n = x.shape[-1]
+    if n == 0:
+        return out
+    decay = 1.0 - 2.0 / (span + 1.0)
+    if decay <= 0.0:
+        out[...] = x
+        return out
+    block = max(1, min(n, int(np.log(1e-100) / np.log(decay))))
+    steps = np.arange(n, dtype=np.float64)
+    # 가중치 합(분모)은 닫힌 식으로 구한다
+    den = (1.0 - decay ** (steps + 1)) / (1.0 - decay)
+    carry = np.zeros(x.shape[:-1])
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        k = steps[:end - start]
+        power = decay ** k
+        num = np.cumsum(x[..., start:end] * (1.0 / power), axis=-1)
+        num *= power
+        num += carry[..., None] * (power * decay)
+        carry = num[..., -1].copy()
+        np.divide(num, den[start:end], out=out[..., start:end])
+    return out
+
+
+def wilder_mean(x, period=14, out=None):
+    """Wilder 평활 이동평균 (첫 period개 단순평균으로 시작, 이후 (이전*(n-1)+x)/n, 입력에 NaN이 없어야 함)
+
+    ewm_mean과 같은 블록 누적합으로 시작값 이후의 점화식을 한 번에 푼다.
+    """
+    x = as_array(x)
+    out = _out(out, x.shape)
+    out[...] = np.nan
+    n = x.shape[-1]
+    if period > n:
+        return out
+    carry = x[..., :period].mean(axis=-1)
+    out[..., period - 1] = carry
+    decay = 1.0 - 1.0 / period
+    if decay <= 0.0:
+        out[..., period:] = x[..., period:]
+        return out
+    rest = x[..., period:] / period
+    m = rest.shape[-1]
+    block = max(1, min(max(m, 1), int(np.log(1e-100) / np.log(decay))))
+    steps = np.arange(block, dtype=np.float64)
+    for start in range(0, m, block):
+        end = min(start + block, m)
+        power = decay ** steps[:end - start]
+        num = np.cumsum(rest[..., start:end] * (1.0 / power), axis=-1)
+        num *= power
+        num += carry[..., None] * (power * decay)
+        carry = num[..., -1].copy()
+        out[..., period + start:period + end] = num
+    return out
+
+
+def rsi(close, period=14, out=None):
+    """단순이동평균 RSI (첫 봉 변화량은 0으로 포함)"""
+    close = as_array(close)
+    delta = np.diff(close, axis=-1, prepend=close[..., :1])
+    gain = rolling_mean(np.maximum(delta, 0.0), period)
+    loss = rolling_mean(np.maximum(-delta, 0.0), period)
+    out = _out(out, close.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(gain, loss, out=out)
+        out += 1.0
+        np.divide(100.0, out, out=out)
+        np.subtract(100.0, out, out=out)
+    return out
+
+
+def macd(close, fast=12, slow=26, signal=9, out=None):
+    """(MACD, 시그널) - out은 (macd 배열, 시그널 배열)"""
+    close = as_array(close)
+    macd_out, signal_out = out if out is not None else (None, None)
+    line = ewm_mean(close, fast, macd_out)
+    line -= ewm_mean(close, slow)
+    return line, ewm_mean(line, signal, signal_out)
+
+
+def bollinger(close, period=20, num_std=2, out=None):
+    """(상단, 중심, 하단) - out은 배열 3개의 튜플"""
+    close = as_array(close)
+    upper, middle, lower = out if out is not None else (None, None, None)
+    middle = rolling_mean(close, period, middle)
+    std = rolling_std(close, period)
+    std *= num_std
+    upper = _out(upper, close.shape)
+    lower = _out(lower, close.shape)
+    np.add(middle, std, out=upper)
+    np.subtract(middle, std, out=lower)
+    return upper, middle, lower
+
+
+def vwap(close, volume, period=14, out=None):
+    """이동 VWAP sum(종가*거래량) / sum(거래량)"""
+    close = as_array(close)
+    out = rolling_sum(close * as_array(volume), period, out)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out /= rolling_sum(volume, period)
+    return out
+
+
+def true_range(high, low, close, out=None):
+    """TR = max(고가-저가, |고가-전일종가|, |저가-전일종가|) (첫 봉은 고가-저가)"""
+    high, low = as_array(high), as_array(low)
+    prev = shift(close)
+    out = _out(out, high.shape)
+    np.subtract(high, low, out=out)
+    np.fmax(out, np.abs(high - prev), out=out)
+    np.fmax(out, np.abs(low - prev), out=out)
+    return out
+
+
+def atr(high, low, close, period=14, out=None):
+    """평균 실제 범위 (TR의 단순이동평균)"""
+    return rolling_mean(true_range(high, low, close), period, out)
+
+
+def wilder_atr(high, low, close, period=14, out=None):
+    """Wilder 평활 평균 실제 범위 (indicators.ATR과 같은 값)"""
+    return wilder_mean(true_range(high, low, close), period, out)
+
+
+def _rows(x):
+    """(행 수, 봉) 모양으로 본 배열 (1차원은 행 1개)"""
+    return x.reshape(-1, x.shape[-1])
+
+
+def supertrend(high, low, close, period=10, multiplier=3):
+    """(수퍼트렌드 선, 방향 1/-1, 상단 밴드, 하단 밴드) - indicators.SuperTrend와 같은 값
+
+    기본 밴드는 Wilder ATR로 한 번에 구하고, 직전 밴드와 종가에 따라 밴드를 좁히고
+    방향을 바꾸는 점화식만 마켓별로 봉을 따라 푼다.
+    """
+    high, low, close = as_array(high), as_array(low), as_array(close)
+    band = wilder_atr(high, low, close, period)
+    band *= multiplier
+    mid = (high + low) * 0.5
+    basic_upper, basic_lower = mid + band, mid - band
+    direction, upper, lower = (np.full(close.shape, np.nan) for _ in range(3))
+    n = close.shape[-1]
+    start = period - 1
+    for row in range(_rows(close).shape[0]):
+        closes = _rows(close)[row].tolist()
+        uppers = _rows(basic_upper)[row].tolist()
+        lowers = _rows(basic_lower)[row].tolist()
+        trends = [1.0] * n
+        up = down = None
+        trend = 1.0
+        for i in range(start, n):
+            u, d = uppers[i], lowers[i]
+            if up is not None:
+                prev_close = closes[i - 1]
+                if prev_close < up and up < u:
+                    u = up
+                if prev_close > down and down > d:
+                    d = down
+                if trend == -1.0 and closes[i] > up:
+                    trend = 1.0
+                elif trend == 1.0 and closes[i] < down:
+                    trend = -1.0
+            up, down = uppers[i], lowers[i] = u, d
+            trends[i] = trend
+        if start < n:
+            _rows(upper)[row, start:] = uppers[start:]
+            _rows(lower)[row, start:] = lowers[start:]
+            _rows(direction)[row, start:] = trends[start:]
+    line = np.where(direction == 1.0, lower, upper)
+    return line, direction, upper, lower
+
+
+def dmi(high, low, close, period=14):
+    """(+DI, -DI, ADX) - indicators.DMI와 같은 값
+
+    첫 봉은 직전 봉이 없어 평활에 넣지 않는다. 평균 TR이 0인 봉은 DI를 계산하지 않고
+    ADX 평활에서도 건너뛴다.
+    """
+    high, low, close = as_array(high), as_array(low), as_array(close)
+    plus_di, minus_di, adx = (np.full(close.shape, np.nan) for _ in range(3))
+    if close.shape[-1] < 2:
+        return plus_di, minus_di, adx
+    up = np.diff(high, axis=-1)
+    down = -np.diff(low, axis=-1)
+    tr = wilder_mean(true_range(high, low, close)[..., 1:], period)
+    plus_dm = wilder_mean(np.where((up > down) & (up > 0), up, 0.0), period)
+    minus_dm = wilder_mean(np.where((down > up) & (down > 0), down, 0.0), period)
+    tr[tr == 0] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.multiply(100.0, plus_dm / tr, out=plus_di[..., 1:])
+        np.multiply(100.0, minus_dm / tr, out=minus_di[..., 1:])
+        total = plus_di + minus_di
+        dx = np.where(total == 0, 0.0, 100.0 * np.abs(plus_di - minus_di) / total)
+    # DI를 못 구한 봉은 건너뛰고 이어서 평활한다
+    for dx_row, adx_row in zip(_rows(dx), _rows(adx)):
+        valid = np.flatnonzero(~np.isnan(dx_row))
+        adx_row[valid] = wilder_mean(dx_row[valid], period)
+    # 스트리밍 지표처럼 ADX가 나오기 전 봉의 DI는 비워 둔다
+    missing = np.isnan(adx)
+    plus_di[missing] = np.nan
+    minus_di[missing] = np.nan
+    return plus_di, minus_di, adx
+
+
+def trend(close, period=20, out=None):
+    """이동평균의 봉간 변화량"""
+    ma = rolling_mean(close, period)
+    out = _out(out, ma.shape)
+    out[..., 0] = np.nan
+    np.subtract(ma[..., 1:], ma[..., :-1], out=out[..., 1:])
+    return out
+
+
+def pct_change(x, out=None):
+    x = as_array(x)
+    out = _out(out, x.shape)
+    out[..., 0] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(x[..., 1:], x[..., :-1], out=out[..., 1:])
+    out[..., 1:] -= 1.0
+    return out
+
+
+def volatility(close, period=20, out=None):
+    """수익률의 이동 표준편차"""
+    return rolling_std(pct_change(close), period, out=out)
+
+
+def momentum(close, period=14, out=None):
+    """period봉 전 대비 변화율 (%)"""
+    close = as_array(close)
+    prev = shift(close, period)
+    out = _out(out, close.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.subtract(close, prev, out=out)
+        out /= prev
+    out *= 100.0
+    return out
+
+
+def market_phase(close, period=20, out=None):
+    """볼린저 z-score 구간 코드 (0~4: MARKET_PHASES 순서, 계산 불가는 -1)
+
+    pandas.cut(z, [-inf, -2, -0.5, 0.5, 2, inf])와 같은 오른쪽 닫힌 구간을 쓴다.
+    """
+    close = as_array(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (close - rolling_mean(close, period)) / rolling_std(close, period)
+    out = _out(out, close.shape, np.int8)
+    out[...] = np.digitize(z, MARKET_PHASE_BINS, right=True)
+    out[np.isnan(z)] = -1
+    return out
+
+
+def phase_between(codes, low, high):
+    """구간 코드가 low~high 이름 구간 안인지 (계산 불가 -1은 항상 False, 스칼라/배열 공용)"""
+    return (codes >= MARKET_PHASES.index(low)) & (codes <= MARKET_PHASES.index(high))
+
+
+def stochastic(high, low, close, k_period=14, d_period=3, out=None):
+    """(%K, %D) - %D는 %K의 단순이동평균"""
+    close = as_array(close)
+    k_out, d_out = out if out is not None else (None, None)
+    low_min = rolling_min(low, k_period)
+    high_max = rolling_max(high, k_period)
+    k = _out(k_out, close.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.subtract(close, low_min, out=k)
+        k /= high_max - low_min
+    k *= 100.0
+    k[~np.isfinite(k)] = np.nan
+    return k, rolling_mean(k, d_period, d_out)
+
+
+def williams_r(high, low, close, period=14, out=None):
+    """윌리엄스 %R (-100 ~ 0, 구간 고가와 저가가 같으면 NaN)"""
+    close = as_array(close)
+    high_max = rolling_max(high, period)
+    low_min = rolling_min(low, period)
+    out = _out(out, close.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.subtract(high_max, close, out=out)
+        out /= high_max - low_min
+    out *= -100.0
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def ichimoku(high, low, conversion=9, base=26, span_b=52, displacement=26):
+    """(전환선, 기준선, 선행스팬1, 선행스팬2) - 선행스팬은 displacement봉 전 값을 현재 위치에 둔다"""
+    def mid(period):
+        line = rolling_max(high, period)
+        line += rolling_min(low, period)
+        line *= 0.5
+        return line
+
+    tenkan, kijun = mid(conversion), mid(base)
+    span_a = shift((tenkan + kijun) * 0.5, displacement)
+    return tenkan, kijun, span_a, shift(mid(span_b), displacement)
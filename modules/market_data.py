@@ -0,0 +1,151 @@
+import time
+import logging
+import threading
+from dataclasses import dataclass, asdict
+
+from .config import MARKET_DATA_SETTINGS
+from .exchange_client import get_default_client
+
+
+@dataclass(frozen=True)
+class TickerSnapshot:
+    """/v1/ticker 응답 한 건을 담는 시세 스냅샷"""
+    market: str
+    trade_price: float
+    change_rate: float            # 전일 종가 대비 부호 있는 변동률
+    change_price: float           # 전일 종가 대비 부호 있는 변동액
+    acc_trade_volume_24h: float
+    acc_trade_price_24h: float
+    high_price: float
+    low_price: float
+    opening_price: float
+    prev_closing_price: float
+    timestamp: int                # 밀리초 단위
+
+    @classmethod
+    def from_ticker(cls, item):
+        """REST 응답 또는 WebSocket ticker 메시지(dict)로부터 스냅샷 생성"""
+        return cls(
+            market=item.get('market') or item['code'],
+            trade_price=float(item['trade_price']),
+            change_rate=float(item.get('signed_change_rate', 0.0)),
+            change_price=float(item.get('signed_change_price', 0.0)),
+            acc_trade_volume_24h=float(item.get('acc_trade_volume_24h', 0.0)),
+            acc_trade_price_24h=float(item.get('acc_trade_price_24h', 0.0)),
+            high_price=float(item.get('high_price', 0.0)),
+            low_price=float(item.get('low_price', 0.0)),
+            opening_price=float(item.get('opening_price', 0.0)),
+            prev_closing_price=float(item.get('prev_closing_price', 0.0)),
+            timestamp=int(item.get('timestamp', 0))
+        )
+
+    def to_dict(self):
+        """기존 get_current_price 반환 형식(dict)으로 변환"""
+        return asdict(self)
+
+
+def fetch_ticker_snapshots(markets, client=None):
+    """여러 마켓의 시세를 /v1/ticker 한 번의 호출로 조회"""
+    if isinstance(markets, str):
+        markets = [markets]
+    if client is None:
+        client = get_default_client()
+    items = client.get_ticker(list(markets))
+    if not items:
+        return {}
+    if isinstance(items, dict):
+        items = [items]
+    return {item['market']: TickerSnapshot.from_ticker(item) for item in items}
+
+
+def fetch_ticker_snapshot(market, client=None):
+    """단일 마켓 시세 스냅샷 조회"""
+    snapshots = fetch_ticker_snapshots([market], client)
+    snapshot = snapshots.get(market)
+    if snapshot is None:
+        logging.getLogger(__name__).warning(f"시세 응답에 {market} 없음")
+    return snapshot
+
+
+class QuoteService:
+    """여러 마켓 시세를 배치로 조회해 보관하는 시세 서비스
+
+    refresh()가 /v1/ticker를 배치 크기 단위로 호출하고, get()은 네트워크 호출 없이
+    마지막으로 받은 스냅샷을 돌려준다.
+    """
+    def __init__(self, markets=None, batch_size=None, client=None):
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.markets = list(markets) if markets else []
+        self.batch_size = batch_size or MARKET_DATA_SETTINGS['QUOTE_BATCH_SIZE']
+        self.quotes = {}
+        self.updated_at = {}
+        self._lock = threading.Lock()
+
+    def watch(self, markets):
+        """감시 마켓 추가"""
+        for market in markets:
+            if market not in self.markets:
+                self.markets.append(market)
+
+    def refresh(self, markets=None):
+        """시세 일괄 갱신 후 갱신된 스냅샷 dict 반환"""
+        if markets is None:
+            markets = self.markets
+        markets = list(dict.fromkeys(markets))
+        refreshed = {}
+        for idx in range(0, len(markets), self.batch_size):
+            batch = markets[idx: idx + self.batch_size]
+            try:
+                snapshots = fetch_ticker_snapshots(batch, self.client)
+            except Exception as e:
+                self.logger.error(f"시세 일괄 조회 실패 ({len(batch)}개 마켓): {str(e)}")
+                continue
+            now = time.monotonic()
+            with self._lock:
+                self.quotes.update(snapshots)
+                for market in snapshots:
+                    self.updated_at[market] = now
+            refreshed.update(snapshots)
+        return refreshed
+
+    def put(self, snapshot):
+        """외부(스트림 등)에서 받은 스냅샷 반영"""
+        with self._lock:
+            self.quotes[snapshot.market] = snapshot
+            self.updated_at[snapshot.market] = time.monotonic()
+
+    def on_ticker(self, message):
+        """WebSocket ticker 메시지 콜백"""
+        self.put(TickerSnapshot.from_ticker(message))
+
+    def age(self, market):
+        """마지막 갱신 이후 경과 시간 (초), 없으면 None"""
+        updated_at = self.updated_at.get(market)
+        if updated_at is None:
+            return None
+        return time.monotonic() - updated_at
+
+    def get(self, market, max_age=None):
+        """보관 중인 시세 반환 (max_age 초과 시 None)"""
+        with self._lock:
+            snapshot = self.quotes.get(market)
+        if snapshot is None:
+            return None
+        if max_age is not None and self.age(market) > max_age:
+            return None
+        return snapshot
+
+    def get_many(self, markets, max_age=None):
+        """여러 마켓 시세를 dict로 반환 (없는 마켓 제외)"""
+        result = {}
+        for market in markets:
+            snapshot = self.get(market, max_age)
+            if snapshot is not None:
+                result[market] = snapshot
+        return result
+
+    def snapshot(self):
+        """보관 중인 전체 시세 복사본"""
+        with self._lock:
+            return dict(self.quotes)
@@ -0,0 +1,290 @@
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import itertools
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .config import COIN_GROUPS, DEFAULT_FEE
+from .candles import now_kst
+from .candle_db import CandleDatabase
+from .registry import strategy_registry
+from .backtest import run_backtest
+
+# 백테스트에 넘기는 캔들 컬럼
+SWEEP_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+# 결과 표의 성과 컬럼 (정렬 기준으로 쓸 수 있음)
+RESULT_COLUMNS = ('mean_return', 'median_return', 'worst_return', 'max_drawdown', 'win_rate', 'trades')
+
+logger = logging.getLogger(__name__)
+
+
+def parameter_grid(space):
+    """{파라미터: 후보 목록}의 모든 조합 (격자 탐색)"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_space(space, count, seed=None, schema=None):
+    """{파라미터: 후보 목록 또는 (최솟값, 최댓값)}에서 count개 무작위 조합 (중복 제외)
+
+    범위는 스키마 타입이 int면 정수, 아니면 실수로 고르게 뽑는다.
+    """
+    rng = random.Random(seed)
+    schema = schema or {}
+    seen = set()
+    combinations = []
+    # 후보가 적어 중복이 많을 때 끝없이 돌지 않도록 시도 횟수를 제한한다
+    for _ in range(count * 20):
+        if len(combinations) >= count:
+            break
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if schema.get(name, {}).get('type', float) is int:
+                    params[name] = rng.randint(int(low), int(high))
+                else:
+                    params[name] = round(rng.uniform(low, high), 4)
+            else:
+                params[name] = rng.choice(values)
+        key = tuple(sorted(params.items()))
+        if key not in seen:
+            seen.add(key)
+            combinations.append(params)
+    return combinations
+
+
+def parse_space(items, schema):
+    """명령행 'name=v1,v2' (후보 목록) 또는 'name=low:high' (범위) 목록을 탐색 공간으로 변환"""
+    space = {}
+    for item in items:
+        name, _, text = item.partition('=')
+        name = name.strip()
+        if name not in schema:
+            raise ValueError(f"전략에 없는 파라미터: {name}")
+        cast = schema[name]['type']
+        if ':' in text:
+            low, high, *step = (cast(value) for value in text.split(':'))
+            if step:
+                # low:high:step은 격자 후보 목록
+                count = int(round((high - low) / step[0])) + 1
+                space[name] = [cast(round(low + i * step[0], 10)) for i in range(count)]
+            else:
+                space[name] = (low, high)
+        else:
+            space[name] = [cast(value) for value in text.split(',') if value.strip()]
+    return space
+
+
+class SharedCandles:
+    """여러 마켓 컬럼 배열을 공유 메모리 블록 하나에 담아 워커 프로세스가 복사 없이 읽게 함
+
+    블록은 (컬럼 x 전체 봉) float64 배열이고 마켓별로 (시작 위치, 봉 수)를 기록한다.
+    워커에는 블록 이름과 위치 정보(meta)만 넘기므로 작업마다 캔들이 피클되지 않는다.
+    """
+    def __init__(self, data, columns=SWEEP_COLUMNS):
+        markets = [(market, len(arrays['close'])) for market, arrays in data.items()]
+        total = sum(length for _, length in markets)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, total * len(columns) * 8))
+        block = np.ndarray((len(columns), total), dtype=np.float64, buffer=self.shm.buf)
+        offsets = []
+        offset = 0
+        for market, length in markets:
+            for i, column in enumerate(columns):
+                block[i, offset:offset + length] = data[market][column]
+            offsets.append((market, offset, length))
+            offset += length
+        self.meta = {'name': self.shm.name, 'columns': tuple(columns), 'total': total, 'markets': offsets}
+
+    @staticmethod
+    def attach(meta):
+        """meta로 공유 블록에 붙어 (SharedMemory, {마켓: {컬럼: 읽기 전용 배열}}) 반환"""
+        # 블록 등록과 삭제는 만든 프로세스가 맡는다. 워커는 부모의 자원 추적기를
+        # 같이 쓰므로 여기서 등록을 지우면 부모의 unlink()가 추적기 오류를 낸다.
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=meta['name'], track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=meta['name'])
+        block = np.ndarray((len(meta['columns']), meta['total']), dtype=np.float64, buffer=shm.buf)
+        block.flags.writeable = False
+        data = {
+            market: {column: block[i, offset:offset + length] for i, column in enumerate(meta['columns'])}
+            for market, offset, length in meta['markets']
+        }
+        return shm, data
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 워커 프로세스별 공유 캔들 (초기화 함수에서 한 번 붙는다)
+_worker = {}
+
+
+def _init_worker(meta, options):
+    shm, data = SharedCandles.attach(meta)
+    _worker.update(shm=shm, data=data, options=options)
+
+
+def aggregate_stats(stats):
+    """마켓별 백테스트 통계 목록을 결과 표 한 행(RESULT_COLUMNS)으로 집계"""
+    returns = np.array([item['total_return'] for item in stats])
+    drawdowns = [item['max_drawdown'] for item in stats]
+    trades = sum(item['trades'] for item in stats)
+    return {
+        'mean_return': float(returns.mean()),
+        'median_return': float(np.median(returns)),
+        'worst_return': float(returns.min()),
+        'max_drawdown': float(min(drawdowns)),
+        'win_rate': float((returns > 0).mean()),
+        'trades': trades
+    }
+
+
+def evaluate_params(key, params, data, fee=DEFAULT_FEE, stop_loss=None, take_profit=None):
+    """파라미터 조합 하나를 모든 마켓에 백테스트해 마켓 평균 성과 dict 반환"""
+    return aggregate_stats([
+        run_backtest(strategy_registry.create(key, params), arrays, fee, stop_loss, take_profit)['stats']
+        for arrays in data.values()
+    ])
+
+
+def _run_task(task):
+    key, params = task
+    try:
+        return dict(params, **evaluate_params(key, params, _worker['data'], **_worker['options']))
+    except Exception as e:
+        logger.error(f"파라미터 백테스트 실패 ({key} {params}): {str(e)}")
+        return dict(params, error=str(e))
+
+
+def optimize(key, candidates, data, workers=None, objective='mean_return', fee=DEFAULT_FEE,
+             stop_loss=None, take_profit=None):
+    """파라미터 조합 목록을 백테스트해 objective 내림차순으로 정렬한 결과 DataFrame 반환
+
+    data는 {마켓: {컬럼: 1차원 배열}}이다. workers가 1이면 현재 프로세스에서,
+    아니면 공유 메모리 캔들을 쓰는 프로세스 풀에서 나눠 실행한다.
+    손절/익절(%)을 생략하면 TRADE_SETTINGS를 따른다.
+    """
+    options = {'fee': fee, 'stop_loss': stop_loss, 'take_profit': take_profit}
+    if objective not in RESULT_COLUMNS:
+        raise ValueError(f"알 수 없는 정렬 기준: {objective}")
+    # 잘못된 조합은 워커로 보내기 전에 걸러 낸다
+    tasks = []
+    for params in candidates:
+        try:
+            tasks.append((key, strategy_registry.resolve_params(key, params)))
+        except ValueError as e:
+            logger.warning(f"건너뛴 파라미터 조합 {params}: {str(e)}")
+    data = {market: arrays for market, arrays in data.items() if len(arrays['close'])}
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) <= 1:
+        _worker.update(data=data, options=options)
+        try:
+            rows = [_run_task(task) for task in tasks]
+        finally:
+            _worker.clear()
+    else:
+        with SharedCandles(data) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.meta, options)) as executor:
+                chunksize = max(1, len(tasks) // (workers * 8))
+                rows = list(executor.map(_run_task, tasks, chunksize=chunksize))
+
+    results = pd.DataFrame(rows)
+    if objective in results:
+        results = results.sort_values(objective, ascending=False, na_position='last', ignore_index=True)
+    results.insert(0, 'rank', np.arange(1, len(results) + 1))
+    return results
+
+
+def load_candles(db, markets, interval, start=None, limit=None, columns=SWEEP_COLUMNS):
+    """캔들 DB에서 마켓별 컬럼 배열 dict 읽기 (캔들이 없는 마켓은 제외)"""
+    data = {}
+    for market in markets:
+        arrays = db.load_arrays(market, interval, start=start, limit=limit)
+        if len(arrays['close']):
+            data[market] = {column: arrays[column] for column in columns}
+        else:
+            logger.warning(f"{market} {interval} 캔들이 없어 제외합니다.")
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='전략 파라미터 탐색 (병렬 백테스트)')
+    parser.add_argument('--strategy', required=True, help='STRATEGIES 키 (예: RSI)')
+    parser.add_argument('--param', action='append', default=[],
+                        help="탐색할 파라미터: name=v1,v2 (후보), name=low:high:step (격자), "
+                             "name=low:high (무작위 탐색 범위), 여러 번 지정 가능")
+    parser.add_argument('--random', type=int, default=0, help='무작위 탐색 조합 수 (0이면 격자 탐색)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--markets', default='all',
+                        help="쉼표로 구분한 마켓 목록 또는 all (COIN_GROUPS 전체)")
+    parser.add_argument('--interval', default='minute5')
+    parser.add_argument('--days', type=float, default=None, help='최근 며칠 구간 (기본: 전체)')
+    parser.add_argument('--limit', type=int, default=None, help='마켓별 최근 봉 수')
+    parser.add_argument('--db', default=None, help='캔들 DB 경로 (기본: CANDLE_SETTINGS)')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE)
+    parser.add_argument('--stop-loss', type=float, default=None, help='손절 비율 %% (0이면 사용 안 함)')
+    parser.add_argument('--take-profit', type=float, default=None, help='익절 비율 %% (0이면 사용 안 함)')
+    parser.add_argument('--objective', default='mean_return', choices=RESULT_COLUMNS)
+    parser.add_argument('--out', default=None, help='결과 CSV 경로 (기본: optimize_<전략>.csv)')
+    parser.add_argument('--top', type=int, default=10, help='화면에 보여 줄 상위 결과 수')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    if args.markets == 'all':
+        markets = list(dict.fromkeys(m for group in COIN_GROUPS.values() for m in group))
+    else:
+        markets = [m.strip() for m in args.markets.split(',') if m.strip()]
+
+    schema = strategy_registry.schema(args.strategy)
+    space = parse_space(args.param, schema)
+    if args.random:
+        candidates = random_space(space, args.random, args.seed, schema)
+    else:
+        ranges = [name for name, values in space.items() if isinstance(values, tuple)]
+        if ranges:
+            parser.error(f"격자 탐색에는 범위 대신 후보 목록이나 step이 필요합니다: {', '.join(ranges)}")
+        candidates = parameter_grid(space)
+
+    db = CandleDatabase(args.db)
+    start = now_kst() - timedelta(days=args.days) if args.days else None
+    data = load_candles(db, markets, args.interval, start, args.limit)
+    db.close()
+    if not data:
+        logger.error("백테스트할 캔들이 없습니다.")
+        return 1
+
+    logger.info(f"{args.strategy} 파라미터 {len(candidates)}개 조합 x {len(data)}개 마켓 탐색 시작")
+    started = time.time()
+    results = optimize(args.strategy, candidates, data, args.workers, args.objective, args.fee,
+                       args.stop_loss, args.take_profit)
+    logger.info(f"탐색 완료: {time.time() - started:.1f}초")
+
+    out = args.out or f"optimize_{args.strategy}.csv"
+    results.to_csv(out, index=False)
+    logger.info(f"결과 저장: {out}")
+    print(results.head(args.top).to_string(index=False))
+    return 0 if 'error' not in results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import time
+import logging
+import threading
+
+import numpy as np
+
+DEFAULT_DEPTH = 30
+
+
+class OrderBook:
+    """배열 기반 호가창 (매도호가 오름차순, 매수호가 내림차순)
+
+    스냅샷은 미리 잡아 둔 배열에 제자리로 덮어쓰고, 호가 단위 변경은
+    apply_level()로 반영한다. 최우선 호가는 O(1), 누적 잔량과 예상 체결가는
+    O(호가 수)로 계산한다.
+    """
+    def __init__(self, market, depth=DEFAULT_DEPTH):
+        self.market = market
+        self.depth = depth
+        self.ask_prices = np.zeros(depth)
+        self.ask_sizes = np.zeros(depth)
+        self.bid_prices = np.zeros(depth)
+        self.bid_sizes = np.zeros(depth)
+        self.n_asks = 0
+        self.n_bids = 0
+        self.timestamp = 0
+        self.updated_at = 0.0
+
+    def update_snapshot(self, message):
+        """REST /v1/orderbook 항목 또는 WebSocket orderbook 메시지 반영"""
+        units = message.get('orderbook_units', [])[:self.depth]
+        n = len(units)
+        for i, unit in enumerate(units):
+            self.ask_prices[i] = unit['ask_price']
+            self.ask_sizes[i] = unit['ask_size']
+            self.bid_prices[i] = unit['bid_price']
+            self.bid_sizes[i] = unit['bid_size']
+        self.n_asks = self.n_bids = n
+        self.timestamp = message.get('timestamp', 0)
+        self.updated_at = time.monotonic()
+
+    def _side(self, side):
+        if side == 'ask':
+            return self.ask_prices, self.ask_sizes, self.n_asks
+        if side == 'bid':
+            return self.bid_prices, self.bid_sizes, self.n_bids
+        raise ValueError(f"알 수 없는 호가 방향: {side}")
+
+    def apply_level(self, side, price, size):
+        """호가 한 단계 갱신 (size 0이면 삭제, 없던 가격이면 정렬 위치에 삽입)"""
+        prices, sizes, n = self._side(side)
+        # 매수호가는 내림차순이므로 부호를 뒤집어 오름차순 탐색
+        keys = prices[:n] if side == 'ask' else -prices[:n]
+        key = price if side == 'ask' else -price
+        i = int(np.searchsorted(keys, key))
+        exists = i < n and prices[i] == price
+        if size <= 0:
+            if exists:
+                prices[i:n - 1] = prices[i + 1:n]
+                sizes[i:n - 1] = sizes[i + 1:n]
+                n -= 1
+        elif exists:
+            sizes[i] = size
+        elif i < self.depth:
+            end = min(n, self.depth - 1)
+            prices[i + 1:end + 1] = prices[i:end]
+            sizes[i + 1:end + 1] = sizes[i:end]
+            prices[i] = price
+            sizes[i] = size
+            n = end + 1
+        if side == 'ask':
+            self.n_asks = n
+        else:
+            self.n_bids = n
+        self.updated_at = time.monotonic()
+
+    def best_ask(self):
+        return float(self.ask_prices[0]) if self.n_asks else None
+
+    def best_bid(self):
+        return float(self.bid_prices[0]) if self.n_bids else None
+
+    def spread(self):
+        if not (self.n_asks and self.n_bids):
+            return None
+        return float(self.ask_prices[0] - self.bid_prices[0])
+
+    def mid_price(self):
+        if not (self.n_asks and self.n_bids):
+            return None
+        return float(self.ask_prices[0] + self.bid_prices[0]) / 2
+
+    def cumulative_depth(self, side):
+        """호가 단계별 누적 (수량, 금액)"""
+        prices, sizes, n = self._side(side)
+        return np.cumsum(sizes[:n]), np.cumsum(prices[:n] * sizes[:n])
+
+    def depth_to_amount(self, side, amount):
+        """금액(KRW)만큼 체결하는 데 필요한 호가 단계 수와 수량
+
+        side는 소비할 호가 방향 ('ask': 매수 시 매도호가, 'bid': 매도 시 매수호가).
+        """
+        volumes, notionals = self.cumulative_depth(side)
+        levels = int(np.searchsorted(notionals, amount)) + 1
+        return {
+            'levels': min(levels, len(notionals)),
+            'volume': float(volumes[min(levels, len(volumes)) - 1]) if len(volumes) else 0.0,
+            'available': float(notionals[-1]) if len(notionals) else 0.0,
+            'enough': bool(len(notionals) and notionals[-1] >= amount)
+        }
+
+    def expected_fill(self, side, amount=None, volume=None):
+        """시장가 주문의 예상 체결 결과 (VWAP)
+
+        side: 'bid'(매수, 매도호가 소비) / 'ask'(매도, 매수호가 소비)
+        amount(KRW 금액) 또는 volume(수량) 중 하나를 지정한다.
+        """
+        if (amount is None) == (volume is None):
+            raise ValueError("amount와 volume 중 하나만 지정해야 합니다.")
+        book_side = 'ask' if side == 'bid' else 'bid'
+        prices, sizes, n = self._side(book_side)
+        prices, sizes = prices[:n], sizes[:n]
+        if n == 0:
+            return None
+
+        if amount is not None:
+            cum = np.cumsum(prices * sizes)
+            target = amount
+        else:
+            cum = np.cumsum(sizes)
+            target = volume
+        k = int(np.searchsorted(cum, target))
+        filled = k < n
+        if filled:
+            before = cum[k - 1] if k > 0 else 0.0
+            rest = target - before
+            if amount is not None:
+                fill_volume = sizes[:k].sum() + rest / prices[k]
+                cost = target
+            else:
+                fill_volume = target
+                cost = (prices[:k] * sizes[:k]).sum() + rest * prices[k]
+            levels = k + 1
+        else:
+            fill_volume = sizes.sum()
+            cost = (prices * sizes).sum()
+            levels = n
+
+        avg_price = cost / fill_volume if fill_volume else 0.0
+        best = prices[0]
+        return {
+            'avg_price': float(avg_price),
+            'volume': float(fill_volume),
+            'cost': float(cost),
+            'levels': levels,
+            'filled': bool(filled),
+            'slippage': float(abs(avg_price - best) / best) if best else 0.0
+        }
+
+
+class OrderBookMirror:
+    """마켓별 로컬 호가창 모음 (스트림/REST 스냅샷으로 갱신)"""
+    def __init__(self, depth=DEFAULT_DEPTH):
+        self.logger = logging.getLogger(__name__)
+        self.depth = depth
+        self.books = {}
+        self._lock = threading.Lock()
+
+    def get(self, market):
+        """마켓 호가창 (없으면 빈 호가창 생성)"""
+        with self._lock:
+            book = self.books.get(market)
+            if book is None:
+                book = self.books[market] = OrderBook(market, self.depth)
+            return book
+
+    def on_orderbook(self, message):
+        """WebSocket orderbook 메시지 콜백"""
+        market = message.get('code') or message.get('market')
+        self.get(market).update_snapshot(message)
+
+    def refresh(self, client, markets):
+        """REST /v1/orderbook 한 번으로 여러 마켓 호가창 갱신"""
+        for item in client.get_orderbook(markets):
+            self.on_orderbook(item)
+
+    def age(self, market):
+        book = self.books.get(market)
+        if book is None or not book.updated_at:
+            return None
+        return time.monotonic() - book.updated_at
@@ -0,0 +1,217 @@
+import time
+import heapq
+import itertools
+import logging
+import threading
+from contextlib import contextmanager
+
+from .config import RATE_LIMIT_SETTINGS
+
+# 요청 우선순위 (숫자가 작을수록 먼저 처리, 같은 요청 수 제한 그룹 안에서만 비교)
+PRIORITY_ORDER = 0
+PRIORITY_QUOTE = 1
+PRIORITY_UI = 2
+
+
+def request_group(method, path):
+    """요청 경로를 업비트 요청 수 제한 그룹으로 변환"""
+    if path.startswith('/v1/market'):
+        return 'market'
+    if path.startswith('/v1/candles'):
+        return 'candle'
+    if path.startswith('/v1/trades'):
+        return 'trade'
+    if path.startswith('/v1/ticker'):
+        return 'ticker'
+    if path.startswith('/v1/orderbook'):
+        return 'orderbook'
+    if (method == 'POST' and path == '/v1/orders') or (method == 'DELETE' and path == '/v1/order'):
+        return 'order'
+    return 'default'
+
+
+class TokenBucket:
+    """초당 요청 수 제한용 토큰 버킷"""
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now=None):
+        now = time.monotonic() if now is None else now
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def wait_time(self, now=None):
+        """토큰 1개를 얻기까지 남은 시간 (초)"""
+        now = time.monotonic() if now is None else now
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def sync(self, remaining_sec):
+        """Remaining-Req 헤더의 초당 잔여 요청 수로 토큰 보정"""
+        self.refill()
+        self.tokens = min(self.tokens, float(remaining_sec))
+
+    def block(self, seconds):
+        """일정 시간 요청 차단 (429 응답 시)"""
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class SingleFlight:
+    """같은 키의 동시 요청을 하나의 실행으로 합치는 도우미"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'event': threading.Event(), 'result': None, 'error': None}
+
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['event'].set()
+
+
+class RequestScheduler:
+    """요청 수 제한 그룹별 토큰 버킷과 우선순위 대기열을 관리하는 스케줄러
+
+    토큰이 없으면 실패하는 대신 대기열에 넣고, 같은 그룹 안에서는 주문 > 시세 > UI
+    순으로 먼저 토큰을 받는다. 같은 조회 요청이 동시에 들어오면 하나로 합친다.
+
+    우선순위는 그룹별 대기열 안에서만 적용된다. 업비트 제한이 그룹마다 따로라
+    주문('order')과 시세('ticker', 'candle' 등)는 같은 토큰을 두고 다투지 않으므로,
+    시세 요청이 밀려 있어도 주문은 기다리지 않고 그 반대도 마찬가지다. 그룹을
+    넘나드는 하나의 대기열은 앞선 요청이 자기 그룹 토큰을 기다리는 동안 다른 그룹
+    요청까지 붙잡아 두므로 쓰지 않는다. 우선순위가 실제로 갈리는 곳은 계좌/주문
+    조회와 UI 갱신이 함께 쓰는 'default'처럼 여러 용도의 요청이 섞이는 그룹이다.
+    """
+    def __init__(self, limits=None, max_retries=3, backoff=1.0):
+        self.logger = logging.getLogger(__name__)
+        limits = limits or RATE_LIMIT_SETTINGS
+        self.buckets = {group: TokenBucket(rate) for group, rate in limits.items()}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.waiting = {}
+        self.flight = SingleFlight()
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._local = threading.local()
+
+    @contextmanager
+    def priority(self, priority):
+        """현재 스레드의 요청 우선순위 지정"""
+        previous = getattr(self._local, 'priority', None)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def current_priority(self, group):
+        """현재 스레드의 우선순위 (지정하지 않았으면 주문 그룹은 주문, 나머지는 시세 우선순위)"""
+        priority = getattr(self._local, 'priority', None)
+        if priority is not None:
+            return priority
+        return PRIORITY_ORDER if group == 'order' else PRIORITY_QUOTE
+
+    def _bucket(self, group):
+        bucket = self.buckets.get(group)
+        if bucket is None:
+            bucket = self.buckets[group] = TokenBucket(self.buckets['default'].rate)
+        return bucket
+
+    def acquire(self, group, priority=None):
+        """토큰을 얻을 때까지 대기 (같은 그룹 대기 요청 중 우선순위 순)"""
+        if priority is None:
+            priority = self.current_priority(group)
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            bucket = self._bucket(group)
+            heap = self.waiting.setdefault(group, [])
+            heapq.heappush(heap, ticket)
+            while True:
+                wait = bucket.wait_time()
+                if heap[0] == ticket and wait == 0:
+                    heapq.heappop(heap)
+                    bucket.take()
+                    self._cond.notify_all()
+                    return
+                self._cond.wait(wait if wait > 0 else None)
+
+    def update(self, remaining_req, group=None):
+        """응답의 Remaining-Req 정보 반영 (group 미지정 시 헤더의 그룹 사용)"""
+        if not remaining_req:
+            return
+        with self._cond:
+            self._bucket(group or remaining_req['group']).sync(remaining_req['sec'])
+
+    def penalize(self, group, seconds=None):
+        """429 응답을 받은 그룹을 잠시 차단"""
+        with self._cond:
+            self._bucket(group).block(seconds or self.backoff)
+            self._cond.notify_all()
+
+    def submit(self, group, fn, key=None, priority=None, retry_on=()):
+        """제한 안에서 fn 실행 (key가 같으면 동시 요청을 합침)
+
+        retry_on 예외가 발생하면 그룹을 잠시 차단한 뒤 max_retries까지 다시 시도한다.
+        """
+        if priority is None:
+            priority = self.current_priority(group)
+
+        def call():
+            for attempt in range(self.max_retries + 1):
+                self.acquire(group, priority)
+                try:
+                    return fn()
+                except retry_on:
+                    if attempt == self.max_retries:
+                        raise
+                    self.logger.warning(f"요청 수 제한 초과 ({group}), {self.backoff * (attempt + 1):.1f}초 후 재시도")
+                    self.penalize(group, self.backoff * (attempt + 1))
+
+        if key is None:
+            return call()
+        return self.flight.do(key, call)
+
+    def get_status(self):
+        """그룹별 잔여 토큰과 대기 요청 수"""
+        with self._cond:
+            status = {}
+            for group, bucket in self.buckets.items():
+                bucket.refill()
+                status[group] = {
+                    'tokens': bucket.tokens,
+                    'rate': bucket.rate,
+                    'waiting': len(self.waiting.get(group, []))
+                }
+            return status
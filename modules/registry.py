@@ -0,0 +1,243 @@
+import logging
+import threading
+from collections import OrderedDict
+
+from . import strategies
+from .strategies import evaluate_strategy
+from .config import STRATEGIES, STRATEGY_SETTINGS
+
+
+def param(default, type_=int, low=None, high=None):
+    """전략 파라미터 스키마 항목"""
+    return {'default': default, 'type': type_, 'min': low, 'max': high}
+
+
+# STRATEGIES 키별 전략 클래스 이름과 파라미터 스키마
+# 클래스는 처음 쓰일 때 strategies 모듈에서 찾고, 객체도 처음 요청될 때 만든다.
+# 'ordered'의 각 묶음은 앞에서부터 값이 커져야 하는 파라미터 이름이다.
+STRATEGY_SPECS = {
+    'RSI': {
+        'factory': 'RSIStrategy',
+        'params': {
+            'period': param(14, int, 2, 100),
+            'oversold': param(30, float, 0, 100),
+            'overbought': param(70, float, 0, 100)
+        },
+        'ordered': [('oversold', 'overbought')],
+        'target_rate': 0.02
+    },
+    'MACD': {
+        'factory': 'MACDStrategy',
+        'params': {
+            'fast': param(12, int, 2, 100),
+            'slow': param(26, int, 2, 200),
+            'signal': param(9, int, 2, 100)
+        },
+        'ordered': [('fast', 'slow')]
+    },
+    'BB': {
+        'factory': 'BollingerBandsStrategy',
+        'params': {
+            'period': param(20, int, 2, 200),
+            'std_dev': param(2, float, 0.5, 5)
+        }
+    },
+    'SMA': {
+        'factory': 'SMAStrategy',
+        'params': {
+            'short_period': param(5, int, 1, 100),
+            'long_period': param(20, int, 2, 200)
+        },
+        'ordered': [('short_period', 'long_period')]
+    },
+    'VWAP': {'factory': 'VWAPStrategy', 'params': {'period': param(14, int, 1, 200)}},
+    'Stochastic': {
+        'factory': 'StochasticStrategy',
+        'params': {
+            'k_period': param(14, int, 2, 100),
+            'd_period': param(3, int, 1, 50)
+        }
+    },
+    'Ichimoku': {
+        'factory': 'IchimokuStrategy',
+        'params': {
+            'conversion': param(9, int, 2, 100),
+            'base': param(26, int, 2, 200),
+            'span_b': param(52, int, 2, 200),
+            'displacement': param(26, int, 1, 100)
+        }
+    },
+    'SuperTrend': {
+        'factory': 'SuperTrendStrategy',
+        'params': {
+            'period': param(10, int, 2, 100),
+            'multiplier': param(3, float, 0.5, 10)
+        }
+    },
+    'DMI': {'factory': 'DMIStrategy', 'params': {'period': param(14, int, 2, 100)}},
+    'Williams': {
+        'factory': 'WilliamsStrategy',
+        'params': {
+            'period': param(14, int, 2, 100),
+            'oversold': param(-80, float, -100, 0),
+            'overbought': param(-20, float, -100, 0)
+        },
+        'ordered': [('oversold', 'overbought')]
+    },
+    'TrendFollow': {
+        'factory': 'TrendFollowStrategy',
+        'params': {
+            'fast': param(12, int, 2, 100),
+            'slow': param(26, int, 2, 200),
+            'signal': param(9, int, 2, 100),
+            'rsi_period': param(14, int, 2, 100)
+        },
+        'ordered': [('fast', 'slow')]
+    },
+    'VolBreakout': {
+        'factory': 'VolBreakoutStrategy',
+        'params': {
+            'period': param(20, int, 2, 200),
+            'std_dev': param(2, float, 0.5, 5),
+            'volume_ratio': param(1.5, float, 1, 10)
+        }
+    },
+    'MultiMA': {
+        'factory': 'MultiMAStrategy',
+        'params': {
+            'short_period': param(5, int, 1, 100),
+            'mid_period': param(20, int, 2, 200),
+            'long_period': param(60, int, 2, 200)
+        },
+        'ordered': [('short_period', 'mid_period', 'long_period')]
+    },
+    'MomentumRev': {
+        'factory': 'MomentumRevStrategy',
+        'params': {
+            'rsi_period': param(14, int, 2, 100),
+            'k_period': param(14, int, 2, 100),
+            'd_period': param(3, int, 1, 50),
+            'oversold': param(30, float, 0, 100),
+            'overbought': param(70, float, 0, 100)
+        },
+        'ordered': [('oversold', 'overbought')]
+    },
+    'VolumeBreak': {
+        'factory': 'VolumeBreakStrategy',
+        'params': {
+            'period': param(20, int, 2, 200),
+            'volume_ratio': param(2.0, float, 1, 10)
+        }
+    },
+    'AI_Basic': {'factory': 'AIBasicStrategy', 'params': {}},
+    'AI_Advanced': {'factory': 'AIAdvancedStrategy', 'params': {}},
+    'AI_Full': {'factory': 'AIFullStrategy', 'params': {}}
+}
+
+
+class StrategyRegistry:
+    """STRATEGIES 키로 전략 객체를 만들고 (키, 파라미터, 마켓)별로 보관하는 레지스트리
+
+    객체는 처음 요청될 때 만들고, 캔들 데이터를 함께 넘기면 그 자리에서 한 번
+    판단해 지표 상태를 채워 둔다(워밍). 이후 같은 조합은 보관된 객체를 그대로
+    돌려주므로 UI에서 전략을 바꿔도 스트리밍 전략은 새로 닫힌 봉만 반영한다.
+    스트리밍 전략은 마켓별 상태를 가지므로 마켓마다 따로 보관한다.
+    """
+    def __init__(self, specs=None, max_instances=None):
+        self.logger = logging.getLogger(__name__)
+        self.specs = STRATEGY_SPECS if specs is None else specs
+        self.max_instances = max_instances or STRATEGY_SETTINGS['MAX_INSTANCES']
+        self.created = 0
+        self._instances = OrderedDict()
+        self._lock = threading.Lock()
+        missing = [key for key in STRATEGIES if key not in self.specs]
+        if missing:
+            self.logger.warning(f"레지스트리에 없는 전략: {', '.join(missing)}")
+
+    def keys(self):
+        return list(self.specs)
+
+    def spec(self, key):
+        spec = self.specs.get(key)
+        if spec is None:
+            raise ValueError(f"알 수 없는 전략: {key}")
+        return spec
+
+    def schema(self, key):
+        """전략 파라미터 스키마 {이름: {default, type, min, max}}"""
+        return self.spec(key)['params']
+
+    def target_rate(self, key):
+        """목표 매수/매도가 폭 (현재가 대비)"""
+        return self.specs.get(key, {}).get('target_rate', STRATEGY_SETTINGS['TARGET_RATE'])
+
+    def resolve_params(self, key, params=None):
+        """기본값을 채우고 형 변환/범위를 확인한 파라미터 dict"""
+        schema = self.schema(key)
+        params = params or {}
+        unknown = set(params) - set(schema)
+        if unknown:
+            raise ValueError(f"{key} 전략에 없는 파라미터: {', '.join(sorted(unknown))}")
+        resolved = {}
+        for name, rule in schema.items():
+            value = rule['type'](params.get(name, rule['default']))
+            if rule['min'] is not None and value < rule['min']:
+                raise ValueError(f"{key}.{name} 값이 최솟값 {rule['min']}보다 작습니다: {value}")
+            if rule['max'] is not None and value > rule['max']:
+                raise ValueError(f"{key}.{name} 값이 최댓값 {rule['max']}보다 큽니다: {value}")
+            resolved[name] = value
+        for names in self.spec(key).get('ordered', ()):
+            for low, high in zip(names, names[1:]):
+                if resolved[low] >= resolved[high]:
+                    raise ValueError(f"{key}.{low} 값({resolved[low]})은 {high} 값({resolved[high]})보다 작아야 합니다")
+        return resolved
+
+    def create(self, key, params=None):
+        """보관하지 않는 새 전략 객체"""
+        factory = getattr(strategies, self.spec(key)['factory'])
+        return factory(**self.resolve_params(key, params))
+
+    def get(self, key, market=None, params=None, data=None):
+        """(키, 파라미터, 마켓) 전략 객체 (처음이면 만들고 data가 있으면 워밍)"""
+        resolved = self.resolve_params(key, params)
+        cache_key = (key, tuple(sorted(resolved.items())), market)
+        with self._lock:
+            strategy = self._instances.get(cache_key)
+            if strategy is not None:
+                self._instances.move_to_end(cache_key)
+                return strategy
+
+        strategy = self.create(key, resolved)
+        if data is not None:
+            self.warm(strategy, data)
+        with self._lock:
+            # 다른 스레드가 먼저 만들었다면 그 객체를 쓴다
+            existing = self._instances.get(cache_key)
+            if existing is not None:
+                return existing
+            self._instances[cache_key] = strategy
+            self.created += 1
+            while len(self._instances) > self.max_instances:
+                self._instances.popitem(last=False)
+        return strategy
+
+    def warm(self, strategy, data):
+        """캔들 데이터로 한 번 판단해 지표 상태/캐시를 채움"""
+        try:
+            evaluate_strategy(strategy, data)
+        except Exception as e:
+            self.logger.error(f"전략 워밍 실패 ({type(strategy).__name__}): {str(e)}")
+
+    def evict(self, key=None, market=None):
+        """보관 중인 전략 객체 삭제"""
+        with self._lock:
+            for cache_key in list(self._instances):
+                if (key is None or cache_key[0] == key) and (market is None or cache_key[2] == market):
+                    del self._instances[cache_key]
+
+    def __len__(self):
+        return len(self._instances)
+
+
+# 트레이더/백테스트가 함께 쓰는 기본 레지스트리
+strategy_registry = StrategyRegistry()
@@ -0,0 +1,139 @@
+import json
+import asyncio
+import logging
+import threading
+
+import websockets
+
+
+def load_messages(path):
+    """JSON Lines 파일에서 기록된 메시지 로드"""
+    messages = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                messages.append(json.loads(line))
+    return messages
+
+
+class MessageRecorder:
+    """스트림 메시지를 JSON Lines 파일로 기록하는 콜백
+
+    사용 예:
+        recorder = MessageRecorder('data/stream.jsonl')
+        stream.subscribe('*', recorder)
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, message):
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(message, ensure_ascii=False) + '\n')
+
+
+class ReplayServer:
+    """기록된 시세 메시지를 재생하는 로컬 대체 WebSocket 서버
+
+    업비트와 같은 구독 메시지를 받아 요청한 유형/마켓에 해당하는 메시지만
+    바이너리 프레임으로 보낸다. drop_after를 지정하면 그만큼 보낸 뒤 연결을
+    끊어 재연결 동작을 확인할 수 있다.
+    """
+    def __init__(self, messages=None, path=None, host='127.0.0.1', port=0,
+                 interval=0.0, repeat=False, drop_after=None):
+        self.logger = logging.getLogger(__name__)
+        if messages is None:
+            messages = load_messages(path) if path else []
+        self.messages = list(messages)
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.repeat = repeat
+        self.drop_after = drop_after
+        self.connection_count = 0
+        self._loop = None
+        self._thread = None
+        self._stop = None
+        self._ready = threading.Event()
+
+    @property
+    def uri(self):
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self, timeout=5.0):
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self._run_loop, name='ReplayServer', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("재생 서버 시작 시간 초과")
+        return self
+
+    def stop(self, timeout=5.0):
+        """서버 중지"""
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        async with websockets.serve(self._handler, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop.wait()
+
+    def _select(self, request):
+        """구독 요청에 맞는 메시지만 선택"""
+        wanted = {}
+        for item in request:
+            if isinstance(item, dict) and 'type' in item:
+                wanted[item['type']] = set(item.get('codes', []))
+        selected = []
+        for message in self.messages:
+            codes = wanted.get(message.get('type'))
+            if codes is None:
+                continue
+            if codes and message.get('code') not in codes:
+                continue
+            selected.append(message)
+        return selected
+
+    async def _handler(self, websocket, *args):
+        self.connection_count += 1
+        try:
+            request = json.loads(await websocket.recv())
+            selected = self._select(request)
+            sent = 0
+            while True:
+                for message in selected:
+                    if self.drop_after is not None and sent >= self.drop_after:
+                        await websocket.close()
+                        return
+                    await websocket.send(json.dumps(message).encode('utf8'))
+                    sent += 1
+                    if self.interval:
+                        await asyncio.sleep(self.interval)
+                if not self.repeat or not selected:
+                    break
+            await websocket.wait_closed()
+        except websockets.ConnectionClosed:
+            pass
+        except ValueError as e:
+            self.logger.error(f"구독 요청 파싱 실패: {str(e)}")
@@ -0,0 +1,782 @@
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import logging
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import jwt
+import numpy as np
+
+from .config import RATE_LIMIT_SETTINGS, TRADE_COINS, DEFAULT_FEE
+from .rate_limiter import TokenBucket, request_group
+from .utils import get_tick_size, round_to_tick
+
+KST_OFFSET = 9 * 3600
+MIN_ORDER_AMOUNT = 5000
+
+CANDLE_UNITS = {
+    'minutes/1': 60,
+    'minutes/3': 180,
+    'minutes/5': 300,
+    'minutes/10': 600,
+    'minutes/15': 900,
+    'minutes/30': 1800,
+    'minutes/60': 3600,
+    'minutes/240': 14400,
+    'days': 86400,
+    'weeks': 604800
+}
+
+
+def _format(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def parse_to(value):
+    """캔들 조회 'to' 파라미터 (UTC 또는 시간대 포함 ISO 형식) -> epoch 초"""
+    value = value.strip().replace(' ', 'T')
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def candle_item(market, step, ts, open_price, high, low, close_price, volume, value):
+    """캔들 값 -> 업비트 캔들 응답 항목 (ts: 캔들 시작 UTC epoch 초)"""
+    return {
+        'market': market,
+        'candle_date_time_utc': _format(ts),
+        'candle_date_time_kst': _format(ts + KST_OFFSET),
+        'opening_price': round(open_price, 4),
+        'high_price': round(high, 4),
+        'low_price': round(low, 4),
+        'trade_price': round(close_price, 4),
+        'timestamp': (ts + step) * 1000,
+        'candle_acc_trade_price': round(value, 4),
+        'candle_acc_trade_volume': round(volume, 8),
+        'unit': step // 60
+    }
+
+
+class SyntheticCandles:
+    """마켓/시각만으로 항상 같은 값을 만드는 합성 캔들 생성기
+
+    listed_at 이전에는 캔들이 없고, missing_ratio 비율만큼 거래가 없던 것처럼
+    캔들을 빼서 빈 구간 처리를 확인할 수 있다.
+    """
+    def __init__(self, seed=0, base_price=10000.0, listed_at=None, missing_ratio=0.0):
+        self.seed = seed
+        self.base_price = base_price
+        self.listed_at = listed_at
+        self.missing_ratio = missing_ratio
+
+    def _rng(self, market, step, ts):
+        return random.Random(f"{self.seed}:{market}:{step}:{ts}")
+
+    def exists(self, market, step, ts):
+        if self.listed_at is not None and ts < self.listed_at:
+            return False
+        if self.missing_ratio:
+            return self._rng(market, step, ts).random() >= self.missing_ratio
+        return True
+
+    def price(self, market, ts):
+        """시각에 대한 기준 가격 (완만한 파동 + 마켓별 위상)"""
+        phase = (sum(map(ord, market)) + self.seed) % 360
+        day = ts / 86400.0
+        return self.base_price * (1.0 + 0.2 * math.sin(day + phase) + 0.05 * math.sin(day * 24 + phase))
+
+    def candle(self, market, step, ts):
+        rng = self._rng(market, step, ts)
+        open_price = self.price(market, ts)
+        close_price = self.price(market, ts + step) * (1 + rng.uniform(-0.002, 0.002))
+        high = max(open_price, close_price) * (1 + rng.uniform(0, 0.003))
+        low = min(open_price, close_price) * (1 - rng.uniform(0, 0.003))
+        volume = rng.uniform(0.1, 10.0)
+        return candle_item(market, step, ts, open_price, high, low, close_price, volume, volume * close_price)
+
+    def candles(self, market, step, to_ts, count):
+        """to_ts 이전에 시작한 캔들을 최신순으로 count개 반환"""
+        ts = (to_ts - 1) // step * step
+        result = []
+        # 상장 전이거나 계속 비어 있는 구간에서 무한히 내려가지 않도록 탐색 범위 제한
+        for _ in range(count * 4 + 10):
+            if len(result) >= count:
+                break
+            if self.listed_at is not None and ts < self.listed_at:
+                break
+            if self.exists(market, step, ts):
+                result.append(self.candle(market, step, ts))
+            ts -= step
+        return result
+
+
+class RecordedCandles:
+    """로컬 캔들 DB(CandleDatabase)에 받아 둔 캔들을 그대로 제공하는 데이터 소스
+
+    저장된 간격의 배수 간격은 모아서 만들어 주고, 현재가는 해당 시각
+    직전 캔들의 종가를 쓴다. 마켓별 배열은 처음 요청할 때 한 번만 읽는다.
+    """
+    def __init__(self, db, interval='minute1'):
+        from .candles import INTERVAL_SECONDS
+        self.db = db
+        self.interval = interval
+        self.step = INTERVAL_SECONDS[interval]
+        self._arrays = {}
+        self._lock = threading.Lock()
+
+    def _load(self, market):
+        with self._lock:
+            arrays = self._arrays.get(market)
+            if arrays is None:
+                arrays = self.db.load_arrays(market, self.interval)
+                # DB는 KST 기준 시각이므로 UTC epoch로 바꿔 둔다
+                arrays['ts'] = arrays['ts'] - KST_OFFSET
+                self._arrays[market] = arrays
+            return arrays
+
+    def price(self, market, ts):
+        arrays = self._load(market)
+        i = int(np.searchsorted(arrays['ts'], ts, side='right')) - 1
+        if i < 0:
+            return float(arrays['open'][0]) if len(arrays['ts']) else 0.0
+        return float(arrays['close'][i])
+
+    def candles(self, market, step, to_ts, count):
+        """to_ts 이전에 시작한 캔들을 최신순으로 count개 반환 (저장 간격의 배수만 지원)"""
+        if step % self.step:
+            return []
+        arrays = self._load(market)
+        ts = arrays['ts']
+        last_start = (to_ts - 1) // step * step
+        lo = int(np.searchsorted(ts, last_start - (count - 1) * step))
+        hi = int(np.searchsorted(ts, last_start + step))
+        if lo >= hi:
+            return []
+        buckets = ts[lo:hi] // step * step
+        starts, first = np.unique(buckets, return_index=True)
+        last = np.append(first[1:], len(buckets)) - 1
+        sl = slice(lo, hi)
+        high = np.maximum.reduceat(arrays['high'][sl], first)
+        low = np.minimum.reduceat(arrays['low'][sl], first)
+        volume = np.add.reduceat(arrays['volume'][sl], first)
+        value = np.add.reduceat(arrays['value'][sl], first)
+        opens = arrays['open'][sl][first]
+        closes = arrays['close'][sl][last]
+        result = []
+        for i in range(len(starts) - 1, -1, -1):
+            result.append(candle_item(market, step, int(starts[i]), opens[i], high[i], low[i],
+                                      closes[i], volume[i], value[i]))
+        return result
+
+
+class SimExchangeError(Exception):
+    """모의 거래소가 업비트와 같은 형식으로 돌려주는 오류"""
+    def __init__(self, status, name, message=''):
+        self.status = status
+        self.name = name
+        self.message = message
+        super().__init__(f"[{status}] {name}: {message}")
+
+
+class SimBroker:
+    """모의 거래소의 가상 계좌와 주문 체결 엔진
+
+    시장가 주문은 현재 호가로 바로 체결하고, 지정가 주문은 가격이 닿을 때까지
+    대기시켰다가 이후 요청이 들어올 때 체결을 확인한다. 수수료는 체결 금액의
+    fee 비율이며, 현재 시각은 clock()으로 정해 시뮬레이션 시계를 붙일 수 있다.
+    """
+    def __init__(self, source, clock=None, krw=10000000.0, fee=DEFAULT_FEE, depth=15):
+        self.source = source
+        self.clock = clock or time.time
+        self.fee = fee
+        self.depth = depth
+        self.accounts = {'KRW': {'balance': float(krw), 'locked': 0.0, 'avg_buy_price': 0.0}}
+        self.orders = {}
+        # 체결 확인은 대기 중인 주문만 보면 되므로 따로 모아 둔다
+        self.waiting = {}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 시세
+    # ------------------------------------------------------------------
+    def price(self, market, now=None):
+        """현재 체결가 (호가 단위 반영)"""
+        now = self.clock() if now is None else now
+        return round_to_tick(self.source.price(market, now), 'round')
+
+    def quote(self, market, now=None):
+        """(최우선 매수호가, 최우선 매도호가)"""
+        bid = self.price(market, now)
+        return bid, round_to_tick(bid + get_tick_size(bid), 'round')
+
+    def ticker(self, market):
+        now = self.clock()
+        price = self.price(market, now)
+        day_start = int(now + KST_OFFSET) // 86400 * 86400 - KST_OFFSET
+        opening = self.price(market, day_start)
+        prev_close = self.price(market, day_start - 1)
+        day_prices = [self.price(market, day_start + h * 3600) for h in range(int((now - day_start) // 3600) + 1)]
+        high = max(day_prices + [price])
+        low = min(day_prices + [price])
+        change_price = price - prev_close
+        change_rate = change_price / prev_close if prev_close else 0.0
+        volume = 1000.0 + (now - day_start) / 60.0
+        return {
+            'market': market,
+            'trade_date': datetime.fromtimestamp(now, timezone.utc).strftime("%Y%m%d"),
+            'trade_time': datetime.fromtimestamp(now, timezone.utc).strftime("%H%M%S"),
+            'trade_timestamp': int(now * 1000),
+            'opening_price': opening,
+            'high_price': high,
+            'low_price': low,
+            'trade_price': price,
+            'prev_closing_price': prev_close,
+            'change': 'RISE' if change_price > 0 else 'FALL' if change_price < 0 else 'EVEN',
+            'change_price': abs(change_price),
+            'change_rate': abs(change_rate),
+            'signed_change_price': change_price,
+            'signed_change_rate': change_rate,
+            'trade_volume': 0.1,
+            'acc_trade_price': volume * price,
+            'acc_trade_price_24h': volume * price,
+            'acc_trade_volume': volume,
+            'acc_trade_volume_24h': volume,
+            'timestamp': int(now * 1000)
+        }
+
+    def orderbook(self, market):
+        now = self.clock()
+        bid, ask = self.quote(market, now)
+        tick = get_tick_size(bid)
+        rng = random.Random(f"{market}:{int(now)}")
+        units = []
+        for i in range(self.depth):
+            units.append({
+                'ask_price': round(ask + i * tick, 8),
+                'bid_price': round(bid - i * tick, 8),
+                'ask_size': round(rng.uniform(0.1, 5.0) * (1 + i * 0.3), 8),
+                'bid_size': round(rng.uniform(0.1, 5.0) * (1 + i * 0.3), 8)
+            })
+        return {
+            'market': market,
+            'timestamp': int(now * 1000),
+            'total_ask_size': sum(u['ask_size'] for u in units),
+            'total_bid_size': sum(u['bid_size'] for u in units),
+            'orderbook_units': units
+        }
+
+    def trades(self, market, count=1):
+        now = int(self.clock())
+        result = []
+        for i in range(count):
+            ts = now - i
+            rng = random.Random(f"{market}:trade:{ts}")
+            result.append({
+                'market': market,
+                'trade_date_utc': datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d"),
+                'trade_time_utc': datetime.fromtimestamp(ts, timezone.utc).strftime("%H:%M:%S"),
+                'timestamp': ts * 1000,
+                'trade_price': self.price(market, ts),
+                'trade_volume': round(rng.uniform(0.001, 1.0), 8),
+                'ask_bid': 'BID' if rng.random() < 0.5 else 'ASK',
+                'sequential_id': ts * 1000 + i
+            })
+        return result
+
+    # ------------------------------------------------------------------
+    # 계좌
+    # ------------------------------------------------------------------
+    def _account(self, currency):
+        account = self.accounts.get(currency)
+        if account is None:
+            account = self.accounts[currency] = {'balance': 0.0, 'locked': 0.0, 'avg_buy_price': 0.0}
+        return account
+
+    def deposit(self, currency, amount, avg_buy_price=0.0):
+        """테스트용 잔고 추가"""
+        with self._lock:
+            account = self._account(currency)
+            account['balance'] += amount
+            if avg_buy_price:
+                account['avg_buy_price'] = avg_buy_price
+
+    def account_list(self):
+        with self._lock:
+            self.match_orders()
+            return [{
+                'currency': currency,
+                'balance': f"{account['balance']:.8f}",
+                'locked': f"{account['locked']:.8f}",
+                'avg_buy_price': f"{account['avg_buy_price']:.8f}",
+                'avg_buy_price_modified': False,
+                'unit_currency': 'KRW'
+            } for currency, account in self.accounts.items()
+                if account['balance'] or account['locked'] or currency == 'KRW']
+
+    # ------------------------------------------------------------------
+    # 주문
+    # ------------------------------------------------------------------
+    def place_order(self, params):
+        market = params.get('market')
+        side = params.get('side')
+        ord_type = params.get('ord_type', 'limit')
+        if not market or '-' not in market or side not in ('bid', 'ask'):
+            raise SimExchangeError(400, 'invalid_parameter', '잘못된 주문 파라미터')
+        volume = float(params['volume']) if params.get('volume') else None
+        price = float(params['price']) if params.get('price') else None
+        currency = market.split('-')[1]
+
+        with self._lock:
+            self.match_orders()
+            krw = self._account('KRW')
+            coin = self._account(currency)
+            # 시장가 주문은 지금 호가로 바로 체결되므로 호가를 한 번만 구해 함께 쓴다
+            quote = self.quote(market) if ord_type in ('price', 'market') else None
+            if ord_type == 'price' and side == 'bid' and price:
+                total, lock_currency, lock_amount = price, 'KRW', price * (1 + self.fee)
+            elif ord_type == 'market' and side == 'ask' and volume:
+                total, lock_currency, lock_amount = volume * quote[0], currency, volume
+            elif ord_type == 'limit' and price and volume:
+                total = price * volume
+                if side == 'bid':
+                    lock_currency, lock_amount = 'KRW', total * (1 + self.fee)
+                else:
+                    lock_currency, lock_amount = currency, volume
+            else:
+                raise SimExchangeError(400, 'invalid_parameter', f"지원하지 않는 주문 유형: {side}/{ord_type}")
+
+            if total < MIN_ORDER_AMOUNT:
+                raise SimExchangeError(400, f'under_min_total_{side}', '최소주문금액 이상으로 주문해주세요')
+            account = krw if lock_currency == 'KRW' else coin
+            if account['balance'] + 1e-9 < lock_amount:
+                raise SimExchangeError(400, f'insufficient_funds_{side}', '주문가능한 금액(수량)이 부족합니다.')
+            account['balance'] -= lock_amount
+            account['locked'] += lock_amount
+
+            order = {
+                'uuid': str(uuid.uuid4()),
+                'side': side,
+                'ord_type': ord_type,
+                'price': price,
+                'state': 'wait',
+                'market': market,
+                'created_at': datetime.fromtimestamp(self.clock(), timezone.utc).isoformat(),
+                'volume': volume,
+                'remaining_volume': volume,
+                'reserved_fee': total * self.fee if side == 'bid' else 0.0,
+                'remaining_fee': total * self.fee if side == 'bid' else 0.0,
+                'paid_fee': 0.0,
+                'locked': lock_amount,
+                'executed_volume': 0.0,
+                'executed_funds': 0.0,
+                'trades_count': 0,
+                'trades': []
+            }
+            self.orders[order['uuid']] = order
+            if quote is not None:
+                self._fill(order, quote=quote)
+            else:
+                self.waiting[order['uuid']] = order
+                self.match_orders()
+            return self._public(order)
+
+    def _fill(self, order, limit_price=None, quote=None):
+        """주문 전체를 현재 호가(quote를 넘기면 그 호가)로 체결"""
+        market = order['market']
+        currency = market.split('-')[1]
+        krw = self._account('KRW')
+        coin = self._account(currency)
+        bid, ask = quote or self.quote(market)
+        if order['side'] == 'bid':
+            fill_price = ask if limit_price is None else min(ask, limit_price)
+            if order['ord_type'] == 'price':
+                # 업비트 수량 정밀도(소수 8자리)로 버림
+                volume = math.floor(order['price'] / fill_price * 1e8) / 1e8
+            else:
+                volume = order['volume']
+            funds = fill_price * volume
+            fee = funds * self.fee
+            krw['locked'] -= order['locked']
+            krw['balance'] += order['locked'] - funds - fee
+            held = coin['balance'] + coin['locked']
+            coin['avg_buy_price'] = (coin['avg_buy_price'] * held + funds) / (held + volume)
+            coin['balance'] += volume
+        else:
+            fill_price = bid if limit_price is None else max(bid, limit_price)
+            volume = order['volume']
+            funds = fill_price * volume
+            fee = funds * self.fee
+            coin['locked'] -= volume
+            krw['balance'] += funds - fee
+            if coin['balance'] + coin['locked'] < 1e-8:
+                coin['avg_buy_price'] = 0.0
+        self.waiting.pop(order['uuid'], None)
+        order.update({
+            'state': 'done',
+            'volume': volume if order['volume'] is None else order['volume'],
+            'remaining_volume': 0.0,
+            'remaining_fee': 0.0,
+            'paid_fee': fee,
+            'locked': 0.0,
+            'executed_volume': volume,
+            'executed_funds': funds,
+            'trades_count': 1,
+            'trades': [{
+                'market': market,
+                'uuid': str(uuid.uuid4()),
+                'price': fill_price,
+                'volume': volume,
+                'funds': funds,
+                'side': order['side'],
+                # 시장가 주문은 접수한 시각에 바로 체결된다
+                'created_at': (order['created_at'] if quote is not None
+                               else datetime.fromtimestamp(self.clock(), timezone.utc).isoformat())
+            }]
+        })
+
+    def match_orders(self):
+        """대기 중인 지정가 주문 중 현재 호가에 닿은 주문 체결"""
+        with self._lock:
+            if not self.waiting:
+                return
+            for order in list(self.waiting.values()):
+                bid, ask = self.quote(order['market'])
+                if order['side'] == 'bid' and order['price'] >= ask:
+                    self._fill(order, order['price'])
+                elif order['side'] == 'ask' and order['price'] <= bid:
+                    self._fill(order, order['price'])
+
+    def cancel_order(self, order_uuid):
+        with self._lock:
+            self.match_orders()
+            order = self.orders.get(order_uuid)
+            if order is None:
+                raise SimExchangeError(404, 'order_not_found', '주문을 찾지 못했습니다.')
+            if order['state'] != 'wait':
+                raise SimExchangeError(400, 'order_not_found', '이미 체결되었거나 취소된 주문입니다.')
+            currency = 'KRW' if order['side'] == 'bid' else order['market'].split('-')[1]
+            account = self._account(currency)
+            account['locked'] -= order['locked']
+            account['balance'] += order['locked']
+            order.update({'state': 'cancel', 'locked': 0.0, 'remaining_fee': 0.0})
+            self.waiting.pop(order_uuid, None)
+            return self._public(order)
+
+    def get_order(self, order_uuid):
+        with self._lock:
+            self.match_orders()
+            order = self.orders.get(order_uuid)
+            if order is None:
+                raise SimExchangeError(404, 'order_not_found', '주문을 찾지 못했습니다.')
+            return self._public(order, trades=True)
+
+    def list_orders(self, market=None, state='wait'):
+        with self._lock:
+            self.match_orders()
+            orders = [o for o in self.orders.values()
+                      if (market is None or o['market'] == market) and o['state'] == state]
+            orders.sort(key=lambda o: o['created_at'], reverse=True)
+            return [self._public(o) for o in orders]
+
+    @staticmethod
+    def _public(order, trades=False):
+        """업비트 응답처럼 숫자를 문자열로 바꾼 주문 정보"""
+        result = {}
+        for key, value in order.items():
+            if key == 'trades':
+                if trades:
+                    result[key] = [{k: (f"{v:.8f}" if isinstance(v, float) else v) for k, v in t.items()}
+                                   for t in value]
+            elif isinstance(value, float):
+                result[key] = f"{value:.8f}"
+            else:
+                result[key] = value
+        return result
+
+
+def stream_messages(source, markets, start_ts, count, step=1.0, types=('ticker', 'trade', 'orderbook')):
+    """합성/기록 데이터로 WebSocket 재생용 메시지 목록 생성"""
+    messages = []
+    for i in range(count):
+        now = start_ts + i * step
+        broker = SimBroker(source, clock=lambda now=now: now)
+        for market in markets:
+            if 'ticker' in types:
+                messages.append(dict(broker.ticker(market), type='ticker', code=market, stream_type='REALTIME'))
+            if 'trade' in types:
+                trade = broker.trades(market, 1)[0]
+                trade['trade_timestamp'] = int(now * 1000)
+                messages.append(dict(trade, type='trade', code=market, stream_type='REALTIME'))
+            if 'orderbook' in types:
+                messages.append(dict(broker.orderbook(market), type='orderbook', code=market,
+                                     stream_type='REALTIME'))
+    return messages
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, group='default', remaining=None):
+        data = json.dumps(body).encode('utf8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Remaining-Req', f'group={group}; min=1800; sec={29 if remaining is None else remaining}')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, name, message, group='default', remaining=None):
+        self._send_json(status, {'error': {'name': name, 'message': message}}, group, remaining)
+
+    def _handle(self, method):
+        exchange = self.server.exchange
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if method == 'POST':
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                body = self.rfile.read(length)
+                try:
+                    params.update(json.loads(body))
+                except ValueError:
+                    params.update({k: v[-1] for k, v in parse_qs(body.decode('utf8')).items()})
+        # 업비트 요청 수 제한 그룹 (모듈 내부 그룹명 -> 응답 헤더 그룹명)
+        group = request_group(method, url.path)
+        header_group = {'candle': 'candles', 'ticker': 'ticker', 'orderbook': 'orderbook',
+                        'trade': 'trades', 'market': 'market', 'order': 'order'}.get(group, 'default')
+
+        exchange.delay()
+        allowed, remaining = exchange.take_token(group)
+        if not allowed:
+            exchange.rejected_count += 1
+            return self._error(429, 'too_many_requests', 'Too many API requests.', header_group, 0)
+        exchange.count_request(f"{method} {url.path}")
+
+        try:
+            body = exchange.dispatch(method, url.path, params, self.headers.get('Authorization'))
+        except SimExchangeError as e:
+            return self._error(e.status, e.name, e.message, header_group, remaining)
+        except (KeyError, ValueError) as e:
+            return self._error(400, 'invalid_parameter', str(e), header_group, remaining)
+        if body is None:
+            return self._error(404, 'not_found', url.path, header_group, remaining)
+        self._send_json(200 if method != 'POST' else 201, body, header_group, remaining)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 타임아웃으로 먼저 연결을 끊은 경우는 정상 흐름으로 본다
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            self.exchange.logger.debug(f"클라이언트 연결 종료: {client_address}")
+            return
+        super().handle_error(request, client_address)
+
+
+class SimExchangeServer:
+    """업비트 REST API(와 WebSocket 시세)를 흉내 내는 로컬 대체 거래소
+
+    시세(/v1/ticker, /v1/orderbook, /v1/trades/ticks, /v1/candles/*)는 합성 또는
+    기록 데이터 소스로 만들고, 계좌/주문(/v1/accounts, /v1/orders, /v1/order)은
+    SimBroker의 가상 계좌로 처리한다. latency(초 또는 (최소, 최대))만큼 응답을
+    늦추고, rate_limits를 주면 그룹별 초당 요청 수를 넘는 요청에 429를 돌려준다.
+    websocket=True면 같은 데이터로 만든 시세 메시지를 재생하는 WebSocket 서버도 띄운다.
+
+    사용 예:
+        with SimExchangeServer(latency=0.03, rate_limits=True) as server:
+            client = UpbitClient('key', 'secret', base_url=server.base_url)
+    """
+    def __init__(self, source=None, host='127.0.0.1', port=0, clock=None, krw=10000000.0,
+                 fee=DEFAULT_FEE, latency=0.0, rate_limits=None, access_key=None, secret_key=None,
+                 websocket=False, ws_markets=None, ws_messages=None, ws_interval=0.0):
+        self.logger = logging.getLogger(__name__)
+        self.source = source or SyntheticCandles()
+        self.broker = SimBroker(self.source, clock=clock, krw=krw, fee=fee)
+        self.latency = latency
+        if rate_limits is True:
+            rate_limits = RATE_LIMIT_SETTINGS
+        self.buckets = {group: TokenBucket(rate) for group, rate in (rate_limits or {}).items()}
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.request_count = 0
+        self.rejected_count = 0
+        self.endpoint_counts = {}
+        self._count_lock = threading.Lock()
+        self.httpd = _Server((host, port), _Handler)
+        self.httpd.exchange = self
+        self._thread = None
+
+        self.ws_server = None
+        if websocket:
+            from .replay_server import ReplayServer
+            if ws_messages is None:
+                ws_messages = stream_messages(self.source, ws_markets or TRADE_COINS,
+                                              self.broker.clock(), 60)
+            self.ws_server = ReplayServer(ws_messages, host=host, interval=ws_interval, repeat=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ws_uri(self):
+        return self.ws_server.uri if self.ws_server is not None else None
+
+    # ------------------------------------------------------------------
+    # 요청 처리
+    # ------------------------------------------------------------------
+    def delay(self):
+        if not self.latency:
+            return
+        if isinstance(self.latency, (tuple, list)):
+            time.sleep(random.uniform(*self.latency))
+        else:
+            time.sleep(self.latency)
+
+    def take_token(self, group):
+        """요청 수 제한 확인 후 (허용 여부, 초당 잔여 요청 수) 반환"""
+        bucket = self.buckets.get(group) or self.buckets.get('default')
+        if bucket is None:
+            return True, None
+        with self._count_lock:
+            if bucket.wait_time() > 0:
+                return False, 0
+            bucket.take()
+            return True, int(bucket.tokens)
+
+    def count_request(self, endpoint):
+        with self._count_lock:
+            self.request_count += 1
+            self.endpoint_counts[endpoint] = self.endpoint_counts.get(endpoint, 0) + 1
+
+    def _authorize(self, authorization):
+        if not authorization or not authorization.startswith('Bearer '):
+            raise SimExchangeError(401, 'jwt_verification', '인증 토큰이 없습니다.')
+        if self.secret_key is None:
+            return
+        try:
+            payload = jwt.decode(authorization[len('Bearer '):], self.secret_key, algorithms=['HS256'])
+        except jwt.PyJWTError as e:
+            raise SimExchangeError(401, 'jwt_verification', str(e))
+        if self.access_key is not None and payload.get('access_key') != self.access_key:
+            raise SimExchangeError(401, 'invalid_access_key', '잘못된 access key입니다.')
+
+    def dispatch(self, method, path, params, authorization=None):
+        """요청 경로별 응답 본문 반환 (없는 경로면 None)"""
+        broker = self.broker
+        if method == 'GET' and path.startswith('/v1/candles/'):
+            step = CANDLE_UNITS.get(path[len('/v1/candles/'):])
+            market = params.get('market')
+            if step is None or not market:
+                raise SimExchangeError(400, 'invalid_parameter', path)
+            count = min(int(params.get('count', 1)), 200)
+            to_ts = parse_to(params['to']) if params.get('to') else int(broker.clock())
+            return self.source.candles(market, step, to_ts, count)
+        if method == 'GET' and path == '/v1/ticker':
+            return [broker.ticker(m) for m in params['markets'].split(',')]
+        if method == 'GET' and path == '/v1/orderbook':
+            return [broker.orderbook(m) for m in params['markets'].split(',')]
+        if method == 'GET' and path == '/v1/trades/ticks':
+            return broker.trades(params['market'], min(int(params.get('count', 1)), 500))
+
+        if path in ('/v1/accounts', '/v1/orders', '/v1/order'):
+            self._authorize(authorization)
+        if method == 'GET' and path == '/v1/accounts':
+            return broker.account_list()
+        if method == 'POST' and path == '/v1/orders':
+            return broker.place_order(params)
+        if method == 'GET' and path == '/v1/orders':
+            return broker.list_orders(params.get('market'), params.get('state', 'wait'))
+        if method == 'GET' and path == '/v1/order':
+            return broker.get_order(params['uuid'])
+        if method == 'DELETE' and path == '/v1/order':
+            return broker.cancel_order(params['uuid'])
+        return None
+
+    # ------------------------------------------------------------------
+    # 시작/중지
+    # ------------------------------------------------------------------
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='SimExchange', daemon=True)
+        self._thread.start()
+        if self.ws_server is not None:
+            self.ws_server.start()
+        return self
+
+    def stop(self):
+        """서버 중지"""
+        if self.ws_server is not None:
+            self.ws_server.stop()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='업비트 모의 거래소 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--krw', type=float, default=10000000.0, help='초기 KRW 잔고')
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 (초)')
+    parser.add_argument('--rate-limit', action='store_true', help='업비트 요청 수 제한 적용 (429 응답)')
+    parser.add_argument('--db', default=None, help='기록된 캔들 DB 경로 (없으면 합성 데이터)')
+    parser.add_argument('--interval', default='minute1', help='기록된 캔들 DB의 캔들 간격')
+    parser.add_argument('--seed', type=int, default=0, help='합성 데이터 시드')
+    parser.add_argument('--websocket', action='store_true', help='WebSocket 시세 재생 서버도 실행')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    if args.db:
+        from .candle_db import CandleDatabase
+        source = RecordedCandles(CandleDatabase(args.db), args.interval)
+    else:
+        source = SyntheticCandles(seed=args.seed)
+    server = SimExchangeServer(source, host=args.host, port=args.port, krw=args.krw,
+                               latency=args.latency, rate_limits=args.rate_limit or None,
+                               websocket=args.websocket)
+    server.start()
+    server.logger.info(f"모의 거래소 실행: {server.base_url}"
+                       + (f", WebSocket: {server.ws_uri}" if server.ws_uri else ""))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,71 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
 import numpy as np
 import pandas as pd
-import random
+from .indicators import (RSI, MACD, BollingerBands, RollingVWAP, Stochastic, RollingSum, RollingMeanStd,
+                         SuperTrend, DMI, Ichimoku, WilliamsR, true_range)
+from .cache import indicator_cache
+from .candles import CandleWindow
+from . import kernels
+
+BUY = 'BUY'
+SELL = 'SELL'
+HOLD = 'HOLD'
+
+NAN = float('nan')
+MARKET_PHASE_BINS = tuple(kernels.MARKET_PHASE_BINS.tolist())
+
+
+def make_decision(action=HOLD, confidence=0.0, indicators=None, reason=''):
+    """전략 판단 결과 dict"""
+    return {
+        'action': action,
+        'confidence': float(confidence),
+        'indicators': indicators or {},
+        'reason': reason
+    }
+
+
+def evaluate_strategy(strategy, data):
+    """evaluate()가 없는 전략 객체도 같은 형식의 판단 결과로 변환
+
+    CandleWindow는 스트리밍 전략과 AI 전략에는 그대로, 그 밖의 전략에는 DataFrame으로 넘긴다.
+    """
+    if isinstance(data, CandleWindow) and not isinstance(strategy, (StreamingStrategy, AIStrategy)):
+        data = data.to_frame()
+    if hasattr(strategy, 'evaluate'):
+        return strategy.evaluate(data)
+    return TradingStrategy.evaluate(strategy, data)
+
+
+def _batch_value(value):
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def _nan(value):
+    return NAN if value is None else value
+
+
+def _step(indicator, update, *args):
+    """update가 True면 지표에 반영하고, 아니면 상태를 바꾸지 않는 미리보기"""
+    return indicator.update(*args) if update else indicator.peek(*args)
+
+
+def _phase_code(z):
+    """z-score의 market_phase 구간 코드 (kernels.market_phase와 같은 구간, 계산 불가는 -1)"""
+    if z != z:
+        return -1
+    return bisect_left(MARKET_PHASE_BINS, z)
+
+
+def _batch_row(values, i):
+    """배치 지표 값에서 i번째 마켓 값만 꺼내기 (NaN은 None)"""
+    if isinstance(values, tuple):
+        return tuple(_batch_value(value[i]) for value in values)
+    return _batch_value(values[i])
+
 
 class TradingStrategy(ABC):
     @abstractmethod
@@ -12,94 +76,462 @@ class TradingStrategy(ABC):
     def should_sell(self, data) -> bool:
         pass
 
-class RSIStrategy(TradingStrategy):
+    def evaluate(self, data):
+        """매수/매도/관망 판단을 한 번에 반환 {action, confidence, indicators, reason}
+
+        기본 구현은 should_buy/should_sell을 차례로 확인한다. 지표를 한 번만
+        계산하도록 재정의한 전략은 이 메서드 하나로 두 판단을 함께 낸다.
+        """
+        return self._default_decision(self.should_buy(data), self.should_sell(data))
+
+    def _default_decision(self, buy, sell):
+        name = type(self).__name__
+        if buy:
+            return make_decision(BUY, 1.0, reason=f"{name} 매수 조건 충족")
+        if sell:
+            return make_decision(SELL, 1.0, reason=f"{name} 매도 조건 충족")
+        return make_decision(HOLD, reason=f"{name} 매매 조건 없음")
+
+class StreamingStrategy(TradingStrategy):
+    """지표 상태를 봉 단위로 이어 가는 전략 기반 클래스
+
+    닫힌 봉은 update(bar)로 한 번씩만 지표에 반영하고(봉당 O(1)), 마지막 봉은
+    아직 만들어지는 중일 수 있으므로 상태를 바꾸지 않는 미리보기(peek)로 평가한다.
+    should_buy/should_sell(data)는 sync(data)로 새로 닫힌 봉만 반영한 뒤 판단하므로
+    히스토리 길이와 관계없이 일정한 비용이 든다. 시각 인덱스가 없는 데이터는
+    이어 붙일 위치를 알 수 없어 매번 처음부터 다시 계산한다.
+
+    하위 클래스는 reset()에서 지표를 만들고 _update/_peek/_buy/_sell을 구현한다.
+    _update/_peek은 지표 값(계산 전이면 None)을 돌려준다.
+    """
+    columns = ('close',)
+
+    def reset(self):
+        """지표 상태 초기화"""
+        self.values = None
+        self.last_bar = None
+        self._last_ts = None
+        self._market = None
+        self._pending = None
+        self._pending_values = None
+
+    @abstractmethod
+    def _update(self, bar):
+        pass
+
+    @abstractmethod
+    def _peek(self, bar):
+        pass
+
+    @abstractmethod
+    def _buy(self, values, bar):
+        pass
+
+    @abstractmethod
+    def _sell(self, values, bar):
+        pass
+
+    def update(self, bar, timestamp=None):
+        """닫힌 봉 하나 반영 (bar: open/high/low/close/volume dict)"""
+        self.values = self._update(bar)
+        self.last_bar = bar
+        self._pending = None
+        self._pending_values = None
+        if timestamp is not None:
+            self._last_ts = timestamp
+        return self.values
+
+    def sync(self, data):
+        """캔들 데이터에서 아직 반영하지 않은 닫힌 봉만 반영하고 마지막 봉을 미리보기"""
+        if isinstance(data, CandleWindow):
+            self._sync_window(data)
+            return
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        if len(df) == 0:
+            return
+        index = df.index
+        market = df.attrs.get('market')
+        start = 0
+        if not isinstance(index, pd.DatetimeIndex) or market != self._market:
+            self.reset()
+        elif isinstance(self._last_ts, pd.Timestamp):
+            pos = index.searchsorted(self._last_ts)
+            if pos < len(index) and index[pos] == self._last_ts:
+                start = pos + 1
+            else:
+                # 이전에 반영한 봉과 이어지지 않으면 처음부터 다시 계산
+                self.reset()
+        else:
+            self.reset()
+        self._market = market
+
+        # 파이썬 float로 바꿔 두면 봉당 연산이 빠르고 지표 값도 일반 숫자로 남는다
+        arrays = {column: df[column].to_numpy(dtype=float)[start:].tolist() for column in self.columns}
+        for i in range(len(df) - 1 - start):
+            self.update({column: arrays[column][i] for column in self.columns}, index[start + i])
+
+        last = len(df) - 1 - start
+        if last >= 0:
+            self._pending = {column: arrays[column][last] for column in self.columns}
+            self._pending_values = self._peek(self._pending)
+
+    def _sync_window(self, window):
+        """sync()의 CandleWindow 판 (DataFrame 변환 없이 구간의 리스트에서 새 봉만 읽음)"""
+        end = window.end
+        n = end - window.start
+        if n == 0:
+            return
+        # 닫힌 봉을 차례로 재생하면 직전 호출 이후 새 봉은 마지막 하나뿐이다
+        ts_list = window.ts_list
+        if window.closed and n > 1 and ts_list[end - 2] == self._last_ts and window.market == self._market:
+            lists = window.lists
+            self.update({column: lists[column][end - 1] for column in self.columns}, ts_list[end - 1])
+            return
+        start = 0
+        pos = None
+        if window.market == self._market and isinstance(self._last_ts, int):
+            pos = window.position(self._last_ts)
+        if pos is not None:
+            start = pos + 1
+        else:
+            self.reset()
+        self._market = window.market
+        columns = self.columns
+        last = n if window.closed else n - 1
+        for i in range(start, last):
+            self.update(window.bar(i, columns), window.timestamp(i))
+        if start < n and not window.closed:
+            self._pending = window.bar(n - 1, columns)
+            self._pending_values = self._peek(self._pending)
+
+    def current(self):
+        """(지표 값, 봉) - 미리보기 중인 봉이 있으면 그 값"""
+        if self._pending is not None:
+            return self._pending_values, self._pending
+        return self.values, self.last_bar
+
+    def buy_signal(self):
+        values, bar = self.current()
+        return bool(values is not None and self._buy(values, bar))
+
+    def sell_signal(self):
+        values, bar = self.current()
+        return bool(values is not None and self._sell(values, bar))
+
+    def should_buy(self, data):
+        self.sync(data)
+        return self.buy_signal()
+
+    def should_sell(self, data):
+        self.sync(data)
+        return self.sell_signal()
+
+    def _describe(self, values):
+        """판단에 쓴 지표 값 dict"""
+        return {}
+
+    def _reason(self, action, values, bar):
+        return f"{type(self).__name__} {'매수' if action == BUY else '매도'} 조건 충족"
+
+    def evaluate(self, data):
+        """봉을 한 번만 반영하고 매수/매도 판단을 함께 반환"""
+        self.sync(data)
+        values, bar = self.current()
+        if values is None:
+            return make_decision(HOLD, reason='지표 계산에 필요한 봉이 부족합니다.')
+        return self._decide(values, bar, self._buy(values, bar), self._sell(values, bar))
+
+    def _decide(self, values, bar, buy, sell):
+        indicators = self._describe(values)
+        if buy:
+            return make_decision(BUY, 1.0, indicators, self._reason(BUY, values, bar))
+        if sell:
+            return make_decision(SELL, 1.0, indicators, self._reason(SELL, values, bar))
+        return make_decision(HOLD, 0.0, indicators, '매매 조건 없음')
+
+    # 컬럼 배열 dict에서 전체 구간 지표 값을 계산하는 _series(arrays) (_peek과 같은 구조,
+    # 성분은 마지막 축이 봉인 배열). 벡터 커널이 있는 전략만 메서드로 정의한다.
+    _series = None
+
+    @property
+    def supports_batch(self):
+        """_series를 구현한 전략만 배치 판단 가능"""
+        return self._series is not None
+
+    @staticmethod
+    def _complete(*values):
+        """성분 중 하나라도 NaN인 봉은 모든 성분을 NaN으로 (스트리밍에서 None인 봉과 맞춤)"""
+        missing = np.zeros(np.shape(values[0]), dtype=bool)
+        for value in values:
+            missing |= np.isnan(value)
+        return tuple(np.where(missing, np.nan, value) for value in values)
+
+    def _batch_values(self, arrays):
+        """(마켓 x 봉) 배열에서 마지막 봉 지표 값"""
+        values = self._series(arrays)
+        if isinstance(values, tuple):
+            return tuple(value[..., -1] for value in values)
+        return values[..., -1]
+
+    def signals(self, arrays):
+        """전체 구간의 봉별 (매수, 매도) 신호 bool 배열 (매수가 우선)
+
+        벡터 지표(_series)가 있으면 한 번에 계산하고, 없으면 봉을 차례로
+        update()해 같은 판단을 낸다. 판단 상태는 계산 후 초기화된다.
+        """
+        bar = {column: kernels.as_array(arrays[column]) for column in self.columns}
+        if self.supports_batch:
+            values = self._series(arrays)
+            ready = np.isfinite(values[0] if isinstance(values, tuple) else values)
+            buy = ready & self._buy(values, bar)
+            sell = ready & ~buy & self._sell(values, bar)
+            return buy, sell
+        if bar[self.columns[0]].ndim > 1:
+            rows = [self._stream_signals({column: value[i] for column, value in bar.items()})
+                    for i in range(len(bar[self.columns[0]]))]
+            return np.array([row[0] for row in rows]), np.array([row[1] for row in rows])
+        return self._stream_signals(bar)
+
+    def _stream_signals(self, bar):
+        """1차원 컬럼 배열을 봉마다 update()해 신호 계산"""
+        n = len(bar[self.columns[0]])
+        buy = np.zeros(n, dtype=bool)
+        sell = np.zeros(n, dtype=bool)
+        columns = {column: value.tolist() for column, value in bar.items()}
+        self.reset()
+        for i in range(n):
+            row = {column: columns[column][i] for column in self.columns}
+            values = self._update(row)
+            if values is not None:
+                if self._buy(values, row):
+                    buy[i] = True
+                elif self._sell(values, row):
+                    sell[i] = True
+        self.reset()
+        return buy, sell
+
+    def evaluate_batch(self, arrays):
+        """여러 마켓의 (마켓 x 봉) 배열 dict를 한 번에 판단해 마켓 순서대로 판단 결과 목록 반환
+
+        지표는 커널로 전체 구간을 다시 계산하고 스트리밍 상태는 쓰지 않는다.
+        _buy/_sell 조건은 배열에도 그대로 적용된다.
+        """
+        values = self._batch_values(arrays)
+        bar = {column: arrays[column][:, -1] for column in self.columns}
+        ready = np.isfinite(values[0] if isinstance(values, tuple) else values)
+        buy = ready & self._buy(values, bar)
+        sell = ready & self._sell(values, bar)
+        decisions = []
+        for i in range(len(ready)):
+            if not ready[i]:
+                decisions.append(make_decision(HOLD, reason='지표 계산에 필요한 봉이 부족합니다.'))
+                continue
+            row = _batch_row(values, i)
+            row_bar = {column: float(value[i]) for column, value in bar.items()}
+            decisions.append(self._decide(row, row_bar, buy[i], sell[i]))
+        return decisions
+
+class RSIStrategy(StreamingStrategy):
     def __init__(self, period=14, oversold=30, overbought=70):
         self.period = period
         self.oversold = oversold
         self.overbought = overbought
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.rsi = RSI(self.period)
+
+    def _update(self, bar):
+        return self.rsi.update(bar['close'])
+
+    def _peek(self, bar):
+        return self.rsi.peek(bar['close'])
+
+    def _series(self, arrays):
+        return kernels.rsi(arrays['close'], self.period)
+
+    def _buy(self, rsi, bar):
+        return rsi < self.oversold
+
+    def _sell(self, rsi, bar):
+        return rsi > self.overbought
+
+    def _describe(self, rsi):
+        return {'rsi': rsi}
+
+    def _reason(self, action, rsi, bar):
+        return f"RSI {rsi:.1f} {'과매도' if action == BUY else '과매수'} 구간"
         
     def calculate_rsi(self, data):
         df = pd.DataFrame(data)
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
-        
-    def should_buy(self, data):
-        rsi = self.calculate_rsi(data)
-        return rsi.iloc[-1] < self.oversold
-        
-    def should_sell(self, data):
-        rsi = self.calculate_rsi(data)
-        return rsi.iloc[-1] > self.overbought
+        return pd.Series(kernels.rsi(df['close'], self.period), index=df.index)
 
-class MACDStrategy(TradingStrategy):
+class MACDStrategy(StreamingStrategy):
     def __init__(self, fast=12, slow=26, signal=9):
         self.fast = fast
         self.slow = slow
         self.signal = signal
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.macd = MACD(self.fast, self.slow, self.signal)
+
+    def _update(self, bar):
+        return self.macd.update(bar['close'])
+
+    def _peek(self, bar):
+        return self.macd.peek(bar['close'])
+
+    def _series(self, arrays):
+        macd, signal = kernels.macd(arrays['close'], self.fast, self.slow, self.signal)
+        return macd, signal, macd - signal
+
+    def _buy(self, values, bar):
+        return values[0] > values[1]
+
+    def _sell(self, values, bar):
+        return values[0] < values[1]
+
+    def _describe(self, values):
+        return {'macd': values[0], 'signal': values[1], 'histogram': values[2]}
+
+    def _reason(self, action, values, bar):
+        return f"MACD가 시그널선 {'위' if action == BUY else '아래'} (히스토그램 {values[2]:+.2f})"
         
     def calculate_macd(self, data):
         df = pd.DataFrame(data)
-        exp1 = df['close'].ewm(span=self.fast).mean()
-        exp2 = df['close'].ewm(span=self.slow).mean()
-        macd = exp1 - exp2
-        signal = macd.ewm(span=self.signal).mean()
-        return macd, signal
-        
-    def should_buy(self, data):
-        macd, signal = self.calculate_macd(data)
-        return macd.iloc[-1] > signal.iloc[-1]
-        
-    def should_sell(self, data):
-        macd, signal = self.calculate_macd(data)
-        return macd.iloc[-1] < signal.iloc[-1]
+        macd, signal = kernels.macd(df['close'], self.fast, self.slow, self.signal)
+        return pd.Series(macd, index=df.index), pd.Series(signal, index=df.index)
 
-class BollingerBandsStrategy(TradingStrategy):
+class BollingerBandsStrategy(StreamingStrategy):
     def __init__(self, period=20, std_dev=2):
         self.period = period
         self.std_dev = std_dev
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.bands = BollingerBands(self.period, self.std_dev)
+
+    def _update(self, bar):
+        return self.bands.update(bar['close'])
+
+    def _peek(self, bar):
+        return self.bands.peek(bar['close'])
+
+    def _series(self, arrays):
+        return kernels.bollinger(arrays['close'], self.period, self.std_dev)
+
+    def _buy(self, bands, bar):
+        return bar['close'] < bands[2]
+
+    def _sell(self, bands, bar):
+        return bar['close'] > bands[0]
+
+    def _describe(self, bands):
+        return {'upper': bands[0], 'middle': bands[1], 'lower': bands[2]}
+
+    def _reason(self, action, bands, bar):
+        if action == BUY:
+            return f"종가 {bar['close']:,.0f}이 볼린저 하단 {bands[2]:,.0f} 아래"
+        return f"종가 {bar['close']:,.0f}이 볼린저 상단 {bands[0]:,.0f} 위"
         
     def calculate_bands(self, data):
         df = pd.DataFrame(data)
-        ma = df['close'].rolling(window=self.period).mean()
-        std = df['close'].rolling(window=self.period).std()
-        upper = ma + (std * self.std_dev)
-        lower = ma - (std * self.std_dev)
-        return upper, ma, lower
-        
-    def should_buy(self, data):
-        upper, ma, lower = self.calculate_bands(data)
-        return data['close'].iloc[-1] < lower.iloc[-1]
-        
-    def should_sell(self, data):
-        upper, ma, lower = self.calculate_bands(data)
-        return data['close'].iloc[-1] > upper.iloc[-1]
+        upper, ma, lower = kernels.bollinger(df['close'], self.period, self.std_dev)
+        return (pd.Series(upper, index=df.index), pd.Series(ma, index=df.index),
+                pd.Series(lower, index=df.index))
+
+class StochasticStrategy(StreamingStrategy):
+    columns = ('high', 'low', 'close')
 
-class StochasticStrategy(TradingStrategy):
     def __init__(self, k_period=14, d_period=3):
         self.k_period = k_period
         self.d_period = d_period
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.stoch = Stochastic(self.k_period, self.d_period)
+
+    def _update(self, bar):
+        return self.stoch.update(bar['high'], bar['low'], bar['close'])
+
+    def _peek(self, bar):
+        return self.stoch.peek(bar['high'], bar['low'], bar['close'])
+
+    def _series(self, arrays):
+        return kernels.stochastic(arrays['high'], arrays['low'], arrays['close'], self.k_period, self.d_period)
+
+    def _buy(self, values, bar):
+        k, d = values
+        # 스트리밍에서는 %D가 아직 없을 수 있고, 배열 경로는 NaN이 비교에서 False가 된다
+        if d is None:
+            return False
+        return (k < 20) & (k > d)
+
+    def _sell(self, values, bar):
+        k, d = values
+        if d is None:
+            return False
+        return (k > 80) & (k < d)
+
+    def _describe(self, values):
+        return {'k': values[0], 'd': values[1]}
+
+    def _reason(self, action, values, bar):
+        if action == BUY:
+            return f"스토캐스틱 %K {values[0]:.1f} 과매도 구간에서 %D 상향 돌파"
+        return f"스토캐스틱 %K {values[0]:.1f} 과매수 구간에서 %D 하향 돌파"
         
     def calculate_stoch(self, data):
-        low_min = data['low'].rolling(window=self.k_period).min()
-        high_max = data['high'].rolling(window=self.k_period).max()
-        k = 100 * (data['close'] - low_min) / (high_max - low_min)
-        d = k.rolling(window=self.d_period).mean()
-        return k, d
-        
-    def should_buy(self, data):
-        k, d = self.calculate_stoch(data)
-        return k.iloc[-1] < 20 and k.iloc[-1] > d.iloc[-1]
-        
-    def should_sell(self, data):
-        k, d = self.calculate_stoch(data)
-        return k.iloc[-1] > 80 and k.iloc[-1] < d.iloc[-1]
+        k, d = kernels.stochastic(data['high'], data['low'], data['close'], self.k_period, self.d_period)
+        return pd.Series(k, index=data.index), pd.Series(d, index=data.index)
+
+class AnalysisStream(StreamingStrategy):
+    """AI 전략의 마지막 봉 분석 값을 봉 단위로 이어 계산하는 스트림
+
+    봉마다 전략의 stream_values()로 build_analysis()와 같은 이름의 값 dict를
+    만든다. 계산할 수 없는 값은 NaN(market_phase는 -1)이라 판단 조건은
+    커널 배열과 똑같이 동작한다. 닫힌 봉의 값 dict는 다음 봉에서 prev로 쓴다.
+    """
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.columns = strategy.stream_columns
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.state = self.strategy.stream_state()
+        self.prev = None
+
+    def _update(self, bar):
+        self.prev = self.strategy.stream_values(self.state, bar, self.prev, True)
+        return self.prev
+
+    def _peek(self, bar):
+        return self.strategy.stream_values(self.state, bar, self.prev, False)
+
+    def _buy(self, values, bar):
+        return self.strategy._should_buy(values)
+
+    def _sell(self, values, bar):
+        return self.strategy._should_sell(values)
 
 class AIStrategy:
+    # 같은 봉의 지표를 모든 전략이 함께 쓰는 캐시
+    cache = indicator_cache
+    # 판단 결과에 담을 분석 컬럼
+    indicator_columns = ()
+    # 봉 단위 분석(stream_values)에 쓰는 캔들 컬럼
+    stream_columns = ('close', 'high', 'low', 'volume')
+    confidence_threshold = 0.5
+
     def __init__(self):
         self.learning_data = []
+        self.stream = AnalysisStream(self)
         
     def add_learning_data(self, data):
         self.learning_data.append(data)
@@ -107,286 +539,842 @@ class AIStrategy:
     def clear_learning_data(self):
         self.learning_data = []
 
+    @staticmethod
+    def to_frame(data):
+        return data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+    def indicator(self, bar, name, params, compute):
+        """봉별 지표 캐시 조회 (이 봉에서 처음일 때만 compute() 실행, bar가 None이면 캐시 없이 계산)"""
+        if bar is None:
+            return compute()
+        return self.cache.get_for_bar(bar, name, params, compute)
+
+    def analysis(self, data, bar=None):
+        """지표 배열 dict (클래스별로 봉마다 한 번만 만든다)"""
+        df = self.to_frame(data)
+        if bar is None:
+            bar = self.cache.bar_key(df)
+        return self.indicator(bar, 'analysis', type(self).__name__, lambda: self.build_analysis(df, bar))
+
+    def build_analysis(self, df, bar):
+        """캔들 컬럼을 연속된 float64 배열로 (하위 클래스가 지표 배열을 추가)
+
+        df는 DataFrame 또는 (마켓 x 봉) 배열 dict이며 지표는 마지막 축으로 계산한다.
+        """
+        return {column: kernels.as_array(df[column]) for column in ('close', 'high', 'low', 'volume')
+                if column in df}
+
+    def stream_state(self):
+        """봉 단위 분석에 쓰는 지표 상태 dict (하위 클래스가 지표를 추가)"""
+        return {}
+
+    def stream_values(self, state, bar, prev, update):
+        """봉 하나의 분석 값 dict (build_analysis() 마지막 봉 값과 같은 이름)
+
+        prev는 직전 닫힌 봉의 값 dict(첫 봉이면 None)이다. update가 False면
+        지표 상태를 바꾸지 않고 미리보기로 계산한다.
+        """
+        return dict(bar)
+
+    def reset(self):
+        """봉 단위 분석 상태 초기화"""
+        self.stream.reset()
+
+    def latest(self, data):
+        """마지막 봉의 분석 값 dict (market_phase는 구간 코드)
+
+        시각이 있는 캔들(CandleWindow, DatetimeIndex DataFrame)은 스트리밍 전략처럼
+        새로 닫힌 봉만 반영하고 마지막 봉은 미리보기로 계산한다. 시각 인덱스가
+        없으면 이어 붙일 수 없으므로 커널로 전체 구간을 계산한다.
+        """
+        if not isinstance(data, CandleWindow):
+            data = self.to_frame(data)
+            if not isinstance(data.index, pd.DatetimeIndex):
+                return self._latest_frame(data)
+        self.stream.sync(data)
+        return self.stream.current()[0]
+
+    def _latest_frame(self, df):
+        """latest()의 커널 판 (전체 구간 분석 배열의 마지막 값)"""
+        bar = self.cache.bar_key(df)
+
+        def build():
+            arrays = self.analysis(df, bar)
+            return {name: array[-1].item() for name, array in arrays.items()}
+
+        return self.indicator(bar, 'latest', type(self).__name__, build)
+
+    def analyze_data(self, data):
+        """지표가 추가된 DataFrame (표시/분석용, 판단에는 latest() 사용)"""
+        df = self.to_frame(data)
+        bar = self.cache.bar_key(df)
+
+        def build():
+            result = df.copy()
+            for name, array in self.analysis(df).items():
+                if name == 'market_phase':
+                    result[name] = pd.Categorical.from_codes(array, categories=kernels.MARKET_PHASES, ordered=True)
+                elif name not in result:
+                    result[name] = array
+            return result
+
+        return self.indicator(bar, 'analysis_frame', type(self).__name__, build)
+
+    def should_buy(self, data):
+        return self._should_buy(self.latest(data))
+
+    def should_sell(self, data):
+        return self._should_sell(self.latest(data))
+
+    def buy_confidence(self, data):
+        """매수 신뢰도 (0~1)"""
+        return self._buy_confidence(self.latest(data))
+
+    def sell_confidence(self, data):
+        """매도 신뢰도 (0~1)"""
+        return self._sell_confidence(self.latest(data))
+
+    # 아래 판단 함수는 latest()의 마지막 봉 값 dict를 받는다
+    def _should_buy(self, last):
+        return False
+
+    def _should_sell(self, last):
+        return False
+
+    # 값은 스칼라 또는 마켓별 1차원 배열이므로 조건은 &, |로 조합한다
+    def _buy_confidence(self, last):
+        return self._should_buy(last) * 1.0
+
+    def _sell_confidence(self, last):
+        return self._should_sell(last) * 1.0
+
+    def evaluate(self, data):
+        """분석을 한 번만 만들고 매수/매도 판단을 함께 반환"""
+        last = self.latest(data)
+        return self._decide(last, self._buy_confidence(last), self._sell_confidence(last))
+
+    def evaluate_batch(self, arrays):
+        """여러 마켓의 (마켓 x 봉) 배열 dict를 한 번에 판단해 마켓 순서대로 판단 결과 목록 반환"""
+        analysis = self.build_analysis(arrays, None)
+        last = {name: array[:, -1] for name, array in analysis.items()}
+        buy = np.broadcast_to(self._buy_confidence(last), last['close'].shape)
+        sell = np.broadcast_to(self._sell_confidence(last), last['close'].shape)
+        return [
+            self._decide({name: value[i].item() for name, value in last.items()}, float(buy[i]), float(sell[i]))
+            for i in range(len(buy))
+        ]
+
+    def signals(self, arrays):
+        """전체 구간의 봉별 (매수, 매도) 신호 bool 배열 (매수가 우선)"""
+        analysis = self.build_analysis(arrays, None)
+        shape = analysis['close'].shape
+        buy = np.broadcast_to(self._buy_confidence(analysis), shape) > self.confidence_threshold
+        sell = np.broadcast_to(self._sell_confidence(analysis), shape) > self.confidence_threshold
+        return buy, sell & ~buy
+
+    def _decide(self, last, buy_confidence, sell_confidence):
+        indicators = {}
+        for column in self.indicator_columns:
+            if column in last:
+                value = last[column]
+                if column == 'market_phase':
+                    indicators[column] = kernels.MARKET_PHASES[value] if value >= 0 else None
+                else:
+                    # NaN은 None (값은 파이썬 float라 np.isnan보다 자기 비교가 빠르다)
+                    indicators[column] = None if value != value else value
+        name = type(self).__name__
+        if buy_confidence > self.confidence_threshold:
+            return make_decision(BUY, buy_confidence, indicators,
+                                 f"{name} 매수 신호 (신뢰도 {buy_confidence:.0%})")
+        if sell_confidence > self.confidence_threshold:
+            return make_decision(SELL, sell_confidence, indicators,
+                                 f"{name} 매도 신호 (신뢰도 {sell_confidence:.0%})")
+        return make_decision(HOLD, 0.0, indicators, '매매 조건 없음')
+
 class AIBasicStrategy(AIStrategy):
+    indicator_columns = ('rsi', 'macd', 'signal', 'upper', 'middle', 'lower')
+
     def __init__(self):
         super().__init__()
         
-    def analyze_data(self, data):
-        df = pd.DataFrame(data)
+    def build_analysis(self, df, bar):
+        result = super().build_analysis(df, bar)
+        close = result['close']
         # 기본적인 기술적 지표 계산
-        df['rsi'] = self.calculate_rsi(df['close'])
-        df['macd'], df['signal'] = self.calculate_macd(df['close'])
-        df['upper'], df['middle'], df['lower'] = self.calculate_bollinger(df['close'])
-        return df
+        result['rsi'] = self.indicator(bar, 'rsi', (14,), lambda: kernels.rsi(close, 14))
+        result['macd'], result['signal'] = self.indicator(
+            bar, 'macd', (12, 26, 9), lambda: kernels.macd(close, 12, 26, 9))
+        result['upper'], result['middle'], result['lower'] = self.indicator(
+            bar, 'bollinger', (20, 2), lambda: kernels.bollinger(close, 20, 2))
+        return result
+
+    def stream_state(self):
+        state = super().stream_state()
+        state.update(rsi=RSI(14), macd=MACD(12, 26, 9), bands=BollingerBands(20, 2))
+        return state
+
+    def stream_values(self, state, bar, prev, update):
+        values = super().stream_values(state, bar, prev, update)
+        close = bar['close']
+        values['rsi'] = _nan(_step(state['rsi'], update, close))
+        values['macd'], values['signal'], _ = _step(state['macd'], update, close)
+        values['upper'], values['middle'], values['lower'] = _step(state['bands'], update, close) or (NAN,) * 3
+        return values
         
     def calculate_rsi(self, prices, period=14):
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
+        return pd.Series(kernels.rsi(prices, period), index=prices.index)
         
     def calculate_macd(self, prices, fast=12, slow=26, signal=9):
-        exp1 = prices.ewm(span=fast).mean()
-        exp2 = prices.ewm(span=slow).mean()
-        macd = exp1 - exp2
-        signal_line = macd.ewm(span=signal).mean()
-        return macd, signal_line
+        macd, signal_line = kernels.macd(prices, fast, slow, signal)
+        return pd.Series(macd, index=prices.index), pd.Series(signal_line, index=prices.index)
         
     def calculate_bollinger(self, prices, period=20, std=2):
-        middle = prices.rolling(window=period).mean()
-        std_dev = prices.rolling(window=period).std()
-        upper = middle + (std_dev * std)
-        lower = middle - (std_dev * std)
-        return upper, middle, lower
-        
-    def should_buy(self, data):
-        df = self.analyze_data(data)
+        upper, middle, lower = kernels.bollinger(prices, period, std)
+        return (pd.Series(upper, index=prices.index), pd.Series(middle, index=prices.index),
+                pd.Series(lower, index=prices.index))
         
+    def _should_buy(self, last):
         # 매수 신호 조합
-        rsi_buy = df['rsi'].iloc[-1] < 30
-        macd_buy = df['macd'].iloc[-1] > df['signal'].iloc[-1]
-        bb_buy = df['close'].iloc[-1] < df['lower'].iloc[-1]
+        rsi_buy = last['rsi'] < 30
+        macd_buy = last['macd'] > last['signal']
+        bb_buy = last['close'] < last['lower']
         
         # 매수 조건: RSI 과매도 + MACD 상향돌파 또는 볼린저밴드 하단 돌파
-        return (rsi_buy and macd_buy) or bb_buy
-        
-    def should_sell(self, data):
-        df = self.analyze_data(data)
+        return (rsi_buy & macd_buy) | bb_buy
         
+    def _should_sell(self, last):
         # 매도 신호 조합
-        rsi_sell = df['rsi'].iloc[-1] > 70
-        macd_sell = df['macd'].iloc[-1] < df['signal'].iloc[-1]
-        bb_sell = df['close'].iloc[-1] > df['upper'].iloc[-1]
+        rsi_sell = last['rsi'] > 70
+        macd_sell = last['macd'] < last['signal']
+        bb_sell = last['close'] > last['upper']
         
         # 매도 조건: RSI 과매수 + MACD 하향돌파 또는 볼린저밴드 상단 돌파
-        return (rsi_sell and macd_sell) or bb_sell
+        return (rsi_sell & macd_sell) | bb_sell
+
+class AIAdvancedStrategy(AIBasicStrategy):
+    indicator_columns = AIBasicStrategy.indicator_columns + ('vwap', 'atr', 'trend')
 
-class AIAdvancedStrategy(AIStrategy):
     def __init__(self):
         super().__init__()
         self.min_samples = 100
         
-    def analyze_data(self, data):
-        df = super().analyze_data(data)
+    def build_analysis(self, df, bar):
+        result = super().build_analysis(df, bar)
+        close, high, low, volume = result['close'], result['high'], result['low'], result['volume']
         # 추가 지표 계산
-        df['vwap'] = self.calculate_vwap(df)
-        df['atr'] = self.calculate_atr(df)
-        df['trend'] = self.calculate_trend(df)
-        return df
+        result['vwap'] = self.indicator(bar, 'vwap', (14,), lambda: kernels.vwap(close, volume, 14))
+        result['atr'] = self.indicator(bar, 'atr', (14,), lambda: kernels.atr(high, low, close, 14))
+        result['trend'] = self.indicator(bar, 'trend', (20,), lambda: kernels.trend(close, 20))
+        result['volume_ma'] = self.indicator(bar, 'volume_ma', (20,), lambda: kernels.rolling_mean(volume, 20))
+        return result
+
+    def stream_state(self):
+        state = super().stream_state()
+        state.update(vwap=RollingVWAP(14), tr=RollingSum(14), volume=RollingSum(20))
+        return state
+
+    def stream_values(self, state, bar, prev, update):
+        values = super().stream_values(state, bar, prev, update)
+        close, volume = bar['close'], bar['volume']
+        values['vwap'] = _nan(_step(state['vwap'], update, close, volume))
+        tr = _step(state['tr'], update, true_range(bar['high'], bar['low'], prev['close'] if prev else None))
+        values['atr'] = NAN if tr is None else tr / 14
+        # 20봉 이동평균의 봉간 변화량 (이동평균은 볼린저 중심선)
+        values['trend'] = values['middle'] - prev['middle'] if prev else NAN
+        total = _step(state['volume'], update, volume)
+        values['volume_ma'] = NAN if total is None else total / 20
+        return values
         
     def calculate_vwap(self, df, period=14):
-        return (df['close'] * df['volume']).rolling(window=period).sum() / df['volume'].rolling(window=period).sum()
+        return pd.Series(kernels.vwap(df['close'], df['volume'], period), index=df.index)
         
     def calculate_atr(self, df, period=14):
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        return true_range.rolling(window=period).mean()
+        return pd.Series(kernels.atr(df['high'], df['low'], df['close'], period), index=df.index)
         
     def calculate_trend(self, df, period=20):
-        return df['close'].rolling(window=period).mean().diff()
-        
-    def should_buy(self, data):
-        df = self.analyze_data(data)
+        return pd.Series(kernels.trend(df['close'], period), index=df.index)
         
+    def _should_buy(self, last):
         # 기본 전략의 신호
-        basic_buy = super().should_buy(data)
+        basic_buy = super()._should_buy(last)
         
         # 추가 매수 신호
-        vwap_buy = df['close'].iloc[-1] < df['vwap'].iloc[-1]
-        trend_buy = df['trend'].iloc[-1] > 0
-        volume_buy = df['volume'].iloc[-1] > df['volume'].rolling(window=20).mean().iloc[-1]
+        vwap_buy = last['close'] < last['vwap']
+        trend_buy = last['trend'] > 0
+        volume_buy = last['volume'] > last['volume_ma']
         
         # 매수 조건: 기본 전략 + 추가 조건들
-        return basic_buy and (vwap_buy or (trend_buy and volume_buy))
-        
-    def should_sell(self, data):
-        df = self.analyze_data(data)
+        return basic_buy & (vwap_buy | (trend_buy & volume_buy))
         
+    def _should_sell(self, last):
         # 기본 전략의 신호
-        basic_sell = super().should_sell(data)
+        basic_sell = super()._should_sell(last)
         
         # 추가 매도 신호
-        vwap_sell = df['close'].iloc[-1] > df['vwap'].iloc[-1]
-        trend_sell = df['trend'].iloc[-1] < 0
-        volume_sell = df['volume'].iloc[-1] < df['volume'].rolling(window=20).mean().iloc[-1]
+        vwap_sell = last['close'] > last['vwap']
+        trend_sell = last['trend'] < 0
+        volume_sell = last['volume'] < last['volume_ma']
         
         # 매도 조건: 기본 전략 + 추가 조건들
-        return basic_sell and (vwap_sell or (trend_sell and volume_sell))
+        return basic_sell & (vwap_sell | (trend_sell & volume_sell))
+
+class AIFullStrategy(AIAdvancedStrategy):
+    indicator_columns = AIAdvancedStrategy.indicator_columns + ('volatility', 'momentum', 'market_phase')
 
-class AIFullStrategy(AIStrategy):
     def __init__(self):
         super().__init__()
         self.min_samples = 200
         self.max_memory = 1000
         self.confidence_threshold = 0.7
         
-    def analyze_data(self, data):
-        df = super().analyze_data(data)
+    def build_analysis(self, df, bar):
+        result = super().build_analysis(df, bar)
+        close = result['close']
         # 추가 고급 지표 계산
-        df['volatility'] = self.calculate_volatility(df)
-        df['momentum'] = self.calculate_momentum(df)
-        df['market_phase'] = self.identify_market_phase(df)
-        return df
+        result['volatility'] = self.indicator(bar, 'volatility', (20,), lambda: kernels.volatility(close, 20))
+        result['volatility_ma'] = self.indicator(
+            bar, 'volatility_ma', (20, 100), lambda: kernels.rolling_mean(result['volatility'], 100))
+        result['momentum'] = self.indicator(bar, 'momentum', (14,), lambda: kernels.momentum(close, 14))
+        result['market_phase'] = self.indicator(
+            bar, 'market_phase', (20,), lambda: kernels.market_phase(close, 20))
+        return result
+
+    def stream_state(self):
+        state = super().stream_state()
+        state.update(returns=RollingMeanStd(20), volatility=RollingSum(100), closes=deque(maxlen=14))
+        return state
+
+    def stream_values(self, state, bar, prev, update):
+        values = super().stream_values(state, bar, prev, update)
+        close = bar['close']
+        stats = _step(state['returns'], update, close / prev['close'] - 1.0) if prev else None
+        values['volatility'] = NAN if stats is None else stats[1]
+        total = _step(state['volatility'], update, stats[1]) if stats is not None else None
+        values['volatility_ma'] = NAN if total is None else total / 100
+        # 14봉 전 종가는 보관 중인 최근 14개 닫힌 봉 종가의 맨 앞
+        closes = state['closes']
+        past = closes[0] if len(closes) == closes.maxlen else None
+        values['momentum'] = NAN if past is None else (close - past) / past * 100.0
+        if update:
+            closes.append(close)
+        # 볼린저 중심선/표준편차로 z-score 구간 (상단 = 중심 + 2 * 표준편차)
+        std = (values['upper'] - values['middle']) / 2
+        values['market_phase'] = _phase_code((close - values['middle']) / std) if std > 0 else -1
+        return values
         
     def calculate_volatility(self, df, period=20):
-        return df['close'].pct_change().rolling(window=period).std()
+        return pd.Series(kernels.volatility(df['close'], period), index=df.index)
         
     def calculate_momentum(self, df, period=14):
-        return df['close'].diff(period) / df['close'].shift(period) * 100
+        return pd.Series(kernels.momentum(df['close'], period), index=df.index)
         
     def identify_market_phase(self, df, period=20):
-        sma = df['close'].rolling(window=period).mean()
-        std = df['close'].rolling(window=period).std()
-        z_score = (df['close'] - sma) / std
-        return pd.cut(z_score, bins=[-np.inf, -2, -0.5, 0.5, 2, np.inf], 
-                     labels=['Strong Bear', 'Bear', 'Neutral', 'Bull', 'Strong Bull'])
-        
-    def should_buy(self, data):
-        df = self.analyze_data(data)
+        codes = kernels.market_phase(df['close'], period)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=kernels.MARKET_PHASES, ordered=True),
+                         index=df.index)
         
+    def _buy_confidence(self, last):
         # 고급 전략의 신호
-        advanced_buy = super().should_buy(data)
+        advanced_buy = super()._should_buy(last)
         
         # 추가 매수 신호
-        volatility_ok = df['volatility'].iloc[-1] < df['volatility'].rolling(window=100).mean().iloc[-1]
-        momentum_buy = df['momentum'].iloc[-1] > 0
-        market_phase_buy = df['market_phase'].iloc[-1] in ['Bull', 'Strong Bull']
+        volatility_ok = last['volatility'] < last['volatility_ma']
+        momentum_buy = last['momentum'] > 0
+        market_phase_buy = kernels.phase_between(last['market_phase'], 'Bull', 'Strong Bull')
         
         # 매수 신호 신뢰도 계산
         buy_signals = [advanced_buy, volatility_ok, momentum_buy, market_phase_buy]
-        confidence = sum(buy_signals) / len(buy_signals)
-        
-        # 매수 조건: 신뢰도가 임계값을 넘을 때
-        return confidence > self.confidence_threshold
-        
-    def should_sell(self, data):
-        df = self.analyze_data(data)
+        return sum(buy_signals) / len(buy_signals)
         
+    def _sell_confidence(self, last):
         # 고급 전략의 신호
-        advanced_sell = super().should_sell(data)
+        advanced_sell = super()._should_sell(last)
         
         # 추가 매도 신호
-        volatility_high = df['volatility'].iloc[-1] > df['volatility'].rolling(window=100).mean().iloc[-1]
-        momentum_sell = df['momentum'].iloc[-1] < 0
-        market_phase_sell = df['market_phase'].iloc[-1] in ['Bear', 'Strong Bear']
+        volatility_high = last['volatility'] > last['volatility_ma']
+        momentum_sell = last['momentum'] < 0
+        market_phase_sell = kernels.phase_between(last['market_phase'], 'Strong Bear', 'Bear')
         
         # 매도 신호 신뢰도 계산
         sell_signals = [advanced_sell, volatility_high, momentum_sell, market_phase_sell]
-        confidence = sum(sell_signals) / len(sell_signals)
-        
+        return sum(sell_signals) / len(sell_signals)
+
+    def _should_buy(self, last):
+        # 매수 조건: 신뢰도가 임계값을 넘을 때
+        return self._buy_confidence(last) > self.confidence_threshold
+
+    def _should_sell(self, last):
         # 매도 조건: 신뢰도가 임계값을 넘을 때
-        return confidence > self.confidence_threshold
+        return self._sell_confidence(last) > self.confidence_threshold
 
-class SMAStrategy(TradingStrategy):
+class SMAStrategy(StreamingStrategy):
     def __init__(self, short_period=5, long_period=20):
         self.short_period = short_period
         self.long_period = long_period
-        
-    def should_buy(self, data):
-        df = pd.DataFrame(data)
-        short_ma = df['close'].rolling(window=self.short_period).mean()
-        long_ma = df['close'].rolling(window=self.long_period).mean()
-        return short_ma.iloc[-1] > long_ma.iloc[-1]
-        
-    def should_sell(self, data):
-        df = pd.DataFrame(data)
-        short_ma = df['close'].rolling(window=self.short_period).mean()
-        long_ma = df['close'].rolling(window=self.long_period).mean()
-        return short_ma.iloc[-1] < long_ma.iloc[-1]
+        self.reset()
 
-class StochasticStrategy(TradingStrategy):
-    def __init__(self, k_period=14, d_period=3):
-        self.k_period = k_period
-        self.d_period = d_period
-        
-    def should_buy(self, data):
-        # 구현 필요
-        return False
-        
-    def should_sell(self, data):
-        # 구현 필요
-        return False 
+    def reset(self):
+        super().reset()
+        self.sums = [RollingSum(period) for period in (self.short_period, self.long_period)]
+
+    def _averages(self, totals):
+        if None in totals:
+            return None
+        return tuple(total / average.period for total, average in zip(totals, self.sums))
+
+    def _update(self, bar):
+        return self._averages([average.update(bar['close']) for average in self.sums])
+
+    def _peek(self, bar):
+        return self._averages([average.peek(bar['close']) for average in self.sums])
+
+    def _series(self, arrays):
+        return self._complete(kernels.rolling_mean(arrays['close'], self.short_period),
+                              kernels.rolling_mean(arrays['close'], self.long_period))
+
+    def _buy(self, values, bar):
+        return values[0] > values[1]
+
+    def _sell(self, values, bar):
+        return values[0] < values[1]
+
+    def _describe(self, values):
+        return {'short_ma': values[0], 'long_ma': values[1]}
+
+    def _reason(self, action, values, bar):
+        return f"단기 이평선이 장기 이평선 {'위' if action == BUY else '아래'}"
+
+    def moving_averages(self, data):
+        """단기/장기 이동평균 배열 (표시/분석용)"""
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        return (kernels.rolling_mean(df['close'], self.short_period),
+                kernels.rolling_mean(df['close'], self.long_period))
+
+class VWAPStrategy(StreamingStrategy):
+    columns = ('close', 'volume')
 
-class VWAPStrategy(TradingStrategy):
     def __init__(self, period=14):
         self.period = period
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.vwap = RollingVWAP(self.period)
+
+    def _update(self, bar):
+        return self.vwap.update(bar['close'], bar['volume'])
+
+    def _peek(self, bar):
+        return self.vwap.peek(bar['close'], bar['volume'])
+
+    def _series(self, arrays):
+        return kernels.vwap(arrays['close'], arrays['volume'], self.period)
+
+    def _buy(self, vwap, bar):
+        return bar['close'] < vwap
+
+    def _sell(self, vwap, bar):
+        return bar['close'] > vwap
+
+    def _describe(self, vwap):
+        return {'vwap': vwap}
+
+    def _reason(self, action, vwap, bar):
+        return f"종가가 VWAP {vwap:,.0f} {'아래' if action == BUY else '위'}"
         
     def calculate_vwap(self, data):
         df = pd.DataFrame(data)
-        df['vwap'] = (df['close'] * df['volume']).rolling(window=self.period).sum() / df['volume'].rolling(window=self.period).sum()
-        return df['vwap']
-        
-    def should_buy(self, data):
-        vwap = self.calculate_vwap(data)
-        return data['close'].iloc[-1] < vwap.iloc[-1]
-        
-    def should_sell(self, data):
-        vwap = self.calculate_vwap(data)
-        return data['close'].iloc[-1] > vwap.iloc[-1]
+        return pd.Series(kernels.vwap(df['close'], df['volume'], self.period), index=df.index, name='vwap')
 
-class IchimokuStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요
+class IchimokuStrategy(StreamingStrategy):
+    columns = ('high', 'low', 'close')
 
-class SuperTrendStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요
+    def __init__(self, conversion=9, base=26, span_b=52, displacement=26):
+        self.conversion = conversion
+        self.base = base
+        self.span_b = span_b
+        self.displacement = displacement
+        self.reset()
 
-class DMIStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요
+    def reset(self):
+        super().reset()
+        self.ichimoku = Ichimoku(self.conversion, self.base, self.span_b, self.displacement)
 
-class WilliamsStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요
+    def _update(self, bar):
+        return self.ichimoku.update(bar['high'], bar['low'])
 
-class TrendFollowStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요
+    def _peek(self, bar):
+        return self.ichimoku.peek(bar['high'], bar['low'])
 
-class VolBreakoutStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요
+    def _series(self, arrays):
+        return self._complete(*kernels.ichimoku(arrays['high'], arrays['low'], self.conversion, self.base,
+                                                self.span_b, self.displacement))
 
-class MultiMAStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요
+    def _buy(self, values, bar):
+        tenkan, kijun, span_a, span_b = values
+        close = bar['close']
+        return (tenkan > kijun) & (close > span_a) & (close > span_b)
 
-class MomentumRevStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요
+    def _sell(self, values, bar):
+        tenkan, kijun, span_a, span_b = values
+        close = bar['close']
+        return (tenkan < kijun) & (close < span_a) & (close < span_b)
 
-class VolumeBreakStrategy(TradingStrategy):
-    def should_buy(self, data):
-        return False  # 구현 필요
-        
-    def should_sell(self, data):
-        return False  # 구현 필요 
\ No newline at end of file
+    def _describe(self, values):
+        return dict(zip(('tenkan', 'kijun', 'senkou_a', 'senkou_b'), values))
+
+    def _reason(self, action, values, bar):
+        if action == BUY:
+            return "전환선이 기준선 위, 종가가 구름대 위"
+        return "전환선이 기준선 아래, 종가가 구름대 아래"
+
+class SuperTrendStrategy(StreamingStrategy):
+    columns = ('high', 'low', 'close')
+
+    def __init__(self, period=10, multiplier=3):
+        self.period = period
+        self.multiplier = multiplier
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.supertrend = SuperTrend(self.period, self.multiplier)
+
+    def _update(self, bar):
+        return self.supertrend.update(bar['high'], bar['low'], bar['close'])
+
+    def _peek(self, bar):
+        return self.supertrend.peek(bar['high'], bar['low'], bar['close'])
+
+    def _series(self, arrays):
+        return self._complete(*kernels.supertrend(arrays['high'], arrays['low'], arrays['close'],
+                                                  self.period, self.multiplier))
+
+    def _buy(self, values, bar):
+        return values[1] == 1
+
+    def _sell(self, values, bar):
+        return values[1] == -1
+
+    def _describe(self, values):
+        return {'supertrend': values[0], 'direction': values[1]}
+
+    def _reason(self, action, values, bar):
+        return f"종가가 수퍼트렌드 {values[0]:,.0f} {'위 (상승추세)' if action == BUY else '아래 (하락추세)'}"
+
+class DMIStrategy(StreamingStrategy):
+    columns = ('high', 'low', 'close')
+
+    def __init__(self, period=14):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.dmi = DMI(self.period)
+
+    def _with_prev(self, values, prev):
+        # ADX 상승 여부를 보려고 직전 봉 ADX를 함께 둔다
+        if values is None or prev is None:
+            return None
+        return values + (prev[2],)
+
+    def _update(self, bar):
+        prev = self.dmi.value
+        return self._with_prev(self.dmi.update(bar['high'], bar['low'], bar['close']), prev)
+
+    def _peek(self, bar):
+        return self._with_prev(self.dmi.peek(bar['high'], bar['low'], bar['close']), self.dmi.value)
+
+    def _series(self, arrays):
+        plus_di, minus_di, adx = kernels.dmi(arrays['high'], arrays['low'], arrays['close'], self.period)
+        return self._complete(plus_di, minus_di, adx, kernels.shift(adx))
+
+    def _buy(self, values, bar):
+        plus_di, minus_di, adx, prev_adx = values
+        return (plus_di > minus_di) & (adx > prev_adx)
+
+    def _sell(self, values, bar):
+        plus_di, minus_di, adx, prev_adx = values
+        return (minus_di > plus_di) & (adx > prev_adx)
+
+    def _describe(self, values):
+        return {'plus_di': values[0], 'minus_di': values[1], 'adx': values[2]}
+
+    def _reason(self, action, values, bar):
+        side = '+DI가 -DI 위' if action == BUY else '-DI가 +DI 위'
+        return f"{side}, ADX {values[2]:.1f} 상승"
+
+class WilliamsStrategy(StreamingStrategy):
+    columns = ('high', 'low', 'close')
+
+    def __init__(self, period=14, oversold=-80, overbought=-20):
+        self.period = period
+        self.oversold = oversold
+        self.overbought = overbought
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.williams = WilliamsR(self.period)
+
+    def _with_prev(self, value, prev):
+        if value is None or prev is None:
+            return None
+        return value, prev
+
+    def _update(self, bar):
+        prev = self.williams.value
+        return self._with_prev(self.williams.update(bar['high'], bar['low'], bar['close']), prev)
+
+    def _peek(self, bar):
+        return self._with_prev(self.williams.peek(bar['high'], bar['low'], bar['close']), self.williams.value)
+
+    def _series(self, arrays):
+        value = kernels.williams_r(arrays['high'], arrays['low'], arrays['close'], self.period)
+        return self._complete(value, kernels.shift(value))
+
+    def _buy(self, values, bar):
+        value, prev = values
+        return (prev <= self.oversold) & (value > prev)
+
+    def _sell(self, values, bar):
+        value, prev = values
+        return (prev >= self.overbought) & (value < prev)
+
+    def _describe(self, values):
+        return {'williams_r': values[0]}
+
+    def _reason(self, action, values, bar):
+        if action == BUY:
+            return f"%R {values[1]:.1f} 과매도 구간에서 {values[0]:.1f}로 상승 반전"
+        return f"%R {values[1]:.1f} 과매수 구간에서 {values[0]:.1f}로 하락 반전"
+
+class TrendFollowStrategy(StreamingStrategy):
+    def __init__(self, fast=12, slow=26, signal=9, rsi_period=14):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self.rsi_period = rsi_period
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.macd = MACD(self.fast, self.slow, self.signal)
+        self.rsi = RSI(self.rsi_period)
+
+    def _values(self, macd, rsi, prev_rsi):
+        if rsi is None or prev_rsi is None:
+            return None
+        return macd + (rsi, prev_rsi)
+
+    def _update(self, bar):
+        prev_rsi = self.rsi.value
+        return self._values(self.macd.update(bar['close']), self.rsi.update(bar['close']), prev_rsi)
+
+    def _peek(self, bar):
+        return self._values(self.macd.peek(bar['close']), self.rsi.peek(bar['close']), self.rsi.value)
+
+    def _series(self, arrays):
+        macd, signal = kernels.macd(arrays['close'], self.fast, self.slow, self.signal)
+        rsi = kernels.rsi(arrays['close'], self.rsi_period)
+        return self._complete(macd, signal, macd - signal, rsi, kernels.shift(rsi))
+
+    def _buy(self, values, bar):
+        macd, signal, _, rsi, prev_rsi = values
+        return (macd > signal) & (rsi > prev_rsi)
+
+    def _sell(self, values, bar):
+        macd, signal, _, rsi, prev_rsi = values
+        return (macd < signal) & (rsi < prev_rsi)
+
+    def _describe(self, values):
+        return {'macd': values[0], 'signal': values[1], 'histogram': values[2], 'rsi': values[3]}
+
+    def _reason(self, action, values, bar):
+        if action == BUY:
+            return f"MACD가 시그널선 위, RSI {values[4]:.1f} → {values[3]:.1f} 상승"
+        return f"MACD가 시그널선 아래, RSI {values[4]:.1f} → {values[3]:.1f} 하락"
+
+class VolBreakoutStrategy(StreamingStrategy):
+    columns = ('close', 'volume')
+
+    def __init__(self, period=20, std_dev=2, volume_ratio=1.5):
+        self.period = period
+        self.std_dev = std_dev
+        self.volume_ratio = volume_ratio
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.bands = BollingerBands(self.period, self.std_dev)
+        self.volumes = RollingSum(self.period)
+
+    def _values(self, bands, bar):
+        # 볼린저 밴드와 직전 period봉 평균 거래량 대비 현재 봉 거래량
+        if bands is None or not self.volumes.ready or not self.volumes.total:
+            return None
+        return bands + (bar['volume'] / (self.volumes.total / self.period),)
+
+    def _update(self, bar):
+        values = self._values(self.bands.update(bar['close']), bar)
+        self.volumes.update(bar['volume'])
+        return values
+
+    def _peek(self, bar):
+        return self._values(self.bands.peek(bar['close']), bar)
+
+    def _series(self, arrays):
+        upper, middle, lower = kernels.bollinger(arrays['close'], self.period, self.std_dev)
+        average = kernels.shift(kernels.rolling_mean(arrays['volume'], self.period))
+        average[average == 0] = np.nan
+        ratio = kernels.as_array(arrays['volume']) / average
+        return self._complete(upper, middle, lower, ratio)
+
+    def _buy(self, values, bar):
+        return (bar['close'] > values[0]) & (values[3] >= self.volume_ratio)
+
+    def _sell(self, values, bar):
+        return (bar['close'] < values[2]) & (values[3] >= self.volume_ratio)
+
+    def _describe(self, values):
+        return {'upper': values[0], 'middle': values[1], 'lower': values[2], 'volume_ratio': values[3]}
+
+    def _reason(self, action, values, bar):
+        if action == BUY:
+            return f"종가 {bar['close']:,.0f}이 볼린저 상단 {values[0]:,.0f} 돌파, 거래량 {values[3]:.1f}배"
+        return f"종가 {bar['close']:,.0f}이 볼린저 하단 {values[2]:,.0f} 이탈, 거래량 {values[3]:.1f}배"
+
+class MultiMAStrategy(StreamingStrategy):
+    def __init__(self, short_period=5, mid_period=20, long_period=60):
+        self.short_period = short_period
+        self.mid_period = mid_period
+        self.long_period = long_period
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.sums = [RollingSum(period) for period in (self.short_period, self.mid_period, self.long_period)]
+
+    def _averages(self, totals):
+        if None in totals:
+            return None
+        return tuple(total / average.period for total, average in zip(totals, self.sums))
+
+    def _update(self, bar):
+        return self._averages([average.update(bar['close']) for average in self.sums])
+
+    def _peek(self, bar):
+        return self._averages([average.peek(bar['close']) for average in self.sums])
+
+    def _series(self, arrays):
+        return self._complete(*(kernels.rolling_mean(arrays['close'], period)
+                                for period in (self.short_period, self.mid_period, self.long_period)))
+
+    def _buy(self, values, bar):
+        short_ma, mid_ma, long_ma = values
+        return (short_ma > mid_ma) & (short_ma > long_ma)
+
+    def _sell(self, values, bar):
+        short_ma, mid_ma, long_ma = values
+        return (short_ma < mid_ma) & (short_ma < long_ma)
+
+    def _describe(self, values):
+        return {'short_ma': values[0], 'mid_ma': values[1], 'long_ma': values[2]}
+
+    def _reason(self, action, values, bar):
+        return f"단기 이평선이 중기/장기 이평선 모두 {'위' if action == BUY else '아래'}"
+
+class MomentumRevStrategy(StreamingStrategy):
+    columns = ('high', 'low', 'close')
+
+    def __init__(self, rsi_period=14, k_period=14, d_period=3, oversold=30, overbought=70):
+        self.rsi_period = rsi_period
+        self.k_period = k_period
+        self.d_period = d_period
+        self.oversold = oversold
+        self.overbought = overbought
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.rsi = RSI(self.rsi_period)
+        self.stoch = Stochastic(self.k_period, self.d_period)
+
+    def _values(self, rsi, prev_rsi, stoch):
+        if rsi is None or prev_rsi is None or stoch is None or stoch[1] is None:
+            return None
+        return (rsi, prev_rsi) + stoch
+
+    def _update(self, bar):
+        prev_rsi = self.rsi.value
+        return self._values(self.rsi.update(bar['close']), prev_rsi,
+                            self.stoch.update(bar['high'], bar['low'], bar['close']))
+
+    def _peek(self, bar):
+        return self._values(self.rsi.peek(bar['close']), self.rsi.value,
+                            self.stoch.peek(bar['high'], bar['low'], bar['close']))
+
+    def _series(self, arrays):
+        rsi = kernels.rsi(arrays['close'], self.rsi_period)
+        k, d = kernels.stochastic(arrays['high'], arrays['low'], arrays['close'], self.k_period, self.d_period)
+        return self._complete(rsi, kernels.shift(rsi), k, d)
+
+    def _buy(self, values, bar):
+        rsi, prev_rsi, k, d = values
+        return (prev_rsi < self.oversold) & (rsi > prev_rsi) & (d < 20) & (k > d)
+
+    def _sell(self, values, bar):
+        rsi, prev_rsi, k, d = values
+        return (prev_rsi > self.overbought) & (rsi < prev_rsi) & (d > 80) & (k < d)
+
+    def _describe(self, values):
+        return {'rsi': values[0], 'k': values[2], 'd': values[3]}
+
+    def _reason(self, action, values, bar):
+        if action == BUY:
+            return f"RSI {values[1]:.1f} 과매도 반등, 스토캐스틱 %K {values[2]:.1f} 상향 돌파"
+        return f"RSI {values[1]:.1f} 과매수 반락, 스토캐스틱 %K {values[2]:.1f} 하향 돌파"
+
+class VolumeBreakStrategy(StreamingStrategy):
+    columns = ('open', 'close', 'volume')
+
+    def __init__(self, period=20, volume_ratio=2.0):
+        self.period = period
+        self.volume_ratio = volume_ratio
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.volumes = RollingSum(self.period)
+
+    def _ratio(self, bar):
+        # 직전 period봉 평균 거래량 대비 현재 봉 거래량
+        if not self.volumes.ready or not self.volumes.total:
+            return None
+        return bar['volume'] / (self.volumes.total / self.period)
+
+    def _update(self, bar):
+        ratio = self._ratio(bar)
+        self.volumes.update(bar['volume'])
+        return ratio
+
+    def _peek(self, bar):
+        return self._ratio(bar)
+
+    def _series(self, arrays):
+        average = kernels.shift(kernels.rolling_mean(arrays['volume'], self.period))
+        average[average == 0] = np.nan
+        return kernels.as_array(arrays['volume']) / average
+
+    def _buy(self, ratio, bar):
+        return (ratio >= self.volume_ratio) & (bar['close'] > bar['open'])
+
+    def _sell(self, ratio, bar):
+        return (ratio >= self.volume_ratio) & (bar['close'] < bar['open'])
+
+    def _describe(self, ratio):
+        return {'volume_ratio': ratio}
+
+    def _reason(self, action, ratio, bar):
+        return f"거래량 평균 대비 {ratio:.1f}배 급증, {'양봉' if action == BUY else '음봉'}"
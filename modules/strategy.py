@@ -1,14 +1,17 @@
 import pandas as pd
-import pyupbit
 import logging
 from config.config import *
+from .candles import CandleStore
 
 class TradingStrategy:
+    # 마켓/간격별 캔들을 보관하고 새 캔들만 받아오는 공유 저장소
+    candle_store = CandleStore()
+
     @staticmethod
     def get_ma_crossover_signal(ticker, short_window=5, long_window=20):
         """이동평균선 크로스오버 전략"""
         try:
-            df = pyupbit.get_ohlcv(ticker, interval="minute5")
+            df = TradingStrategy.candle_store.get(ticker, interval="minute5")
             if df is None:
                 return None
                 
@@ -0,0 +1,145 @@
+import json
+import uuid
+import queue
+import asyncio
+import logging
+import threading
+
+import websockets
+
+UPBIT_WEBSOCKET_URI = "wss://api.upbit.com/websocket/v1"
+STREAM_TYPES = ('ticker', 'trade', 'orderbook')
+
+
+class MarketStream:
+    """업비트 WebSocket 시세 스트림 (ticker/trade/orderbook)
+
+    별도 스레드의 이벤트 루프에서 수신한 메시지를 등록된 콜백과 큐로 전달한다.
+    연결이 끊기면 지수 백오프로 자동 재연결한다.
+
+    사용 예:
+        stream = MarketStream(['KRW-BTC'], types=('ticker', 'trade'))
+        stream.subscribe('ticker', on_ticker)
+        stream.start()
+    """
+    def __init__(self, markets, types=('ticker',), uri=None, message_queue=None,
+                 reconnect_delay=1.0, max_reconnect_delay=30.0):
+        for stream_type in types:
+            if stream_type not in STREAM_TYPES:
+                raise ValueError(f"지원하지 않는 스트림 유형: {stream_type}")
+        self.logger = logging.getLogger(__name__)
+        self.markets = list(markets)
+        self.types = tuple(types)
+        self.uri = uri or UPBIT_WEBSOCKET_URI
+        self.queue = message_queue
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.callbacks = {}
+        self.running = False
+        self.connected = threading.Event()
+        self.reconnect_count = 0
+        self.message_count = 0
+        self._loop = None
+        self._thread = None
+        self._websocket = None
+
+    def subscribe(self, stream_type, callback):
+        """메시지 유형별 콜백 등록 ('*'는 전체 유형)"""
+        self.callbacks.setdefault(stream_type, []).append(callback)
+
+    def unsubscribe(self, stream_type, callback):
+        """등록된 콜백 제거"""
+        if callback in self.callbacks.get(stream_type, []):
+            self.callbacks[stream_type].remove(callback)
+
+    def subscription_message(self):
+        """업비트 구독 요청 메시지 생성"""
+        request = [{'ticket': str(uuid.uuid4())[:8]}]
+        for stream_type in self.types:
+            request.append({
+                'type': stream_type,
+                'codes': self.markets,
+                'isOnlyRealtime': True
+            })
+        request.append({'format': 'DEFAULT'})
+        return json.dumps(request)
+
+    def start(self):
+        """백그라운드 스레드에서 스트림 시작"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run_loop, name='MarketStream', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """스트림 중지"""
+        self.running = False
+        if self._loop is not None and self._websocket is not None:
+            asyncio.run_coroutine_threadsafe(self._websocket.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.connected.clear()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while self.running:
+            try:
+                async with websockets.connect(self.uri, ping_interval=60) as websocket:
+                    self._websocket = websocket
+                    await websocket.send(self.subscription_message())
+                    self.connected.set()
+                    self.logger.info(f"시세 스트림 연결: {self.uri} {self.types} {len(self.markets)}개 마켓")
+                    delay = self.reconnect_delay
+                    async for raw in websocket:
+                        self._dispatch(raw)
+            # WebSocketException은 ConnectionClosed와 핸드셰이크 거부(InvalidStatus 등)를 모두 포함
+            except (websockets.WebSocketException, OSError, asyncio.TimeoutError) as e:
+                self.logger.warning(f"시세 스트림 연결 끊김: {str(e)}")
+            finally:
+                self._websocket = None
+                self.connected.clear()
+
+            if not self.running:
+                break
+            self.reconnect_count += 1
+            self.logger.info(f"시세 스트림 재연결 대기 {delay:.1f}초")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _dispatch(self, raw):
+        try:
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf8')
+            message = json.loads(raw)
+        except ValueError as e:
+            self.logger.error(f"시세 메시지 파싱 실패: {str(e)}")
+            return
+
+        self.message_count += 1
+        stream_type = message.get('type')
+        for callback in self.callbacks.get(stream_type, []) + self.callbacks.get('*', []):
+            try:
+                callback(message)
+            except Exception as e:
+                self.logger.error(f"시세 콜백 처리 실패: {str(e)}")
+
+        if self.queue is not None:
+            try:
+                self.queue.put_nowait(message)
+            except queue.Full:
+                # 소비가 밀리면 가장 오래된 메시지를 버리고 최신 메시지를 유지
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self.queue.put_nowait(message)
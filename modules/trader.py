@@ -1,6 +1,18 @@
 import pyupbit
 import logging
-from datetime import datetime
+import numpy as np
+from .market_data import QuoteService
+from .exchange_client import UpbitClient
+from .accounts import AccountBook
+from .cache import MarketDataCache, indicator_cache
+from .aggregator import CandleAggregator
+from .orderbook import OrderBookMirror
+from .candles import CandleStore
+from . import kernels
+from .batch import scan_markets
+from .registry import strategy_registry
+from .strategies import RSIStrategy, MACDStrategy, evaluate_strategy, HOLD
+from .config import WATCH_MARKETS, MARKET_DATA_SETTINGS
 
 class UpbitTrader:
     def __init__(self):
@@ -12,59 +24,116 @@ class UpbitTrader:
         self.last_analysis = {}
         self.last_signal = None
         self.trade_count = 0
+        self.client = UpbitClient()
+        self.quotes = QuoteService(WATCH_MARKETS, client=self.client)
+        self.accounts = AccountBook(self.client)
+        self.cache = MarketDataCache()
+        self.quote_max_age = MARKET_DATA_SETTINGS['QUOTE_MAX_AGE']
+        self.stream = None
+        self.aggregator = CandleAggregator()
+        self.orderbooks = OrderBookMirror()
+        self.candles = CandleStore(self.client)
+        self.strategies = strategy_registry
+        self.strategy_key = None
+        self.strategy = None
+        self.last_decision = None
+        # 상태 표시용 지표 (봉 단위로 이어서 계산)
+        self._rsi = RSIStrategy()
+        self._macd = MACDStrategy()
 
     def set_api_keys(self, access, secret):
         """API 키 설정"""
         try:
             self.upbit = pyupbit.Upbit(access, secret)
+            self.client.set_credentials(access, secret)
+            self.accounts.invalidate()
             self.logger.info("업비트 API 연동 성공")
             return True
         except Exception as e:
             self.logger.error(f"업비트 API 연동 실패: {str(e)}")
             return False
 
-    def get_current_price(self, coin=None):
-        """현재가 조회"""
+    def get_ticker_snapshot(self, coin=None):
+        """시세 스냅샷 조회 (/v1/ticker 1회 호출)"""
         try:
             if coin is None:
                 coin = self.coin
-            ticker = pyupbit.get_current_price(coin)
-            
-            # 현재가, 변동률, 거래량을 함께 반환
-            return {
-                'trade_price': ticker,
-                'change_rate': self._get_change_rate(coin),
-                'acc_trade_volume_24h': self._get_24h_volume(coin)
-            }
+            return self.cache.get_or_fetch(('ticker', coin), lambda: self._load_ticker(coin))
         except Exception as e:
-            self.logger.error(f"현재가 조회 실패: {str(e)}")
+            self.logger.error(f"시세 스냅샷 조회 실패: {str(e)}")
             return None
 
-    def _get_change_rate(self, coin):
-        """24시간 변동률 조회"""
+    def _load_ticker(self, coin):
+        snapshot = self.quotes.get(coin, self.quote_max_age)
+        if snapshot is None:
+            snapshot = self.quotes.refresh([coin]).get(coin)
+        return snapshot
+
+    def refresh_quotes(self, markets=None):
+        """감시 중인 마켓 시세 일괄 갱신"""
+        if markets is None:
+            self.quotes.watch([self.coin])
+        refreshed = self.quotes.refresh(markets)
+        # 이번 주기의 모든 소비자가 같은 시세를 보도록 캐시에 반영
+        for market, snapshot in refreshed.items():
+            self.cache.put(('ticker', market), snapshot)
+        return refreshed
+
+    def get_quotes(self, markets=None):
+        """보관 중인 시세를 마켓별 dict로 반환 (네트워크 호출 없음)"""
+        if markets is None:
+            return self.quotes.snapshot()
+        return self.quotes.get_many(markets)
+
+    def attach_stream(self, stream):
+        """WebSocket 시세 스트림 연결 (ticker는 시세 갱신, trade는 로컬 캔들 집계, orderbook은 호가창 갱신)"""
+        stream.subscribe('ticker', self.quotes.on_ticker)
+        stream.subscribe('trade', self.aggregator.on_trade)
+        stream.subscribe('orderbook', self.orderbooks.on_orderbook)
+        self.stream = stream
+
+    def get_orderbook(self, coin=None):
+        """로컬 호가창 조회 (스트림으로 갱신 중이면 REST 호출 없음)"""
         try:
-            # get_ticker 대신 get_ohlcv 사용
-            df = pyupbit.get_ohlcv(coin, interval="day", count=1)
-            if df is not None and not df.empty:
-                open_price = df.iloc[0]['open']
-                close_price = df.iloc[0]['close']
-                return (close_price - open_price) / open_price
-            return 0.0
+            if coin is None:
+                coin = self.coin
+            return self.cache.get_or_fetch(('orderbook', coin), lambda: self._load_orderbook(coin))
         except Exception as e:
-            self.logger.error(f"변동률 조회 실패: {str(e)}")
-            return 0.0
+            self.logger.error(f"호가 조회 실패: {str(e)}")
+            return None
+
+    def _load_orderbook(self, coin):
+        age = self.orderbooks.age(coin)
+        if age is None or age > self.cache.ttl_for(('orderbook', coin)):
+            self.orderbooks.refresh(self.client, [coin])
+        return self.orderbooks.get(coin)
+
+    def estimate_fill(self, amount, coin=None, side='bid'):
+        """시장가 주문 예상 체결가 (side: 'bid'는 KRW 금액 매수, 'ask'는 수량 매도)"""
+        book = self.get_orderbook(coin)
+        if book is None:
+            return None
+        if side == 'bid':
+            return book.expected_fill('bid', amount=amount)
+        return book.expected_fill('ask', volume=amount)
+
+    def get_current_price(self, coin=None):
+        """현재가 조회"""
+        snapshot = self.get_ticker_snapshot(coin)
+        if snapshot is None:
+            return None
+        # 현재가, 변동률, 거래량, 고가/저가, 시각을 함께 반환
+        return snapshot.to_dict()
 
-    def _get_24h_volume(self, coin):
-        """24시간 거래량 조회"""
+    def get_account_snapshot(self, force=False):
+        """계좌 스냅샷 조회 (TTL 안에서는 메모리의 스냅샷 재사용)"""
         try:
-            # get_ticker 대신 get_ohlcv 사용
-            df = pyupbit.get_ohlcv(coin, interval="day", count=1)
-            if df is not None and not df.empty:
-                return df.iloc[0]['volume']
-            return 0.0
+            if self.upbit is None:
+                return None
+            return self.accounts.get(force)
         except Exception as e:
-            self.logger.error(f"거래량 조회 실패: {str(e)}")
-            return 0.0
+            self.logger.error(f"계좌 조회 실패: {str(e)}")
+            return None
 
     def get_balance(self, coin=None):
         """잔고 조회"""
@@ -75,38 +144,134 @@ class UpbitTrader:
             if coin is None:
                 coin = self.coin
                 
-            coin_symbol = coin.split('-')[1]  # KRW-BTC -> BTC
-            
-            # KRW 잔고
-            krw_balance = self.upbit.get_balance("KRW")
-            # 코인 잔고
-            coin_balance = self.upbit.get_balance(coin)
-            # 코인 평가금액
-            coin_value = coin_balance * self.get_current_price(coin)['trade_price'] if coin_balance else 0
-            
+            # 계좌 스냅샷 1회 조회로 KRW/코인 잔고와 평균 매수가를 함께 처리
+            accounts = self.accounts.get()
+            krw_balance = accounts.balance("KRW")
+            coin_balance = accounts.total(coin)
+            avg_buy_price = accounts.avg_buy_price(coin)
+
+            # 코인 평가금액 (시세 서비스에 보관된 시세 재사용)
+            coin_value = 0.0
+            if coin_balance:
+                snapshot = self.get_ticker_snapshot(coin)
+                price = snapshot.trade_price if snapshot else avg_buy_price
+                coin_value = coin_balance * price
+
             # 총 평가금액
             total_value = krw_balance + coin_value
-            
-            # 초기 투자금액 (또는 매수 평균가) - 실제 구현 필요
-            initial_investment = total_value  # 임시로 동일하게 설정
-            
+
+            # 투자원금: 보유 KRW + 코인 매수원금 (평균 매수가 기준)
+            initial_investment = krw_balance + coin_balance * avg_buy_price
+
             return {
                 'krw': krw_balance,
+                'krw_locked': accounts.locked("KRW"),
                 'coin_amount': coin_balance,
+                'coin_locked': accounts.locked(coin),
+                'avg_buy_price': avg_buy_price,
                 'coin_value': coin_value,
                 'total_value': total_value,
-                'profit_rate': ((total_value - initial_investment) / initial_investment * 100) 
+                'profit_rate': ((total_value - initial_investment) / initial_investment * 100)
                               if initial_investment > 0 else 0.0
             }
         except Exception as e:
             self.logger.error(f"잔고 조회 실패: {str(e)}")
             return None
 
+    def get_candles(self, coin=None, interval='minute5', count=None):
+        """캔들 조회 (저장소에 없는 새 캔들만 받아옴)"""
+        try:
+            if coin is None:
+                coin = self.coin
+            return self.candles.get(coin, interval, count)
+        except Exception as e:
+            self.logger.error(f"캔들 조회 실패: {str(e)}")
+            return None
+
+    def scan_markets(self, strategy=None, markets=None, interval='minute5', params=None):
+        """여러 마켓을 한 번에 판단해 {마켓: 판단 결과} 반환 (기본: COIN_GROUPS 전체)
+
+        strategy는 전략 객체 또는 STRATEGIES 키이다. 키를 넘기면 배치 판단을
+        못 하는 전략도 레지스트리의 마켓별 객체로 새 봉만 반영해 판단한다.
+        """
+        try:
+            if isinstance(strategy, str):
+                key = strategy
+                return scan_markets(self.candles, self.strategies.get(key, params=params), markets, interval,
+                                    lambda market: self.strategies.get(key, market, params))
+            return scan_markets(self.candles, strategy or self.strategy, markets, interval)
+        except Exception as e:
+            self.logger.error(f"마켓 일괄 판단 실패: {str(e)}")
+            return {}
+
+    def _place_order(self, coin, side, volume=None, price=None, ord_type='limit'):
+        try:
+            if self.upbit is None:
+                return None
+            order = self.client.place_order(coin, side, volume=volume, price=price, ord_type=ord_type)
+            # 주문으로 잔고가 바뀌므로 다음 조회 때 계좌를 새로 받는다
+            self.accounts.invalidate()
+            self.logger.info(f"주문 접수 - {coin} {side} {ord_type} 가격: {price} 수량: {volume}")
+            return order
+        except Exception as e:
+            self.logger.error(f"주문 실패 ({coin} {side}): {str(e)}")
+            return None
+
+    def buy_market_order(self, coin, amount):
+        """시장가 매수 (KRW 금액)"""
+        return self._place_order(coin, 'bid', price=amount, ord_type='price')
+
+    def sell_market_order(self, coin, volume):
+        """시장가 매도 (코인 수량)"""
+        return self._place_order(coin, 'ask', volume=volume, ord_type='market')
+
+    def buy_limit_order(self, coin, price, volume):
+        """지정가 매수"""
+        return self._place_order(coin, 'bid', volume=volume, price=price)
+
+    def sell_limit_order(self, coin, price, volume):
+        """지정가 매도"""
+        return self._place_order(coin, 'ask', volume=volume, price=price)
+
+    def get_order(self, order_uuid):
+        """주문 상태 조회"""
+        try:
+            if self.upbit is None:
+                return None
+            return self.client.get_order(order_uuid)
+        except Exception as e:
+            self.logger.error(f"주문 조회 실패: {str(e)}")
+            return None
+
+    def cancel_order(self, order_uuid):
+        """주문 취소"""
+        try:
+            if self.upbit is None:
+                return None
+            result = self.client.cancel_order(order_uuid)
+            self.accounts.invalidate()
+            return result
+        except Exception as e:
+            self.logger.error(f"주문 취소 실패: {str(e)}")
+            return None
+
+    def request_priority(self, priority):
+        """이 스레드에서 나가는 API 요청의 우선순위 지정 (with 문, 같은 요청 그룹 안에서만 적용)"""
+        return self.client.scheduler.priority(priority)
+
+    def get_latency_stats(self):
+        """거래소 API 엔드포인트별 지연 시간 통계"""
+        return self.client.get_latency_stats()
+
     def start_auto_trading(self, strategy_key, settings):
         try:
             self.coin = settings['coin']
             self.amount = settings['amount']
             self.strategy_key = strategy_key
+            # 같은 (전략, 파라미터, 코인)은 이전에 지표를 쌓아 둔 객체를 다시 쓰고,
+            # 처음 만드는 객체는 분석에 쓰는 캔들로 지표 상태를 미리 채운다
+            self.strategy = self.strategies.get(strategy_key, self.coin, settings.get('params'),
+                                                self.get_candles(self.coin, 'minute5'))
             self.running = True
             self.trading_status = "시작됨"
             self.last_analysis = {}
@@ -127,24 +292,27 @@ class UpbitTrader:
             self.trading_status = "차트 분석중..."
             current_price = self.get_current_price(self.coin)
             
-            # 전략별 매수/매도 가격 계산
-            if self.strategy_key == 'RSI':
-                target_buy = current_price['trade_price'] * 0.98  # 예: 현재가 대비 2% 하락 시 매수
-                target_sell = current_price['trade_price'] * 1.02  # 예: 현재가 대비 2% 상승 시 매도
-            else:
-                # 다른 전략들에 대한 매수/매도 가격 계산 로직
-                target_buy = current_price['trade_price'] * 0.99
-                target_sell = current_price['trade_price'] * 1.01
+            # 전략별 매수/매도 가격 계산 (폭은 레지스트리의 전략 설정)
+            target_rate = self.strategies.target_rate(self.strategy_key)
+            target_buy = current_price['trade_price'] * (1 - target_rate)
+            target_sell = current_price['trade_price'] * (1 + target_rate)
                 
             self.last_analysis = {
                 'current_price': current_price['trade_price'],
                 'target_buy': target_buy,
                 'target_sell': target_sell,
-                'rsi': 65.5,  # 예시 값
-                'macd': 'POSITIVE',
-                'volume': '증가중',
-                'trend': '상승추세'
+                'rsi': None,
+                'macd': '-',
+                'volume': '-',
+                'trend': '-'
             }
+
+            # 캔들 저장소의 5분봉으로 실제 지표 값 계산
+            df = self.get_candles(self.coin, 'minute5')
+            if df is not None and len(df) > 1:
+                self.last_analysis.update(self._market_indicators(df))
+                if self.strategy is not None:
+                    self.last_decision = evaluate_strategy(self.strategy, df)
             self.trading_status = "매매 신호 대기중..."
             return True
             
@@ -152,17 +320,35 @@ class UpbitTrader:
             self.trading_status = f"분석 실패: {str(e)}"
             return False
 
+    def _market_indicators(self, df):
+        """상태 표시용 RSI/MACD/거래량/가격 추세"""
+        rsi = self._rsi.evaluate(df)['indicators'].get('rsi')
+        macd = self._macd.evaluate(df)['indicators']
+        volume_ma = indicator_cache.get(df, 'volume_ma', (20,), lambda: kernels.rolling_mean(df['volume'], 20))
+        trend = indicator_cache.get(df, 'trend', (20,), lambda: kernels.trend(df['close'], 20))
+        result = {'rsi': round(rsi, 1) if rsi is not None else None}
+        if macd:
+            result['macd'] = 'POSITIVE' if macd['histogram'] > 0 else 'NEGATIVE'
+        if not np.isnan(volume_ma[-1]):
+            result['volume'] = '증가중' if df['volume'].iat[-1] > volume_ma[-1] else '감소중'
+        if not np.isnan(trend[-1]):
+            result['trend'] = '상승추세' if trend[-1] > 0 else '하락추세'
+        return result
+
     def check_trading_signal(self):
         """매매 신호 확인"""
         try:
             current_price = self.get_current_price(self.coin)
-            if current_price:
-                # 여기에 실제 신호 확인 로직 추가
+            decision = self.last_decision
+            if current_price and decision and decision['action'] != HOLD:
                 self.last_signal = {
-                    'type': 'BUY',  # 또는 'SELL'
+                    'type': decision['action'],
                     'price': current_price['trade_price'],
-                    'reason': 'RSI 과매도 구간'
+                    'confidence': decision['confidence'],
+                    'reason': decision['reason']
                 }
+            else:
+                self.last_signal = None
             return True
         except Exception as e:
             self.trading_status = f"신호 확인 실패: {str(e)}"
@@ -188,7 +374,8 @@ class UpbitTrader:
                 details.append(f"매도 목표가: {self.last_analysis['target_sell']:,.0f}원")
                 
                 details.append(f"\n시장 분석:")
-                details.append(f"RSI: {self.last_analysis['rsi']}")
+                rsi = self.last_analysis['rsi']
+                details.append(f"RSI: {rsi if rsi is not None else '-'}")
                 details.append(f"MACD: {self.last_analysis['macd']}")
                 details.append(f"거래량 추세: {self.last_analysis['volume']}")
                 details.append(f"가격 추세: {self.last_analysis['trend']}")
@@ -7,7 +7,8 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                            QGridLayout, QDialog, QComboBox)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
-from .config import STRATEGIES
+from .config import STRATEGIES, TRADE_COINS
+from .rate_limiter import PRIORITY_UI
 
 class StrategyInfoDialog(QDialog):
     def __init__(self, strategy_key, parent=None):
@@ -330,24 +331,24 @@ class StrategyInfoDialog(QDialog):
             변동성 돌파(Volatility Breakout) 전략
             
             1. 개요
-            - 전일 변동성을 기준으로 매수/매도 포인트 설정
-            - 변동성 증가 구간을 활용
+            - 볼린저 밴드 이탈을 변동성 확대 신호로 사용
+            - 거래량 급증으로 돌파를 확인
             
             2. 매매 신호
-            - 매수 신호: 당일 고가가 기준가격 상향돌파
-            - 매도 신호: 당일 저가가 기준가격 하향돌파
+            - 매수 신호: 종가가 상단 밴드 상향돌파 + 거래량 급증
+            - 매도 신호: 종가가 하단 밴드 하향돌파 + 거래량 급증
             
             3. 장점
             - 변동성에 따른 탄력적 대응
-            - 추세 초기 진입 가능
+            - 거래량 확인으로 거짓 돌파 감소
             
             4. 단점
             - 변동성 급변 시 리스크 증가
             - 거래 비용 증가 가능
             
             5. 파라미터
-            - 변동성 계수: 0.5
-            - ATR 기간: 14일
+            - 볼린저 기간: 20, 표준편차: 2
+            - 거래량 배수: 직전 20봉 평균의 1.5배
             """,
             
             'MultiMA': """
@@ -574,10 +575,7 @@ class UpbitTradingUI(QMainWindow):
         
         # 코인 선택 콤보박스
         self.coin_combo = QComboBox()
-        self.coin_combo.addItems([
-            'KRW-BTC', 'KRW-ETH', 'KRW-XRP', 'KRW-DOGE', 'KRW-ADA',
-            'KRW-MATIC', 'KRW-SOL', 'KRW-DOT', 'KRW-AVAX'
-        ])
+        self.coin_combo.addItems(TRADE_COINS)
         self.coin_combo.currentTextChanged.connect(self.on_coin_changed)
         trade_layout.addWidget(QLabel('거래 코인:'), 0, 0)
         trade_layout.addWidget(self.coin_combo, 0, 1)
@@ -724,8 +722,13 @@ class UpbitTradingUI(QMainWindow):
     def update_trading_status(self):
         """거래 상태 업데이트"""
         try:
-            # 기본 상태 업데이트
-            self.update_status()
+            # 화면 갱신용 요청은 주문/시세 요청보다 낮은 우선순위로 처리
+            with self.trader.request_priority(PRIORITY_UI):
+                # 감시 중인 전체 마켓 시세를 한 번에 갱신
+                self.trader.refresh_quotes()
+
+                # 기본 상태 업데이트
+                self.update_status()
             
             # 자동매매 중일 때만 추가 업데이트
             if self.trader.running:
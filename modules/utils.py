@@ -1,4 +1,6 @@
 import pandas as pd
+import numpy as np
+import math
 import datetime
 import logging
 from config.config import *
@@ -32,4 +34,60 @@ def calculate_profit(buy_price, current_price):
 
 def format_currency(amount):
     """금액 포맷팅"""
-    return format(int(amount), ',') + '원' 
\ No newline at end of file
+    return format(int(amount), ',') + '원' 
+
+# 원화 마켓 호가 단위 (가격 하한, 호가 단위)
+KRW_TICK_TABLE = [
+    (2000000, 1000),
+    (1000000, 500),
+    (500000, 100),
+    (100000, 50),
+    (10000, 10),
+    (1000, 1),
+    (100, 0.1),
+    (10, 0.01),
+    (1, 0.001),
+    (0.1, 0.0001),
+    (0.01, 0.00001),
+    (0.001, 0.000001),
+    (0.0001, 0.0000001),
+    (0, 0.00000001)
+]
+
+def get_tick_size(price):
+    """원화 마켓 가격대별 호가 단위"""
+    for lower, tick in KRW_TICK_TABLE:
+        if price >= lower:
+            return tick
+    return KRW_TICK_TABLE[-1][1]
+
+def round_to_tick(price, method='floor'):
+    """가격을 호가 단위에 맞춤 (method: floor/round/ceil)"""
+    tick = get_tick_size(price)
+    units = price / tick
+    if method == 'floor':
+        units = math.floor(units + 1e-9)
+    elif method == 'ceil':
+        units = math.ceil(units - 1e-9)
+    else:
+        units = round(units)
+    # 소수 호가 단위의 부동소수점 오차 정리
+    return round(units * tick, 8)
+
+# 가격 하한 오름차순 (배열 호가 계산용)
+_TICK_LOWERS = np.array([lower for lower, _ in reversed(KRW_TICK_TABLE)], dtype=float)
+_TICK_SIZES = np.array([tick for _, tick in reversed(KRW_TICK_TABLE)], dtype=float)
+
+def round_to_ticks(prices, method='floor'):
+    """가격 배열을 호가 단위에 맞춤 (round_to_tick의 배열판)"""
+    prices = np.asarray(prices, dtype=float)
+    index = np.searchsorted(_TICK_LOWERS, prices, side='right') - 1
+    tick = _TICK_SIZES[np.clip(index, 0, None)]
+    units = prices / tick
+    if method == 'floor':
+        units = np.floor(units + 1e-9)
+    elif method == 'ceil':
+        units = np.ceil(units - 1e-9)
+    else:
+        units = np.rint(units)
+    return np.round(units * tick, 8)
@@ -0,0 +1,332 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .config import COIN_GROUPS, DEFAULT_FEE
+from .candles import now_kst
+from .candle_db import CandleDatabase, from_timestamps
+from .registry import strategy_registry
+from .backtest import signal_series, simulate, summarize
+from .optimizer import (SharedCandles, SWEEP_COLUMNS, RESULT_COLUMNS, aggregate_stats, load_candles,
+                        parameter_grid, random_space, parse_space)
+
+# 워크포워드 분석
+#
+# 전체 기간을 (학습, 검증) 구간 쌍으로 나눠, 학습 구간에서 고른 최적 파라미터를
+# 바로 다음 검증 구간에 적용한다. 검증 구간 자산 곡선을 이어 붙인 것이
+# 표본 외 성과이고, 구간마다 고른 파라미터가 얼마나 흔들리는지도 함께 본다.
+#
+# 전략 신호는 과거 봉만 쓰므로 파라미터 조합마다 전체 구간 신호를 한 번만
+# 계산하고, 구간별로는 그 신호를 잘라 거래만 다시 시뮬레이션한다. 따라서
+# 구간 시작부터 지표가 이미 계산된 상태이다.
+
+# 구간 계산에 쓰는 캔들 컬럼 (ts는 캔들 DB와 같은 KST epoch 초)
+FOLD_COLUMNS = ('ts',) + SWEEP_COLUMNS
+# 이보다 봉이 적은 마켓의 학습/검증 구간은 건너뛴다
+MIN_FOLD_BARS = 100
+SECONDS_PER_DAY = 86400
+
+logger = logging.getLogger(__name__)
+
+
+def make_folds(start, end, train, test, anchored=False):
+    """[start, end) 시각 구간을 (학습 시작, 학습 끝, 검증 시작, 검증 끝) 목록으로 나눔 (초 단위)
+
+    검증 구간은 test씩 겹치지 않게 이어지고, 학습 구간은 그 직전 train 길이이다.
+    anchored=True면 학습 구간이 항상 start에서 시작해 점점 길어진다.
+    """
+    folds = []
+    test_start = start + train
+    while test_start < end:
+        train_start = start if anchored else test_start - train
+        folds.append((train_start, test_start, test_start, min(test_start + test, end)))
+        test_start += test
+    return folds
+
+
+def fold_bounds(data, folds):
+    """마켓별로 각 구간의 (학습 시작, 학습 끝, 검증 시작, 검증 끝) 봉 위치"""
+    bounds = {}
+    for market, arrays in data.items():
+        positions = np.searchsorted(arrays['ts'], np.asarray(folds, dtype=np.int64).reshape(-1))
+        bounds[market] = [tuple(int(i) for i in row) for row in positions.reshape(-1, 4)]
+    return bounds
+
+
+def _slice(arrays, lo, hi):
+    return {column: values[lo:hi] for column, values in arrays.items()}
+
+
+def stitch(pieces):
+    """검증 구간 자산 곡선 [(ts, 자산)]을 앞 구간 마지막 자산에 이어 붙인 Series"""
+    level = 1.0
+    values = []
+    for _, equity in pieces:
+        values.append(equity * level)
+        level *= equity[-1]
+    ts = np.concatenate([np.asarray(ts, dtype=np.int64) for ts, _ in pieces])
+    return pd.Series(np.concatenate(values), index=from_timestamps(ts))
+
+
+def parameter_stability(best, names):
+    """구간별 최적 파라미터가 얼마나 흔들리는지 파라미터별로 정리한 DataFrame
+
+    cv는 표준편차/|평균|, changes는 직전 구간과 값이 달라진 횟수,
+    mode_share는 가장 많이 뽑힌 값이 차지하는 구간 비율이다.
+    """
+    rows = []
+    for name in names:
+        values = best[name].astype(float)
+        mean = values.mean()
+        std = values.std(ddof=0)
+        rows.append({
+            'param': name,
+            'mean': mean,
+            'std': std,
+            'min': values.min(),
+            'max': values.max(),
+            'cv': std / abs(mean) if mean else np.nan,
+            'changes': int((values.diff().fillna(0) != 0).sum()),
+            'mode_share': float(values.value_counts().iloc[0] / len(values)) if len(values) else np.nan
+        })
+    return pd.DataFrame(rows, columns=['param', 'mean', 'std', 'min', 'max', 'cv', 'changes', 'mode_share'])
+
+
+# 워커 프로세스별 공유 캔들과 실행 설정 (초기화 함수에서 한 번 붙는다)
+_worker = {}
+
+
+def _init_worker(meta, options):
+    shm, data = SharedCandles.attach(meta)
+    _worker.update(shm=shm, data=data, options=options)
+
+
+def _in_sample(params):
+    """파라미터 조합 하나의 모든 구간 학습 성과 (신호는 마켓별로 한 번만 계산)"""
+    options = _worker['options']
+    folds = [[] for _ in range(options['folds'])]
+    try:
+        for market, arrays in _worker['data'].items():
+            buy, sell = signal_series(strategy_registry.create(options['key'], params), arrays)
+            for fold, (lo, hi, _, _) in enumerate(options['bounds'][market]):
+                if hi - lo < MIN_FOLD_BARS:
+                    continue
+                trades, equity = simulate(_slice(arrays, lo, hi), buy[lo:hi], sell[lo:hi], options['fee'],
+                                          options['stop_loss'], options['take_profit'])
+                folds[fold].append(summarize(trades, equity, arrays['ts'][lo:hi]))
+    except Exception as e:
+        logger.error(f"학습 구간 백테스트 실패 ({options['key']} {params}): {str(e)}")
+        return [dict(params, error=str(e))]
+    return [dict(params, fold=fold, **aggregate_stats(stats)) for fold, stats in enumerate(folds) if stats]
+
+
+def _out_of_sample(task):
+    """한 구간의 최적 파라미터로 검증 구간을 백테스트해 (성과, {마켓: (ts, 자산)}) 반환"""
+    fold, params = task
+    options = _worker['options']
+    stats = []
+    curves = {}
+    try:
+        for market, arrays in _worker['data'].items():
+            _, _, lo, hi = options['bounds'][market][fold]
+            if hi - lo < MIN_FOLD_BARS:
+                continue
+            # 검증 구간 끝까지의 신호만 있으면 된다
+            buy, sell = signal_series(strategy_registry.create(options['key'], params), _slice(arrays, 0, hi))
+            trades, equity = simulate(_slice(arrays, lo, hi), buy[lo:], sell[lo:], options['fee'],
+                                      options['stop_loss'], options['take_profit'])
+            stats.append(summarize(trades, equity, arrays['ts'][lo:hi]))
+            curves[market] = (np.array(arrays['ts'][lo:hi]), equity)
+    except Exception as e:
+        logger.error(f"검증 구간 백테스트 실패 ({fold}번 구간 {params}): {str(e)}")
+        return fold, {'error': str(e)}, {}
+    return fold, (aggregate_stats(stats) if stats else {}), curves
+
+
+def _best_per_fold(in_sample, objective):
+    """구간별 학습 성과 1위 행 (동점이면 먼저 나온 조합)"""
+    ranked = in_sample.dropna(subset=['fold']).sort_values(['fold', objective], ascending=[True, False],
+                                                            kind='stable')
+    return ranked.groupby('fold', sort=True).head(1).set_index('fold')
+
+
+def _run_folds(executor_map, tasks, objective):
+    """학습 구간 탐색(조합 단위) 후 구간별 1위 조합으로 검증(구간 단위)"""
+    in_sample = pd.DataFrame([row for rows in executor_map(_in_sample, tasks) for row in rows])
+    if 'fold' not in in_sample:
+        raise ValueError("학습 구간 백테스트 결과가 없습니다.")
+    best = _best_per_fold(in_sample, objective)
+    # 결과 표를 거치며 실수가 된 값을 스키마 타입으로 되돌린다
+    types = {name: type(value) for name, value in tasks[0].items()}
+    best_params = {int(fold): {name: cast(row[name]) for name, cast in types.items()}
+                   for fold, row in best.iterrows()}
+    results = list(executor_map(_out_of_sample, list(best_params.items())))
+    return in_sample, best, best_params, results
+
+
+def walk_forward(key, candidates, data, train_days, test_days, anchored=False, workers=None,
+                 objective='mean_return', fee=DEFAULT_FEE, stop_loss=None, take_profit=None):
+    """워크포워드 분석 결과 dict 반환
+
+    data는 {마켓: {컬럼: 1차원 배열}}(ts 포함)이다. 학습 구간 탐색은 파라미터 조합
+    단위로, 검증은 구간 단위로 공유 메모리 캔들을 쓰는 프로세스 풀에서 나눠
+    실행한다 (workers가 1이면 현재 프로세스). 반환값은
+    {'folds': 구간별 최적 파라미터와 학습/검증 성과, 'in_sample': 조합 x 구간 학습 성과,
+     'equity': 마켓별 이어 붙인 검증 자산 곡선(+ 'portfolio' 균등 배분),
+     'stability': 파라미터 안정성}이다.
+    """
+    if objective not in RESULT_COLUMNS:
+        raise ValueError(f"알 수 없는 정렬 기준: {objective}")
+    tasks = []
+    for params in candidates:
+        try:
+            tasks.append(strategy_registry.resolve_params(key, params))
+        except ValueError as e:
+            logger.warning(f"건너뛴 파라미터 조합 {params}: {str(e)}")
+    if not tasks:
+        raise ValueError("탐색할 파라미터 조합이 없습니다.")
+    data = {market: arrays for market, arrays in data.items() if len(arrays['close'])}
+    if not data:
+        raise ValueError("분석할 캔들이 없습니다.")
+    start = min(int(arrays['ts'][0]) for arrays in data.values())
+    end = max(int(arrays['ts'][-1]) for arrays in data.values()) + 1
+    folds = make_folds(start, end, int(train_days * SECONDS_PER_DAY), int(test_days * SECONDS_PER_DAY), anchored)
+    if not folds:
+        raise ValueError("학습 구간보다 데이터 기간이 짧습니다.")
+    options = {'key': key, 'folds': len(folds), 'bounds': fold_bounds(data, folds),
+               'fee': fee, 'stop_loss': stop_loss, 'take_profit': take_profit}
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"{key} {len(folds)}개 구간, 파라미터 {len(tasks)}개 조합 x {len(data)}개 마켓")
+
+    if workers == 1:
+        _worker.update(data=data, options=options)
+        try:
+            in_sample, best, best_params, results = _run_folds(map, tasks, objective)
+        finally:
+            _worker.clear()
+    else:
+        with SharedCandles(data, FOLD_COLUMNS) as shared:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.meta, options)) as executor:
+                chunksize = max(1, len(tasks) // (workers * 8))
+                in_sample, best, best_params, results = _run_folds(
+                    lambda fn, items: executor.map(fn, items, chunksize=chunksize if fn is _in_sample else 1),
+                    tasks, objective)
+
+    names = list(tasks[0])
+    rows = []
+    pieces = {}
+    for fold, stats, curves in results:
+        train_start, train_end, test_start, test_end = folds[fold]
+        row = best.loc[fold]
+        record = {'fold': fold,
+                  'train_start': from_timestamps([train_start])[0], 'train_end': from_timestamps([train_end])[0],
+                  'test_start': from_timestamps([test_start])[0], 'test_end': from_timestamps([test_end])[0]}
+        record.update(best_params[fold])
+        record.update({f"is_{column}": row[column] for column in RESULT_COLUMNS})
+        record.update({f"oos_{column}": value for column, value in stats.items()})
+        # 기간 길이를 맞춘 검증/학습 수익률 비 (워크포워드 효율)
+        is_rate = row['mean_return'] / (train_end - train_start)
+        oos_rate = stats.get('mean_return', np.nan) / (test_end - test_start)
+        record['efficiency'] = oos_rate / is_rate if is_rate > 0 else np.nan
+        rows.append(record)
+        for market, piece in curves.items():
+            pieces.setdefault(market, []).append(piece)
+
+    equity = pd.DataFrame({market: stitch(market_pieces) for market, market_pieces in pieces.items()})
+    if not equity.empty:
+        # 검증을 늦게 시작한 마켓은 그 전까지 현금(1.0)으로 본다
+        equity = equity.ffill().fillna(1.0)
+        equity['portfolio'] = equity.mean(axis=1)
+    searched = [name for name in names if len({params[name] for params in tasks}) > 1] or names
+    return {
+        'folds': pd.DataFrame(rows),
+        'in_sample': in_sample,
+        'equity': equity,
+        'stability': parameter_stability(best, searched)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='전략 워크포워드 분석 (학습 구간 탐색 + 검증 구간 적용)')
+    parser.add_argument('--strategy', required=True, help='STRATEGIES 키 (예: RSI)')
+    parser.add_argument('--param', action='append', default=[],
+                        help="탐색할 파라미터: name=v1,v2 (후보), name=low:high:step (격자), "
+                             "name=low:high (무작위 탐색 범위), 여러 번 지정 가능")
+    parser.add_argument('--random', type=int, default=0, help='무작위 탐색 조합 수 (0이면 격자 탐색)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--markets', default='all',
+                        help="쉼표로 구분한 마켓 목록 또는 all (COIN_GROUPS 전체)")
+    parser.add_argument('--interval', default='minute5')
+    parser.add_argument('--days', type=float, default=None, help='최근 며칠 구간 (기본: 전체)')
+    parser.add_argument('--db', default=None, help='캔들 DB 경로 (기본: CANDLE_SETTINGS)')
+    parser.add_argument('--train-days', type=float, default=90, help='학습 구간 길이 (일)')
+    parser.add_argument('--test-days', type=float, default=30, help='검증 구간 길이 (일)')
+    parser.add_argument('--anchored', action='store_true', help='학습 구간 시작을 처음으로 고정')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE)
+    parser.add_argument('--stop-loss', type=float, default=None, help='손절 비율 %% (0이면 사용 안 함)')
+    parser.add_argument('--take-profit', type=float, default=None, help='익절 비율 %% (0이면 사용 안 함)')
+    parser.add_argument('--objective', default='mean_return', choices=RESULT_COLUMNS)
+    parser.add_argument('--out', default=None,
+                        help='결과 CSV 경로 접두어 (기본: walk_forward_<전략>) - _folds/_equity/_stability.csv')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    if args.markets == 'all':
+        markets = list(dict.fromkeys(m for group in COIN_GROUPS.values() for m in group))
+    else:
+        markets = [m.strip() for m in args.markets.split(',') if m.strip()]
+
+    schema = strategy_registry.schema(args.strategy)
+    space = parse_space(args.param, schema)
+    if args.random:
+        candidates = random_space(space, args.random, args.seed, schema)
+    else:
+        ranges = [name for name, values in space.items() if isinstance(values, tuple)]
+        if ranges:
+            parser.error(f"격자 탐색에는 범위 대신 후보 목록이나 step이 필요합니다: {', '.join(ranges)}")
+        candidates = parameter_grid(space)
+
+    db = CandleDatabase(args.db)
+    start = now_kst() - timedelta(days=args.days) if args.days else None
+    data = load_candles(db, markets, args.interval, start, columns=FOLD_COLUMNS)
+    db.close()
+    if not data:
+        logger.error("분석할 캔들이 없습니다.")
+        return 1
+
+    started = time.time()
+    try:
+        result = walk_forward(args.strategy, candidates, data, args.train_days, args.test_days, args.anchored,
+                              args.workers, args.objective, args.fee, args.stop_loss, args.take_profit)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    logger.info(f"워크포워드 분석 완료: {time.time() - started:.1f}초")
+
+    out = args.out or f"walk_forward_{args.strategy}"
+    result['folds'].to_csv(f"{out}_folds.csv", index=False)
+    result['equity'].to_csv(f"{out}_equity.csv")
+    result['stability'].to_csv(f"{out}_stability.csv", index=False)
+    logger.info(f"결과 저장: {out}_folds.csv, {out}_equity.csv, {out}_stability.csv")
+
+    folds = result['folds']
+    columns = ['fold', 'test_start'] + [c for c in folds.columns if c in result['stability']['param'].tolist()]
+    columns += [c for c in ('is_' + args.objective, 'oos_mean_return', 'efficiency') if c in folds]
+    print(folds[columns].to_string(index=False))
+    print(result['stability'].to_string(index=False))
+    if not result['equity'].empty:
+        print(f"검증 구간 누적 수익률 (균등 배분): {result['equity']['portfolio'].iloc[-1] - 1.0:.4f}")
+    return 0 if 'oos_error' not in folds else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
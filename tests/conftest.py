@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.candle_db import from_timestamps
+
+CANDLE_START = 1735657200  # 2025-01-01 00:00 (KST epoch 초)
+CANDLE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def random_walk_candles(n, seed=0, price=10000.0, volatility=0.01, spread=0.02, step=300,
+                        start=CANDLE_START, frame=False, market=None):
+    """시드가 같으면 항상 같은 랜덤워크 캔들 (ts/open/high/low/close/volume 배열 dict)
+
+    종가는 표준편차 volatility인 로그 수익률로 움직이고, 시가는 직전 종가다.
+    고가/저가는 시가와 종가 바깥으로 최대 spread 비율만큼 벌어진다.
+    volatility=0, spread=0이면 모든 가격이 price인 평평한 캔들이 된다.
+    frame=True면 ts를 시각 인덱스로 쓰는 DataFrame(attrs['market']=market)을 돌려준다.
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, volatility, n)))
+    open_ = np.concatenate([close[:1], close[:-1]])
+    arrays = {
+        'ts': start + step * np.arange(n, dtype=np.int64),
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + rng.uniform(0, spread, n)),
+        'low': np.minimum(open_, close) * (1 - rng.uniform(0, spread, n)),
+        'close': close,
+        'volume': rng.lognormal(0, 0.8, n)
+    }
+    if not frame:
+        return arrays
+    df = pd.DataFrame({column: arrays[column] for column in CANDLE_COLUMNS}, index=from_timestamps(arrays['ts']))
+    df.attrs['market'] = market
+    return df
+
+
+@pytest.fixture
+def make_candles():
+    """테스트 모듈이 함께 쓰는 캔들 생성 함수 (random_walk_candles)"""
+    return random_walk_candles
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+from modules import accounts as accounts_module
+from modules.accounts import AccountBook, AccountSnapshot
+from modules.exchange_client import UpbitClient
+from modules.sim_exchange import SimExchangeServer
+from modules.trader import UpbitTrader
+
+START = 1735657200  # 모의 거래소 시계 (UTC epoch 초)
+KRW = 1000000.0
+ACCESS_KEY = 'sim-access-key'
+SECRET_KEY = 'sim-secret-key-for-hs256-signing-0000'
+ACCOUNTS = 'GET /v1/accounts'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(accounts_module, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def server():
+    with SimExchangeServer(clock=lambda: START, krw=KRW, access_key=ACCESS_KEY, secret_key=SECRET_KEY) as server:
+        yield server
+
+
+@pytest.fixture
+def trader(server):
+    trader = UpbitTrader()
+    trader.client.base_url = server.base_url
+    assert trader.set_api_keys(ACCESS_KEY, SECRET_KEY)
+    yield trader
+    trader.client.close()
+
+
+def test_snapshot_fields():
+    snapshot = AccountSnapshot([
+        {'currency': 'KRW', 'balance': '1000.5', 'locked': '10', 'avg_buy_price': '0'},
+        {'currency': 'BTC', 'balance': '0.5', 'locked': '0.25', 'avg_buy_price': '90000000'},
+    ], fetched_at=0.0)
+    assert snapshot.balance('KRW') == 1000.5
+    assert snapshot.total('KRW-BTC') == snapshot.total('BTC') == 0.75
+    assert snapshot.avg_buy_price('KRW-BTC') == 90000000.0
+    assert snapshot.balance('KRW-ETH') == 0.0
+    assert snapshot.currencies() == ['KRW', 'BTC']
+
+
+def test_snapshot_is_reused_within_ttl(server, clock):
+    client = UpbitClient(ACCESS_KEY, SECRET_KEY, base_url=server.base_url)
+    book = AccountBook(client, ttl=1.0)
+    first = book.get()
+    clock.now += 0.5
+    assert book.get() is first
+    assert first.balance('KRW') == KRW
+    assert server.endpoint_counts[ACCOUNTS] == 1
+
+    clock.now += 0.6
+    assert book.get() is not first
+    assert server.endpoint_counts[ACCOUNTS] == 2
+    book.get(force=True)
+    assert server.endpoint_counts[ACCOUNTS] == 3
+    client.close()
+
+
+def test_orders_invalidate_snapshot(server, trader, clock):
+    assert trader.get_balance('KRW-BTC')['krw'] == KRW
+    assert trader.get_balance('KRW-BTC')['coin_amount'] == 0.0
+    assert server.endpoint_counts[ACCOUNTS] == 1
+
+    # 주문 직후에는 TTL 안이어도 계좌를 다시 받아 체결된 잔고를 보여 준다
+    order = trader.buy_market_order('KRW-BTC', 100000)
+    assert order is not None
+    balance = trader.get_balance('KRW-BTC')
+    assert server.endpoint_counts[ACCOUNTS] == 2
+    assert balance['krw'] < KRW - 100000
+    assert balance['coin_amount'] == pytest.approx(float(trader.get_order(order['uuid'])['executed_volume']))
+
+    price = server.broker.price('KRW-BTC')
+    order = trader.buy_limit_order('KRW-BTC', round(price * 0.5), 1.0)
+    assert trader.get_balance('KRW-BTC')['krw_locked'] > 0
+    assert trader.cancel_order(order['uuid'])['state'] == 'cancel'
+    assert trader.get_balance('KRW-BTC')['krw_locked'] == 0.0
+    assert server.endpoint_counts[ACCOUNTS] == 4
+
+
+def test_account_snapshot_requires_keys():
+    assert UpbitTrader().get_account_snapshot() is None
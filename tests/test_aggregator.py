@@ -0,0 +1,77 @@
+import pytest
+
+from modules.aggregator import CandleAggregator
+from modules.sim_exchange import SimBroker, SyntheticCandles
+
+START = 1704067200  # 2024-01-01 00:00 (UTC epoch 초)
+
+
+def rest_tick(ts, price, volume, market='KRW-BTC'):
+    """/v1/trades/ticks 응답 항목 (trade_timestamp, code 없음)"""
+    return {
+        'market': market, 'trade_date_utc': '2024-01-01', 'trade_time_utc': '00:00:00',
+        'timestamp': int(ts * 1000), 'trade_price': price, 'trade_volume': volume,
+        'prev_closing_price': 100.0, 'change_price': 0.0, 'ask_bid': 'BID', 'sequential_id': int(ts * 1000)
+    }
+
+
+def ws_trade(ts, price, volume, market='KRW-BTC'):
+    """WebSocket trade 메시지"""
+    return {'type': 'trade', 'code': market, 'trade_timestamp': int(ts * 1000), 'timestamp': int(ts * 1000) + 5,
+            'trade_price': price, 'trade_volume': volume, 'ask_bid': 'ASK', 'stream_type': 'REALTIME'}
+
+
+def test_rest_ticks_build_candles():
+    aggregator = CandleAggregator(intervals=(1,), history=10)
+    closed = []
+    aggregator.subscribe(lambda market, interval, candle: closed.append((market, interval, candle)))
+    for ts, price, volume in [(START + 1, 100.0, 1.0), (START + 20, 105.0, 2.0),
+                              (START + 59, 98.0, 1.0), (START + 61, 101.0, 0.5)]:
+        aggregator.on_trade(rest_tick(ts, price, volume))
+
+    assert len(closed) == 1
+    market, interval, candle = closed[0]
+    assert (market, interval) == ('KRW-BTC', 'minute1')
+    assert candle == {'start': START, 'open': 100.0, 'high': 105.0, 'low': 98.0, 'close': 98.0,
+                      'volume': 4.0, 'value': pytest.approx(100.0 + 210.0 + 98.0)}
+    assert aggregator.get_current('KRW-BTC', 'minute1')['open'] == 101.0
+
+
+def test_ws_and_rest_messages_agree():
+    trades = [(START + i * 7, 100.0 + i, 0.1 * (i + 1)) for i in range(30)]
+    from_rest = CandleAggregator(intervals=(1, 3), history=10)
+    from_ws = CandleAggregator(intervals=(1, 3), history=10)
+    for ts, price, volume in trades:
+        from_rest.on_trade(rest_tick(ts, price, volume))
+        from_ws.on_trade(ws_trade(ts, price, volume))
+    for interval in ('minute1', 'minute3'):
+        assert from_rest.to_frame('KRW-BTC', interval).equals(from_ws.to_frame('KRW-BTC', interval))
+
+
+def test_sim_broker_trades_feed_aggregator():
+    # 모의 거래소의 REST 체결 목록도 실제 응답처럼 timestamp만 가진다
+    broker = SimBroker(SyntheticCandles(seed=1), clock=lambda: START + 179)
+    ticks = broker.trades('KRW-BTC', 180)
+    assert all('trade_timestamp' not in tick for tick in ticks)
+
+    aggregator = CandleAggregator(intervals=(1,), history=10)
+    for tick in reversed(ticks):
+        aggregator.on_trade(tick)
+    aggregator.close_due(now=START + 180)
+
+    closed = aggregator.get_closed('KRW-BTC', 'minute1')
+    assert [c['start'] for c in closed] == [START, START + 60, START + 120]
+    first = [t for t in ticks if t['timestamp'] < (START + 60) * 1000]
+    assert closed[0]['close'] == first[0]['trade_price']
+    assert closed[0]['high'] == max(t['trade_price'] for t in first)
+    assert closed[0]['volume'] == pytest.approx(sum(t['trade_volume'] for t in first))
+
+
+def test_late_trade_is_dropped():
+    aggregator = CandleAggregator(intervals=(1,), history=10)
+    aggregator.on_trade(rest_tick(START + 10, 100.0, 1.0))
+    aggregator.on_trade(rest_tick(START + 70, 101.0, 1.0))
+    aggregator.on_trade(rest_tick(START + 30, 99.0, 1.0))
+
+    assert aggregator.late_trades == 1
+    assert aggregator.get_closed('KRW-BTC', 'minute1')[0]['low'] == 100.0
@@ -0,0 +1,89 @@
+import time
+import asyncio
+
+import pytest
+
+from modules.async_trader import AsyncUpbitTrader
+from modules.sim_exchange import SimExchangeServer
+
+START = 1735657200  # 모의 거래소 시계 (UTC epoch 초)
+KRW = 1000000.0
+LATENCY = 0.2
+ACCESS_KEY = 'sim-access-key'
+SECRET_KEY = 'sim-secret-key-for-hs256-signing-0000'
+MARKETS = ['KRW-BTC', 'KRW-ETH', 'KRW-XRP', 'KRW-SOL', 'KRW-ADA', 'KRW-DOGE']
+
+
+@pytest.fixture
+def server():
+    with SimExchangeServer(clock=lambda: START, krw=KRW, latency=LATENCY,
+                           access_key=ACCESS_KEY, secret_key=SECRET_KEY) as server:
+        yield server
+
+
+def run(server, scenario):
+    """모의 거래소에 붙인 AsyncUpbitTrader로 시나리오 코루틴 실행"""
+    async def main():
+        async with AsyncUpbitTrader() as trader:
+            trader.trader.client.base_url = server.base_url
+            assert trader.set_api_keys(ACCESS_KEY, SECRET_KEY)
+            try:
+                return await scenario(trader)
+            finally:
+                trader.trader.client.close()
+
+    return asyncio.run(main())
+
+
+def test_candles_are_fetched_concurrently(server):
+    async def scenario(trader):
+        started = time.perf_counter()
+        frames = await trader.get_candles_many(MARKETS, 'minute5', 50)
+        return frames, time.perf_counter() - started
+
+    frames, elapsed = run(server, scenario)
+    assert list(frames) == MARKETS
+    assert all(len(frame) == 50 for frame in frames.values())
+    assert server.endpoint_counts['GET /v1/candles/minutes/5'] == len(MARKETS)
+    # 응답 지연이 겹치므로 마켓 수만큼 기다리지 않는다
+    assert elapsed < LATENCY * len(MARKETS) / 2
+
+
+def test_prices_and_balances_use_batched_requests(server):
+    async def scenario(trader):
+        prices = await trader.get_current_prices(MARKETS)
+        balances = await trader.get_balances(MARKETS[:3])
+        return prices, balances
+
+    prices, balances = run(server, scenario)
+    assert list(prices) == MARKETS
+    assert prices['KRW-BTC']['trade_price'] == server.broker.price('KRW-BTC')
+    assert all(balance['krw'] == KRW for balance in balances.values())
+    # 시세는 마켓 수와 관계없이 /v1/ticker 일괄 조회, 계좌는 스냅샷 하나를 함께 쓴다
+    assert server.endpoint_counts['GET /v1/ticker'] == 2
+    assert server.endpoint_counts['GET /v1/accounts'] == 1
+
+
+def test_concurrent_order_queries(server):
+    price = server.broker.price('KRW-BTC')
+
+    async def scenario(trader):
+        placed = await asyncio.gather(*(trader.buy_limit_order('KRW-BTC', round(price * (0.5 + 0.01 * i)), 1.0)
+                                        for i in range(4)))
+        uuids = [order['uuid'] for order in placed]
+        started = time.perf_counter()
+        waiting = await trader.get_orders(uuids)
+        elapsed = time.perf_counter() - started
+        await asyncio.gather(*(trader.cancel_order(order_uuid) for order_uuid in uuids))
+        cancelled = await trader.wait_order(uuids[0], timeout=1.0, poll_interval=0.05)
+        bought = await trader.buy_market_order('KRW-BTC', 50000)
+        done = await trader.wait_order(bought['uuid'], timeout=1.0, poll_interval=0.05)
+        return uuids, waiting, elapsed, cancelled, done
+
+    uuids, waiting, elapsed, cancelled, done = run(server, scenario)
+    assert [order['uuid'] for order in waiting] == uuids
+    assert all(order['state'] == 'wait' for order in waiting)
+    assert elapsed < LATENCY * len(uuids) / 2
+    assert cancelled['state'] == 'cancel'
+    assert done['state'] == 'done'
+    assert server.broker.list_orders('KRW-BTC') == []
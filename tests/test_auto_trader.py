@@ -0,0 +1,99 @@
+import pytest
+
+from modules.auto_trader import AutoTrader, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT
+from modules.strategies import make_decision, BUY, SELL, HOLD
+
+
+class FixedStrategy:
+    """update()마다 정해 둔 판단을 돌려주는 전략"""
+    def __init__(self, action=HOLD):
+        self.action = action
+
+    def evaluate(self, data):
+        return make_decision(self.action)
+
+
+class FakeTrader:
+    """잔고를 고정해 두고 주문만 기록하는 트레이더"""
+    def __init__(self, krw=1000000.0, coin_amount=0.0, avg_buy_price=0.0, price=10000.0, locked=0.0):
+        self.coin = 'KRW-BTC'
+        self.orders = []
+        self.balance = {
+            'krw': krw, 'krw_locked': 0.0, 'coin_amount': coin_amount, 'coin_locked': locked,
+            'avg_buy_price': avg_buy_price, 'coin_value': coin_amount * price
+        }
+
+    def get_balance(self, coin=None):
+        return dict(self.balance)
+
+    def buy_market_order(self, coin, amount):
+        self.orders.append(('buy', coin, amount))
+        return {'uuid': 'buy'}
+
+    def sell_market_order(self, coin, volume):
+        self.orders.append(('sell', coin, volume))
+        return {'uuid': 'sell'}
+
+
+def run(trader, action, **settings):
+    auto_trader = AutoTrader(trader, FixedStrategy(action), dict({'amount': 100000, 'fee': 0.0005}, **settings))
+    auto_trader.start()
+    auto_trader.update(None)
+    return trader.orders
+
+
+def test_does_nothing_until_started():
+    trader = FakeTrader()
+    AutoTrader(trader, FixedStrategy(BUY), {}).update(None)
+    assert trader.orders == []
+
+
+def test_buy_signal_places_configured_amount():
+    assert run(FakeTrader(), BUY) == [('buy', 'KRW-BTC', 100000)]
+
+
+def test_buy_is_capped_by_krw_after_fee():
+    assert run(FakeTrader(krw=50000), BUY) == [('buy', 'KRW-BTC', 49975)]
+
+
+def test_buy_skipped_when_below_minimum_or_holding():
+    assert run(FakeTrader(krw=3000), BUY) == []
+    assert run(FakeTrader(coin_amount=1.0, avg_buy_price=10000), BUY) == []
+
+
+def test_sell_signal_sells_unlocked_volume():
+    trader = FakeTrader(coin_amount=2.0, avg_buy_price=10000, locked=0.5)
+    assert run(trader, SELL) == [('sell', 'KRW-BTC', 1.5)]
+
+
+def test_sell_skipped_for_dust():
+    assert run(FakeTrader(coin_amount=0.1, avg_buy_price=10000), SELL) == []
+
+
+@pytest.mark.parametrize('avg_buy_price', [10400, 9500])
+def test_stop_loss_and_take_profit_override_buy_signal(avg_buy_price):
+    # 현재가 10000: 평균가 10400이면 -3.8%(손절), 9500이면 +5.3%(익절)
+    trader = FakeTrader(coin_amount=1.0, avg_buy_price=avg_buy_price)
+    assert run(trader, BUY, stop_loss=3.0, take_profit=5.0) == [('sell', 'KRW-BTC', 1.0)]
+
+
+def test_exit_disabled_when_rate_is_none():
+    trader = FakeTrader(coin_amount=1.0, avg_buy_price=10400)
+    assert run(trader, HOLD, stop_loss=None, take_profit=None) == []
+
+
+def test_hold_inside_exit_band():
+    trader = FakeTrader(coin_amount=1.0, avg_buy_price=10100)
+    assert run(trader, HOLD, stop_loss=3.0, take_profit=5.0) == []
+
+
+@pytest.mark.parametrize('avg_buy_price, reason', [(10400, EXIT_STOP_LOSS), (9500, EXIT_TAKE_PROFIT), (10100, None)])
+def test_check_exit_reports_trigger(avg_buy_price, reason):
+    trader = FakeTrader(coin_amount=1.0, avg_buy_price=avg_buy_price)
+    auto_trader = AutoTrader(trader, FixedStrategy(SELL), {'stop_loss': 3.0, 'take_profit': 5.0})
+    assert auto_trader.check_exit(trader.get_balance()) == reason
+    auto_trader.start()
+    auto_trader.update(None)
+    # 전략 매도 신호와 겹쳐도 실제로 닿은 손절/익절을 기록한다
+    assert auto_trader.last_exit == reason
+    assert trader.orders == [('sell', 'KRW-BTC', 1.0)]
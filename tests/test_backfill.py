@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from modules.backfill import Backfiller, KST_OFFSET, kst_to_utc_param
+from modules.candle_db import CandleDatabase
+from modules.exchange_client import UpbitClient
+from modules.rate_limiter import RequestScheduler
+from modules.sim_exchange import SimExchangeServer, SyntheticCandles
+
+STEP = 60
+START = 1704067200  # 2024-01-01 00:00 (KST epoch 초)
+BARS = 1000
+
+
+class FakeCandleClient:
+    """ts 집합에 있는 1분봉만 돌려주는 캔들 API (to 미포함, 최신 봉부터)"""
+    def __init__(self, ts, fail_after=None):
+        self.ts = sorted(ts)
+        self.fail_after = fail_after
+        self.calls = []
+
+    def get_candles(self, market, interval, count, to=None):
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise ConnectionError("연결 끊김")
+        upper = int(datetime.strptime(to, "%Y-%m-%d %H:%M:%S")
+                    .replace(tzinfo=timezone.utc).timestamp()) + KST_OFFSET
+        self.calls.append(upper)
+        page = [t for t in self.ts if t < upper][-count:]
+        return [self.candle(t) for t in reversed(page)]
+
+    @staticmethod
+    def candle(ts):
+        price = 100.0 + (ts - START) / STEP
+        return {
+            'candle_date_time_kst': datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+            'opening_price': price, 'high_price': price + 1, 'low_price': price - 1,
+            'trade_price': price, 'candle_acc_trade_volume': 1.0, 'candle_acc_trade_price': price
+        }
+
+
+@pytest.fixture
+def db():
+    db = CandleDatabase(':memory:')
+    yield db
+    db.close()
+
+
+def all_bars():
+    return [START + i * STEP for i in range(BARS)]
+
+
+def test_to_param_is_utc():
+    assert kst_to_utc_param(START) == "2023-12-31 15:00:00"
+
+
+def test_backfill_fills_range(db):
+    client = FakeCandleClient(all_bars())
+    result = Backfiller(client, db).backfill_market('KRW-BTC', START, START + (BARS - 1) * STEP)
+
+    assert result == {'market': 'KRW-BTC', 'saved': BARS, 'gaps_filled': 0, 'gaps_empty': 0}
+    assert db.count('KRW-BTC', 'minute1') == BARS
+    assert db.get_progress('KRW-BTC', 'minute1')['done'] is True
+
+
+def test_interrupted_backfill_resumes_from_cursor(db):
+    end = START + (BARS - 1) * STEP
+    with pytest.raises(ConnectionError):
+        Backfiller(FakeCandleClient(all_bars(), fail_after=2), db).backfill_market('KRW-BTC', START, end)
+
+    progress = db.get_progress('KRW-BTC', 'minute1')
+    assert progress['done'] is False
+    assert db.count('KRW-BTC', 'minute1') == 400
+    assert progress['cursor_ts'] == db.first_timestamp('KRW-BTC', 'minute1')
+
+    client = FakeCandleClient(all_bars())
+    Backfiller(client, db).backfill_market('KRW-BTC', START, end)
+    # 기록된 위치부터 이어 받아 이미 받은 최신 구간은 다시 요청하지 않는다
+    assert client.calls[0] == progress['cursor_ts']
+    assert len(client.calls) == 3
+    assert db.count('KRW-BTC', 'minute1') == BARS
+    assert db.find_gaps('KRW-BTC', 'minute1', STEP) == []
+
+
+def test_gap_is_refetched_or_marked_empty(db):
+    end = START + (BARS - 1) * STEP
+    bars = all_bars()
+    # 서버에는 있지만 로컬에 빠진 구간 하나, 거래가 없어 서버에도 없는 구간 하나
+    missing = set(bars[100:105])
+    no_trades = set(bars[500:503])
+    client = FakeCandleClient([t for t in bars if t not in no_trades])
+    backfiller = Backfiller(client, db)
+    result = backfiller.backfill_market('KRW-BTC', START, end)
+    assert result['gaps_empty'] == 1
+    assert db.find_gaps('KRW-BTC', 'minute1', STEP) == []
+
+    # 로컬 DB에서 일부 봉을 지운 뒤 다시 돌리면 그 구간만 채운다
+    with db._lock:
+        db.conn.execute("DELETE FROM candles WHERE ts >= ? AND ts <= ?", (min(missing), max(missing)))
+        db.conn.commit()
+    client.calls.clear()
+    result = backfiller.backfill_market('KRW-BTC', START, end)
+    assert result == {'market': 'KRW-BTC', 'saved': len(missing), 'gaps_filled': 1, 'gaps_empty': 0}
+    assert client.calls == [max(missing) + STEP]
+    assert db.count('KRW-BTC', 'minute1') == BARS - len(no_trades)
+
+
+def test_backfill_over_http_with_rate_limit(db):
+    # 모의 거래소는 초당 5회만 허용하고 클라이언트는 더 빨리 보내 429 재시도를 거친다
+    source = SyntheticCandles(seed=3, missing_ratio=0.005)
+    end = START + (BARS - 1) * STEP
+    with SimExchangeServer(source, rate_limits={'candle': 5, 'default': 5}) as server:
+        client = UpbitClient(base_url=server.base_url,
+                             scheduler=RequestScheduler({'candle': 50, 'default': 50}, backoff=0.1))
+        result = Backfiller(client, db).backfill_market('KRW-BTC', START, end)
+        client.close()
+
+    # 모의 거래소 캔들은 UTC 기준, DB는 KST 기준 시각
+    present = [START + i * STEP for i in range(BARS)
+               if source.exists('KRW-BTC', STEP, START - KST_OFFSET + i * STEP)]
+    assert 0 < len(present) < BARS
+    assert result['saved'] == len(present)
+    assert server.rejected_count > 0
+    assert db.count('KRW-BTC', 'minute1') == len(present)
+    assert (db.first_timestamp('KRW-BTC', 'minute1'), db.last_timestamp('KRW-BTC', 'minute1')) == \
+        (present[0], present[-1])
+    assert db.find_gaps('KRW-BTC', 'minute1', STEP) == []
+
+    frame = db.load('KRW-BTC', 'minute1')
+    expected = source.candle('KRW-BTC', STEP, present[0] - KST_OFFSET)
+    assert frame['close'].iloc[0] == expected['trade_price']
+    assert frame['volume'].iloc[0] == expected['candle_acc_trade_volume']
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+from modules.backtest import (
+    simulate, next_true, exit_rates, EXIT_SIGNAL, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_OPEN
+)
+from modules.utils import round_to_tick, round_to_ticks
+
+
+@pytest.fixture
+def make_flat(make_candles):
+    """시가/고가/저가/종가가 모두 같은 평평한 캔들 배열"""
+    return lambda n, price=10000.0: make_candles(n, price=price, volatility=0.0, spread=0.0)
+
+
+def make_signals(n, buy=(), sell=()):
+    buy_mask = np.zeros(n, dtype=bool)
+    sell_mask = np.zeros(n, dtype=bool)
+    buy_mask[list(buy)] = True
+    sell_mask[list(sell)] = True
+    return buy_mask, sell_mask
+
+
+def test_next_true():
+    mask = np.array([False, True, False, False, True, False])
+    np.testing.assert_array_equal(next_true(mask), [1, 1, 4, 4, 4, 6])
+
+
+def test_exit_rates_zero_disables():
+    assert exit_rates(2, 5) == (0.02, 0.05)
+    assert exit_rates(0, False) == (0.0, 0.0)
+
+
+@pytest.mark.parametrize('price, method, expected', [
+    (12345.6, 'ceil', 12350.0),
+    (12345.6, 'floor', 12340.0),
+    (12340.0, 'ceil', 12340.0),
+    (2000100.0, 'floor', 2000000.0),
+    (1.23456, 'ceil', 1.235),
+    (0.0123456, 'floor', 0.01234),
+])
+def test_round_to_tick(price, method, expected):
+    assert round_to_tick(price, method) == expected
+    assert round_to_ticks(np.array([price]), method)[0] == expected
+
+
+def test_signal_prices_are_rounded_to_ticks(make_flat):
+    arrays = make_flat(5)
+    arrays['close'][:] = [12345.6, 12345.6, 12345.6, 12388.8, 12388.8]
+    buy, sell = make_signals(5, buy=[0], sell=[3])
+    trades, _ = simulate(arrays, buy, sell, fee=0.0, stop_loss=0, take_profit=0)
+
+    assert len(trades) == 1
+    trade = trades[0]
+    # 매수가는 올리고 매도가는 내린다
+    assert trade['entry_price'] == 12350.0
+    assert trade['exit_price'] == 12380.0
+    assert trade['reason'] == EXIT_SIGNAL
+    assert trade['return'] == pytest.approx(12380.0 / 12350.0 - 1.0)
+
+
+def test_stop_loss_wins_when_both_hit_in_same_bar(make_flat):
+    arrays = make_flat(5)
+    # 2번 봉이 손절가(9800)와 익절가(10300)를 모두 지난다
+    arrays['low'][2] = 9700.0
+    arrays['high'][2] = 10400.0
+    buy, sell = make_signals(5, buy=[0])
+    trades, _ = simulate(arrays, buy, sell, fee=0.0, stop_loss=2, take_profit=3)
+
+    assert trades[0]['exit_index'] == 2
+    assert trades[0]['reason'] == EXIT_STOP_LOSS
+    assert trades[0]['exit_price'] == 9800.0
+
+
+def test_stop_and_take_profit_fill_at_gap_open(make_flat):
+    arrays = make_flat(6)
+    arrays['open'][2] = arrays['low'][2] = 9500.0
+    arrays['open'][5] = arrays['high'][5] = 10600.0
+    buy, sell = make_signals(6, buy=[0, 3])
+    trades, _ = simulate(arrays, buy, sell, fee=0.0, stop_loss=2, take_profit=3)
+
+    # 시가가 이미 손절가 아래/익절가 위면 시가에 체결
+    assert [t['reason'] for t in trades] == [EXIT_STOP_LOSS, EXIT_TAKE_PROFIT]
+    assert [t['exit_price'] for t in trades] == [9500.0, 10600.0]
+
+
+def test_stop_loss_price_is_floored_to_tick(make_flat):
+    arrays = make_flat(4, price=12350.0)
+    arrays['low'][2] = 12000.0
+    buy, sell = make_signals(4, buy=[0])
+    trades, _ = simulate(arrays, buy, sell, fee=0.0, stop_loss=1, take_profit=0)
+
+    # 12350 * 0.99 = 12226.5 -> 12220
+    assert trades[0]['exit_price'] == 12220.0
+
+
+def test_stop_loss_before_sell_signal(make_flat):
+    arrays = make_flat(6)
+    arrays['low'][2] = 9000.0
+    buy, sell = make_signals(6, buy=[0], sell=[4])
+    trades, _ = simulate(arrays, buy, sell, fee=0.0, stop_loss=5, take_profit=0)
+    assert trades[0]['exit_index'] == 2
+    assert trades[0]['reason'] == EXIT_STOP_LOSS
+
+    # 매도 신호 봉에서 손절가에 닿으면 손절이 먼저
+    arrays = make_flat(6)
+    arrays['low'][4] = 9000.0
+    trades, _ = simulate(arrays, buy, sell, fee=0.0, stop_loss=5, take_profit=0)
+    assert trades[0]['exit_index'] == 4
+    assert trades[0]['reason'] == EXIT_STOP_LOSS
+
+
+def test_exit_found_after_long_hold(make_flat):
+    # 진입 후 봉별 비교 구간(SCAN_WINDOW)을 지나 배열 검색으로 찾는 청산
+    n = 500
+    arrays = make_flat(n)
+    arrays['high'][321] = 10600.0
+    buy, sell = make_signals(n, buy=[0])
+    trades, _ = simulate(arrays, buy, sell, fee=0.0, stop_loss=2, take_profit=5)
+    assert trades[0]['exit_index'] == 321
+    assert trades[0]['reason'] == EXIT_TAKE_PROFIT
+    assert trades[0]['exit_price'] == 10500.0
+
+
+def test_no_reentry_on_exit_bar_and_open_trade(make_flat):
+    arrays = make_flat(6)
+    arrays['close'][5] = 11000.0
+    buy, sell = make_signals(6, buy=[0, 2, 3], sell=[2])
+    trades, equity = simulate(arrays, buy, sell, fee=0.0005, stop_loss=0, take_profit=0)
+
+    assert [(t['entry_index'], t['exit_index'], t['reason']) for t in trades] == [
+        (0, 2, EXIT_SIGNAL), (3, None, EXIT_OPEN)
+    ]
+    capital = (1 - 0.0005) ** 2
+    assert trades[0]['return'] == pytest.approx(capital - 1.0)
+    # 보유 중인 마지막 봉은 종가로 평가
+    assert equity[5] == pytest.approx(capital * (1 - 0.0005) * 11000.0 / 10000.0)
+    assert equity[2] == pytest.approx(capital)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from modules.batch import stack_frames, evaluate_batch, action_vector, BATCH_COLUMNS
+from modules.registry import strategy_registry
+from modules.strategies import evaluate_strategy, make_decision, BUY, SELL, HOLD
+
+# 봉 수가 다른 마켓이 섞이도록 (마켓, 봉 수, 시드)
+MARKETS = [('KRW-BTC', 400, 1), ('KRW-ETH', 400, 2), ('KRW-XRP', 550, 3), ('KRW-SOL', 80, 4)]
+
+
+@pytest.fixture
+def frames(make_candles):
+    frames = {}
+    for market, n, seed in MARKETS:
+        frame = make_candles(n, seed=seed, frame=True, market=market)
+        # 컬럼 순서가 달라도 같은 값으로 묶여야 한다
+        frames[market] = frame[['volume', 'open', 'high', 'low', 'close']]
+    return frames
+
+
+def test_stack_frames_groups_by_length(frames):
+    frames['KRW-DOGE'] = None
+    stacked = stack_frames(frames)
+
+    assert [markets for markets, _ in stacked] == [['KRW-BTC', 'KRW-ETH'], ['KRW-XRP'], ['KRW-SOL']]
+    markets, arrays = stacked[0]
+    assert set(arrays) == set(BATCH_COLUMNS)
+    for i, market in enumerate(markets):
+        for column in BATCH_COLUMNS:
+            np.testing.assert_array_equal(arrays[column][i], frames[market][column].to_numpy())
+            assert arrays[column].flags['C_CONTIGUOUS']
+
+
+@pytest.mark.parametrize('key', strategy_registry.keys())
+def test_batch_matches_per_market_evaluate(key, frames):
+    # 마지막 봉이 한 번만 신호를 내는 전략도 있으므로 끝을 조금씩 잘라 여러 시점을 비교한다
+    for cut in range(0, 60, 3):
+        window = {market: frame.iloc[:len(frame) - cut] for market, frame in frames.items()}
+        batch = evaluate_batch(strategy_registry.create(key), window)
+        assert list(batch) == list(window)
+        for market, frame in window.items():
+            single = evaluate_strategy(strategy_registry.create(key), frame)
+            assert batch[market]['action'] == single['action'], (market, cut)
+            assert batch[market]['reason'] == single['reason'], (market, cut)
+            assert batch[market]['indicators'].keys() == single['indicators'].keys()
+            for name, value in single['indicators'].items():
+                assert batch[market]['indicators'][name] == pytest.approx(value, rel=1e-7, abs=1e-9, nan_ok=True), name
+
+
+def test_missing_frames_hold(frames):
+    frames['KRW-DOGE'] = frames['KRW-DOGE2'] = None
+    frames['KRW-ADA'] = frames['KRW-BTC'].iloc[:0]
+    decisions = evaluate_batch(strategy_registry.create('RSI'), frames)
+    for market in ('KRW-DOGE', 'KRW-DOGE2', 'KRW-ADA'):
+        assert decisions[market]['action'] == HOLD
+        assert decisions[market]['reason'] == '캔들 데이터가 없습니다.'
+
+
+def test_action_vector():
+    decisions = {'KRW-BTC': make_decision(BUY), 'KRW-ETH': make_decision(HOLD), 'KRW-XRP': make_decision(SELL)}
+    vector = action_vector(decisions)
+    assert vector.dtype == np.int8
+    assert vector.tolist() == [1, 0, -1]
+    assert action_vector(decisions, ['KRW-XRP', 'KRW-BTC']).tolist() == [-1, 1]
+    assert action_vector({}).tolist() == []
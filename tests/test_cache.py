@@ -0,0 +1,148 @@
+import time
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from modules import cache as cache_module
+from modules.cache import MarketDataCache
+
+
+class FakeClock:
+    """time.monotonic 대신 쓰는 수동 시계"""
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = MarketDataCache(max_entries=10, ttls={'ticker': 1.0})
+    cache.put(('ticker', 'KRW-BTC'), {'trade_price': 100})
+
+    clock.now += 0.99
+    assert cache.get(('ticker', 'KRW-BTC')) == {'trade_price': 100}
+    clock.now += 0.01
+    assert cache.get(('ticker', 'KRW-BTC')) is None
+    assert len(cache) == 0
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_ttl_by_key_kind(clock):
+    cache = MarketDataCache(max_entries=10, ttls={'ticker': 1.0, 'orderbook': 0.5}, default_ttl=3.0)
+    assert cache.ttl_for(('ticker', 'KRW-BTC')) == 1.0
+    assert cache.ttl_for(('orderbook', 'KRW-BTC')) == 0.5
+    assert cache.ttl_for('markets') == 3.0
+
+    cache.put(('orderbook', 'KRW-BTC'), 'book')
+    cache.put(('ticker', 'KRW-BTC'), 'ticker', ttl=0.2)
+    clock.now += 0.3
+    assert cache.get(('orderbook', 'KRW-BTC')) == 'book'
+    assert cache.get(('ticker', 'KRW-BTC')) is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = MarketDataCache(max_entries=2, ttls={})
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_get_or_fetch_refetches_after_expiry(clock):
+    cache = MarketDataCache(max_entries=10, ttls={'ticker': 1.0})
+    calls = []
+
+    def fetch():
+        calls.append(clock.now)
+        return len(calls)
+
+    key = ('ticker', 'KRW-BTC')
+    assert cache.get_or_fetch(key, fetch) == 1
+    assert cache.get_or_fetch(key, fetch) == 1
+    clock.now += 1.0
+    assert cache.get_or_fetch(key, fetch) == 2
+    assert len(calls) == 2
+
+
+def test_none_result_is_not_cached(clock):
+    cache = MarketDataCache(max_entries=10, ttls={})
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_fetch('ticker', fetch) is None
+    assert cache.get_or_fetch('ticker', fetch) is None
+    assert len(calls) == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = MarketDataCache(max_entries=10, ttls={'ticker': 10.0})
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return {'trade_price': 100}
+
+    def consumer():
+        results.append(cache.get_or_fetch(('ticker', 'KRW-BTC'), fetch))
+
+    threads = [threading.Thread(target=consumer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while not calls and time.monotonic() < deadline:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    # 모든 소비자가 같은 스냅샷 객체를 받는다
+    assert all(result is results[0] for result in results)
+
+
+def test_fetch_error_reaches_every_waiter():
+    cache = MarketDataCache(max_entries=10, ttls={})
+    release = threading.Event()
+    errors = []
+
+    def fetch():
+        release.wait(2)
+        raise ConnectionError("timeout")
+
+    def consumer():
+        try:
+            cache.get_or_fetch('ticker', fetch)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=consumer) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(errors) == 3
+    assert len(cache) == 0
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.candle_db import CandleDatabase, PRICE_COLUMNS, to_timestamps, from_timestamps
+
+STEP = 60
+START = 1704067200  # 2024-01-01 00:00 (KST epoch 초)
+
+
+def make_frame(ts):
+    ts = np.asarray(ts, dtype=np.int64)
+    close = 100.0 + np.arange(len(ts), dtype=float)
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': np.ones(len(ts)), 'value': close
+    }, index=from_timestamps(ts))
+
+
+@pytest.fixture
+def db():
+    db = CandleDatabase(':memory:')
+    yield db
+    db.close()
+
+
+def test_timestamps_round_trip():
+    ts = np.array([START, START + STEP, START + 2 * STEP], dtype=np.int64)
+    np.testing.assert_array_equal(to_timestamps(from_timestamps(ts)), ts)
+
+
+def test_upsert_overwrites_same_timestamp(db):
+    ts = START + STEP * np.arange(5)
+    assert db.upsert('KRW-BTC', 'minute1', make_frame(ts)) == 5
+    frame = make_frame(ts[:2])
+    frame['close'] = [1.0, 2.0]
+    db.upsert('KRW-BTC', 'minute1', frame)
+
+    loaded = db.load('KRW-BTC', 'minute1')
+    assert len(loaded) == 5
+    assert list(loaded['close'][:3]) == [1.0, 2.0, 102.0]
+    assert list(loaded.columns) == list(PRICE_COLUMNS)
+    assert loaded.attrs == {'market': 'KRW-BTC', 'interval': 'minute1'}
+
+
+def test_load_range_and_limit(db):
+    ts = START + STEP * np.arange(10)
+    db.upsert('KRW-BTC', 'minute1', make_frame(ts))
+    db.upsert('KRW-ETH', 'minute1', make_frame(ts[:3]))
+
+    arrays = db.load_arrays('KRW-BTC', 'minute1', start=int(ts[2]), end=int(ts[5]))
+    np.testing.assert_array_equal(arrays['ts'], ts[2:6])
+    # limit은 최근 봉부터 세고 시간순으로 돌려준다
+    np.testing.assert_array_equal(db.load_arrays('KRW-BTC', 'minute1', limit=3)['ts'], ts[-3:])
+    assert db.count('KRW-ETH', 'minute1') == 3
+    assert db.first_timestamp('KRW-BTC', 'minute1') == ts[0]
+    assert db.last_timestamp('KRW-BTC', 'minute1') == ts[-1]
+    assert db.last_timestamp('KRW-XRP', 'minute1') is None
+
+
+def test_find_gaps(db):
+    ts = START + STEP * np.array([0, 1, 2, 5, 6, 9])
+    db.upsert('KRW-BTC', 'minute1', make_frame(ts))
+
+    assert db.find_gaps('KRW-BTC', 'minute1', STEP) == [
+        (START + 3 * STEP, START + 4 * STEP),
+        (START + 7 * STEP, START + 8 * STEP),
+    ]
+    # 검사 구간 밖의 빈 구간은 무시
+    assert db.find_gaps('KRW-BTC', 'minute1', STEP, start=START + 5 * STEP) == [
+        (START + 7 * STEP, START + 8 * STEP)
+    ]
+
+
+def test_empty_gap_is_skipped_afterwards(db):
+    ts = START + STEP * np.array([0, 1, 2, 5, 6, 9])
+    db.upsert('KRW-BTC', 'minute1', make_frame(ts))
+    db.mark_empty_gap('KRW-BTC', 'minute1', START + 3 * STEP, START + 4 * STEP)
+
+    assert db.find_gaps('KRW-BTC', 'minute1', STEP) == [(START + 7 * STEP, START + 8 * STEP)]
+    # 다른 간격의 기록에는 영향이 없다
+    db.upsert('KRW-BTC', 'minute3', make_frame(START + 180 * np.array([0, 2])))
+    assert db.find_gaps('KRW-BTC', 'minute3', 180) == [(START + 180, START + 180)]
+
+
+def test_progress_round_trip(db):
+    assert db.get_progress('KRW-BTC', 'minute1') is None
+    db.save_progress('KRW-BTC', 'minute1', START, START + 1000 * STEP, START + 600 * STEP)
+    assert db.get_progress('KRW-BTC', 'minute1') == {
+        'start_ts': START, 'end_ts': START + 1000 * STEP, 'cursor_ts': START + 600 * STEP, 'done': False
+    }
+    db.save_progress('KRW-BTC', 'minute1', START, START + 1000 * STEP, START, done=True)
+    assert db.get_progress('KRW-BTC', 'minute1')['done'] is True
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from modules.backtest import EXIT_SIGNAL, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_OPEN
+from modules.event_backtest import run_event_backtest, run_markets
+from modules.strategies import make_decision, BUY, SELL, HOLD
+
+START = 1735657200  # 캔들 시작 시각 (KST epoch 초)
+FEE = 0.0005
+
+
+class ScriptedStrategy:
+    """봉 순서대로 정해 둔 판단을 돌려주는 전략 (없는 봉은 관망)"""
+    def __init__(self, actions):
+        self.actions = actions
+        self.bar = -1
+
+    def evaluate(self, data):
+        self.bar += 1
+        return make_decision(self.actions.get(self.bar, HOLD))
+
+
+def make_arrays(closes):
+    close = np.asarray(closes, dtype=float)
+    return {
+        'ts': START + 60 * np.arange(len(close), dtype=np.int64),
+        'open': close.copy(), 'high': close.copy(), 'low': close.copy(), 'close': close,
+        'volume': np.ones(len(close))
+    }
+
+
+def replay(closes, actions, **settings):
+    return run_event_backtest(ScriptedStrategy(actions), make_arrays(closes), 'KRW-BTC', 'minute1',
+                              settings=dict({'stop_loss': 5.0, 'take_profit': 5.0}, **settings),
+                              krw=1000000.0, fee=FEE)
+
+
+def test_exit_reasons_come_from_the_actual_trigger():
+    closes = [10000.0] * 300
+    closes[40:60] = [9400.0] * 20        # 10번 봉 매수 -> 40번 봉 손절
+    closes[100:130] = [10600.0] * 30     # 70번 봉 매수 -> 100번 봉 익절 (같은 봉에 매도 신호)
+    closes[200:] = [9900.0] * 100        # 150번 봉 매수 -> 220번 봉 신호 매도 (손실)
+    actions = {10: BUY, 70: BUY, 100: SELL, 150: BUY, 220: SELL, 260: BUY}
+    result = replay(closes, actions)
+
+    assert [(t['entry_index'], t['exit_index'], t['reason']) for t in result['trades']] == [
+        (10, 40, EXIT_STOP_LOSS), (70, 100, EXIT_TAKE_PROFIT), (150, 220, EXIT_SIGNAL), (260, None, EXIT_OPEN)
+    ]
+    assert result['trades'][2]['return'] < 0
+
+
+def test_fills_match_broker_balances(make_candles):
+    closes = np.round(make_candles(400, seed=5, volatility=0.004)['close'], -1)
+    actions = {i: (BUY if i % 40 == 5 else SELL if i % 40 == 25 else HOLD) for i in range(400)}
+    result = replay(closes, actions, stop_loss=None, take_profit=None)
+    orders = result['orders']
+    assert len(orders) == result['stats']['orders'] > 10
+
+    cash, quantity = 1000000.0, 0.0
+    for order in orders:
+        funds = sum(trade['funds'] for trade in order['trades'])
+        assert order['state'] == 'done'
+        assert order['paid_fee'] == pytest.approx(funds * FEE)
+        if order['side'] == 'bid':
+            cash -= funds + order['paid_fee']
+            quantity += order['executed_volume']
+        else:
+            cash += funds - order['paid_fee']
+            quantity -= order['executed_volume']
+    # 마지막 봉 자산 = 체결 내역으로 다시 계산한 현금 + 보유 수량 평가액
+    assert result['equity'][-1] == pytest.approx(cash + quantity * closes[-1])
+    assert quantity >= 0 and cash >= 0
+
+
+def test_workers_give_identical_results(make_candles):
+    data = {}
+    for i, market in enumerate(('KRW-BTC', 'KRW-ETH', 'KRW-XRP')):
+        closes = np.round(make_candles(300 + 50 * i, seed=7 + i)['close'], -1)
+        data[market] = make_arrays(closes)
+    params = {'period': 7, 'oversold': 40, 'overbought': 60}
+    single = run_markets('RSI', data, params, krw=1000000.0, fee=FEE, workers=1)
+    multi = run_markets('RSI', data, params, krw=1000000.0, fee=FEE, workers=2)
+
+    timing = ['seconds', 'bars_per_second']
+    assert 'error' not in single
+    assert (single['orders'] > 0).all()
+    assert single.drop(columns=timing).equals(multi.drop(columns=timing))
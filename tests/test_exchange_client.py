@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from modules.config import EXCHANGE_CLIENT_SETTINGS
+from modules.exchange_client import UpbitClient, UpbitAPIError, parse_remaining_req, candle_path
+from modules.sim_exchange import SimExchangeServer
+
+START = 1735657200  # 모의 거래소 시계 (UTC epoch 초)
+
+
+def connection_counts(client):
+    """클라이언트 커넥션 풀이 지금까지 연 연결 수와 보낸 요청 수"""
+    manager = client.session.get_adapter(client.base_url).poolmanager
+    pools = [manager.pools[key] for key in manager.pools.keys()]
+    return sum(pool.num_connections for pool in pools), sum(pool.num_requests for pool in pools)
+
+
+@pytest.fixture
+def server():
+    with SimExchangeServer(clock=lambda: START) as server:
+        yield server
+
+
+def test_parse_remaining_req():
+    assert parse_remaining_req('group=market; min=573; sec=9') == {'group': 'market', 'min': 573, 'sec': 9}
+    assert parse_remaining_req('') is None
+    assert parse_remaining_req('group=market') is None
+
+
+def test_candle_path():
+    assert candle_path('minute15') == '/v1/candles/minutes/15'
+    with pytest.raises(ValueError):
+        candle_path('minute2')
+
+
+def test_sequential_requests_share_one_connection(server):
+    client = UpbitClient(base_url=server.base_url + '/')
+    assert client.base_url == server.base_url
+    for _ in range(5):
+        client.get_ticker('KRW-BTC')
+        client.get_orderbook(['KRW-BTC', 'KRW-ETH'])
+        client.get_candles('KRW-BTC', 'minute1', 3)
+    # 시세 조회 15번이 keep-alive 연결 하나로 처리된다
+    assert connection_counts(client) == (1, 15)
+    assert server.request_count == 15
+
+    stats = client.get_latency_stats()
+    assert stats['GET /v1/ticker']['count'] == 5
+    assert stats['GET /v1/candles/minutes/1']['errors'] == 0
+    client.close()
+
+
+def test_concurrent_requests_reuse_pooled_connections():
+    with SimExchangeServer(clock=lambda: START, latency=0.05) as server:
+        client = UpbitClient(base_url=server.base_url, pool_maxsize=4)
+        markets = [f'KRW-C{i}' for i in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(client.get_ticker, markets))
+        opened, sent = connection_counts(client)
+        assert sent == len(markets)
+        assert opened <= 4
+
+        # 풀에 남은 연결을 다시 쓰므로 이어지는 요청은 새 연결을 열지 않는다
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(client.get_ticker, markets))
+        assert connection_counts(client) == (opened, 2 * len(markets))
+        client.close()
+
+
+def test_timeouts():
+    client = UpbitClient(base_url='http://127.0.0.1:1')
+    assert client.timeout == (EXCHANGE_CLIENT_SETTINGS['CONNECT_TIMEOUT'], EXCHANGE_CLIENT_SETTINGS['READ_TIMEOUT'])
+
+    with SimExchangeServer(clock=lambda: START, latency=0.5) as server:
+        client = UpbitClient(base_url=server.base_url, connect_timeout=1.0, read_timeout=0.1)
+        assert client.timeout == (1.0, 0.1)
+        with pytest.raises(requests.Timeout):
+            client.get_ticker('KRW-BTC')
+        # 실패한 요청도 지연 통계에 오류로 남는다
+        assert client.get_latency_stats()['GET /v1/ticker']['errors'] == 1
+        client.close()
+
+
+def test_error_response_and_missing_credentials(server):
+    client = UpbitClient(base_url=server.base_url)
+    with pytest.raises(UpbitAPIError) as error:
+        client.get_candles('KRW-BTC', 'minute1', count=1, to='not-a-date')
+    assert error.value.status == 400
+    # API 키가 없으면 요청을 보내지 않는다
+    with pytest.raises(UpbitAPIError) as error:
+        client.get_accounts()
+    assert error.value.name == 'no_credentials'
+    assert server.endpoint_counts.get('GET /v1/accounts') is None
+    client.close()
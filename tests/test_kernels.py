@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import kernels
+from modules.indicators import SuperTrend, DMI
+
+# 커널 도입 전 strategies.py의 pandas 계산 (비교 기준)
+
+
+def pandas_rsi(prices, period=14):
+    delta = prices.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def pandas_macd(prices, fast=12, slow=26, signal=9):
+    exp1 = prices.ewm(span=fast).mean()
+    exp2 = prices.ewm(span=slow).mean()
+    macd = exp1 - exp2
+    signal_line = macd.ewm(span=signal).mean()
+    return macd, signal_line
+
+
+def pandas_bollinger(prices, period=20, std=2):
+    middle = prices.rolling(window=period).mean()
+    std_dev = prices.rolling(window=period).std()
+    upper = middle + (std_dev * std)
+    lower = middle - (std_dev * std)
+    return upper, middle, lower
+
+
+def pandas_atr(df, period=14):
+    high_low = df['high'] - df['low']
+    high_close = np.abs(df['high'] - df['close'].shift())
+    low_close = np.abs(df['low'] - df['close'].shift())
+    ranges = pd.concat([high_low, high_close, low_close], axis=1)
+    true_range = np.max(ranges, axis=1)
+    return true_range.rolling(window=period).mean()
+
+
+def pandas_market_phase(df, period=20):
+    sma = df['close'].rolling(window=period).mean()
+    std = df['close'].rolling(window=period).std()
+    z_score = (df['close'] - sma) / std
+    return pd.cut(z_score, bins=[-np.inf, -2, -0.5, 0.5, 2, np.inf],
+                  labels=['Strong Bear', 'Bear', 'Neutral', 'Bull', 'Strong Bull'])
+
+
+def assert_same(actual, expected):
+    # 큰 가격대에서는 pandas rolling 분산의 누적 오차가 1e-8 수준까지 난다
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-7, atol=1e-7)
+
+
+# 무작위 가격, 큰 가격대, 종가가 일정한 가격, 구간보다 짧은 입력 (make_candles 인자)
+CASES = {
+    'random': {'n': 500},
+    'large_price': {'n': 300, 'seed': 1, 'price': 1.5e8},
+    'constant': {'n': 60, 'price': 100.0, 'volatility': 0.0, 'spread': 0.01},
+    'short': {'n': 5, 'seed': 2},
+}
+
+
+@pytest.fixture(params=list(CASES))
+def candles(request, make_candles):
+    return make_candles(frame=True, **CASES[request.param])
+
+
+def test_rsi(candles):
+    assert_same(kernels.rsi(candles['close'].to_numpy(), 14), pandas_rsi(candles['close'], 14))
+
+
+def test_macd(candles):
+    line, signal = kernels.macd(candles['close'].to_numpy(), 12, 26, 9)
+    expected_line, expected_signal = pandas_macd(candles['close'], 12, 26, 9)
+    assert_same(line, expected_line)
+    assert_same(signal, expected_signal)
+
+
+def test_bollinger(candles):
+    for actual, expected in zip(kernels.bollinger(candles['close'].to_numpy(), 20, 2),
+                                pandas_bollinger(candles['close'], 20, 2)):
+        assert_same(actual, expected)
+
+
+def test_atr(candles):
+    actual = kernels.atr(candles['high'].to_numpy(), candles['low'].to_numpy(), candles['close'].to_numpy(), 14)
+    assert_same(actual, pandas_atr(candles, 14))
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+@pytest.mark.parametrize('window', [1, 3, 20])
+def test_rolling_windows(candles, window):
+    close = candles['close']
+    assert_same(kernels.rolling_std(close.to_numpy(), window), close.rolling(window).std())
+    assert_same(kernels.rolling_max(close.to_numpy(), window), close.rolling(window).max())
+    assert_same(kernels.rolling_min(close.to_numpy(), window), close.rolling(window).min())
+
+
+def test_market_phase(candles):
+    codes = kernels.market_phase(candles['close'].to_numpy(), 20)
+    expected = pandas_market_phase(candles, 20).cat.codes.to_numpy()
+    np.testing.assert_array_equal(codes, expected)
+
+
+def stream_series(indicator, candles, size):
+    """스트리밍 지표를 봉마다 update()한 값 (None은 NaN)"""
+    rows = []
+    for high, low, close in candles[['high', 'low', 'close']].itertuples(index=False):
+        value = indicator.update(high, low, close)
+        rows.append((np.nan,) * size if value is None else value)
+    return [np.array(column, dtype=float) for column in zip(*rows)]
+
+
+def test_supertrend_matches_streaming(candles):
+    actual = kernels.supertrend(candles['high'].to_numpy(), candles['low'].to_numpy(),
+                                candles['close'].to_numpy(), 10, 3)
+    expected = stream_series(SuperTrend(10, 3), candles, 4)
+    for a, e in zip(actual, expected):
+        assert_same(a, e)
+
+
+def test_dmi_matches_streaming(candles):
+    actual = kernels.dmi(candles['high'].to_numpy(), candles['low'].to_numpy(), candles['close'].to_numpy(), 14)
+    expected = stream_series(DMI(14), candles, 3)
+    for a, e in zip(actual, expected):
+        assert_same(a, e)
+
+
+def test_dmi_skips_bars_without_range(make_candles):
+    # 앞쪽이 움직임 없는 봉이면 평균 TR이 0이라 DI를 건너뛰고 ADX는 그 뒤부터 쌓인다
+    df = make_candles(200, seed=3, frame=True)
+    df.iloc[:20] = 100.0
+    actual = kernels.dmi(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), 14)
+    expected = stream_series(DMI(14), df, 3)
+    assert np.isnan(actual[0][:20]).all()
+    for a, e in zip(actual, expected):
+        assert_same(a, e)
+
+
+def test_wilder_kernels_two_dimensional(make_candles):
+    rows = [make_candles(200, seed=s) for s in range(3)]
+    high, low, close = (np.stack([arrays[column] for arrays in rows]) for column in ('high', 'low', 'close'))
+    for kernel in (kernels.supertrend, kernels.dmi):
+        batch = kernel(high, low, close)
+        for i, arrays in enumerate(rows):
+            single = kernel(arrays['high'], arrays['low'], arrays['close'])
+            for a, b in zip(batch, single):
+                np.testing.assert_array_equal(a[i], b)
+
+
+def test_warm_up_is_nan(make_candles):
+    close = make_candles(50)['close']
+    assert np.isnan(kernels.rsi(close, 14)[:13]).all()
+    assert not np.isnan(kernels.rsi(close, 14)[13:]).any()
+    assert np.isnan(kernels.rolling_std(close, 20)[:19]).all()
+    assert (kernels.market_phase(close, 20)[:19] == -1).all()
+
+
+def test_constant_series():
+    close = np.full(40, 100.0)
+    assert np.isnan(kernels.rsi(close, 14)).all()
+    assert (kernels.rolling_std(close, 20)[19:] == 0).all()
+    upper, middle, lower = kernels.bollinger(close, 20)
+    assert (upper[19:] == 100.0).all() and (lower[19:] == 100.0).all()
+
+
+def test_shorter_than_window():
+    close = np.arange(1.0, 6.0)
+    for result in (kernels.rsi(close, 14), kernels.rolling_std(close, 20), kernels.rolling_max(close, 20),
+                   kernels.rolling_min(close, 20), *kernels.bollinger(close, 20)):
+        assert result.shape == close.shape
+        assert np.isnan(result).all()
+
+
+def test_two_dimensional_rows_match_one_dimensional(make_candles):
+    rows = np.stack([make_candles(200, seed=s)['close'] for s in range(3)])
+    batch = kernels.rsi(rows, 14)
+    for row, result in zip(rows, batch):
+        np.testing.assert_array_equal(result, kernels.rsi(row, 14))
+
+
+def test_out_buffers_are_written_in_place(make_candles):
+    df = make_candles(100, frame=True)
+    close = df['close'].to_numpy()
+
+    out = np.empty_like(close)
+    assert kernels.rsi(close, 14, out=out) is out
+    assert_same(out, pandas_rsi(df['close'], 14))
+
+    for name, window in (('rolling_std', 20), ('rolling_max', 20), ('rolling_min', 20)):
+        out = np.full_like(close, -1.0)
+        assert getattr(kernels, name)(close, window, out=out) is out
+        assert np.isnan(out[:window - 1]).all()
+        assert_same(out, getattr(df['close'].rolling(window), name.split('_')[1])())
+
+    buffers = tuple(np.empty_like(close) for _ in range(3))
+    result = kernels.bollinger(close, 20, 2, out=buffers)
+    assert all(a is b for a, b in zip(result, buffers))
+
+    buffers = (np.empty_like(close), np.empty_like(close))
+    result = kernels.macd(close, out=buffers)
+    assert all(a is b for a, b in zip(result, buffers))
+
+    out = np.empty_like(close)
+    assert kernels.atr(df['high'].to_numpy(), df['low'].to_numpy(), close, 14, out=out) is out
+    assert_same(out, pandas_atr(df, 14))
+
+    codes = np.empty(close.shape, dtype=np.int8)
+    assert kernels.market_phase(close, 20, out=codes) is codes
+
+
+def test_out_buffer_shape_is_checked():
+    with pytest.raises(ValueError):
+        kernels.rsi(np.arange(10.0), 3, out=np.empty(9))
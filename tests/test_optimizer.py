@@ -0,0 +1,58 @@
+import pytest
+
+from modules.optimizer import optimize, parse_space, parameter_grid, random_space, main
+from modules.registry import strategy_registry
+
+
+@pytest.fixture
+def make_data(make_candles):
+    """마켓별 랜덤워크 캔들 배열 (봉 수가 조금씩 다름)"""
+    return lambda markets=3, n=800: {f'KRW-C{i}': make_candles(n + 100 * i, seed=i) for i in range(markets)}
+
+
+def test_parse_space_grid_rounds_float_steps():
+    space = parse_space(['std_dev=1.5:2.5:0.1', 'period=10:30:5'], strategy_registry.schema('BB'))
+    # 0.1 간격을 더해 가며 생기는 부동소수 오차 없이 끝값까지 포함한다
+    assert space['std_dev'] == [1.5, 1.6, 1.7, 1.8, 1.9, 2.0, 2.1, 2.2, 2.3, 2.4, 2.5]
+    assert space['period'] == [10, 15, 20, 25, 30]
+    assert all(type(value) is int for value in space['period'])
+
+
+def test_parse_space_candidates_and_ranges():
+    space = parse_space(['period=7,14,', 'oversold=20:35'], strategy_registry.schema('RSI'))
+    assert space == {'period': [7, 14], 'oversold': (20.0, 35.0)}
+
+    combinations = random_space(space, 5, seed=1, schema=strategy_registry.schema('RSI'))
+    assert len(combinations) == 5
+    assert all(params['period'] in (7, 14) and 20 <= params['oversold'] <= 35 for params in combinations)
+
+
+def test_parse_space_rejects_unknown_parameter():
+    with pytest.raises(ValueError, match="파라미터"):
+        parse_space(['length=5,10'], strategy_registry.schema('RSI'))
+
+
+def test_grid_search_rejects_ranges(capsys):
+    # 범위(low:high)는 무작위 탐색에서만 쓸 수 있다
+    with pytest.raises(SystemExit):
+        main(['--strategy', 'RSI', '--param', 'period=5:20'])
+    assert 'period' in capsys.readouterr().err
+
+
+def test_invalid_combinations_are_skipped(make_data):
+    candidates = [{'period': 7}, {'period': 0}, {'period': 21}, {'oversold': 80, 'overbought': 20}]
+    results = optimize('RSI', candidates, make_data(markets=1), workers=1)
+    assert sorted(results['period']) == [7, 21]
+
+
+def test_workers_give_identical_ranking(make_data):
+    data = make_data()
+    candidates = parameter_grid({'period': [7, 14, 21], 'oversold': [25.0, 35.0], 'overbought': [65.0, 75.0]})
+    single = optimize('RSI', candidates, data, workers=1, stop_loss=0, take_profit=0)
+    multi = optimize('RSI', candidates, data, workers=2, stop_loss=0, take_profit=0)
+
+    assert 'error' not in single
+    assert len(single) == len(candidates)
+    assert list(single['rank']) == list(range(1, len(candidates) + 1))
+    assert single['mean_return'].is_monotonic_decreasing
+    assert single.equals(multi)
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+
+from modules.orderbook import OrderBook, OrderBookMirror
+
+ASKS = [(100.0, 1.0), (101.0, 2.0), (102.0, 3.0)]
+BIDS = [(99.0, 1.0), (98.0, 2.0), (97.0, 5.0)]
+
+
+def make_message(asks=ASKS, bids=BIDS, market='KRW-BTC'):
+    return {
+        'code': market, 'timestamp': 1735657200000,
+        'orderbook_units': [{'ask_price': ap, 'ask_size': az, 'bid_price': bp, 'bid_size': bz}
+                            for (ap, az), (bp, bz) in zip(asks, bids)]
+    }
+
+
+def make_book(depth=5, asks=ASKS, bids=BIDS):
+    book = OrderBook('KRW-BTC', depth)
+    book.update_snapshot(make_message(asks, bids))
+    return book
+
+
+def levels(book, side):
+    prices, sizes, n = book._side(side)
+    return list(zip(prices[:n].tolist(), sizes[:n].tolist()))
+
+
+def walk_book(units, amount=None, volume=None):
+    """호가를 한 단계씩 소비하는 기준 구현 (금액, 수량)"""
+    cost = filled = 0.0
+    for price, size in units:
+        if amount is not None:
+            take = min(size, (amount - cost) / price)
+        else:
+            take = min(size, volume - filled)
+        cost += take * price
+        filled += take
+    return cost, filled
+
+
+def test_best_prices_and_spread():
+    book = make_book()
+    assert (book.best_ask(), book.best_bid()) == (100.0, 99.0)
+    assert book.spread() == 1.0
+    assert book.mid_price() == 99.5
+    empty = OrderBook('KRW-BTC')
+    assert empty.best_ask() is None and empty.spread() is None and empty.mid_price() is None
+
+
+def test_expected_fill_buy_amount_spans_levels():
+    fill = make_book().expected_fill('bid', amount=250.0)
+    # 100원 1개를 다 사고 남은 150원은 101원 호가에서
+    volume = 1.0 + 150.0 / 101.0
+    assert fill['volume'] == pytest.approx(volume)
+    assert fill['cost'] == pytest.approx(250.0)
+    assert fill['avg_price'] == pytest.approx(250.0 / volume)
+    assert fill['levels'] == 2
+    assert fill['filled'] is True
+    assert fill['slippage'] == pytest.approx((250.0 / volume - 100.0) / 100.0)
+
+
+def test_expected_fill_sell_volume_on_level_boundary():
+    fill = make_book().expected_fill('ask', volume=3.0)
+    assert fill['cost'] == pytest.approx(99.0 + 2 * 98.0)
+    assert fill['avg_price'] == pytest.approx(295.0 / 3.0)
+    assert (fill['levels'], fill['filled']) == (2, True)
+
+
+def test_expected_fill_partial_depth():
+    fill = make_book().expected_fill('bid', volume=10.0)
+    # 호가 전체(6개)를 소비해도 모자란다
+    assert fill['volume'] == 6.0
+    assert fill['cost'] == 100.0 + 202.0 + 306.0
+    assert (fill['levels'], fill['filled']) == (3, False)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_expected_fill_matches_walking_the_book(seed):
+    rng = np.random.default_rng(seed)
+    asks = [(1000.0 + i, float(size)) for i, size in enumerate(rng.uniform(0.1, 3.0, 15))]
+    bids = [(999.0 - i, float(size)) for i, size in enumerate(rng.uniform(0.1, 3.0, 15))]
+    book = make_book(depth=15, asks=asks, bids=bids)
+    for amount in rng.uniform(100, 40000, 10):
+        cost, filled = walk_book(asks, amount=amount)
+        fill = book.expected_fill('bid', amount=amount)
+        assert fill['cost'] == pytest.approx(cost)
+        assert fill['volume'] == pytest.approx(filled)
+    for volume in rng.uniform(0.1, 40.0, 10):
+        cost, filled = walk_book(bids, volume=volume)
+        fill = book.expected_fill('ask', volume=volume)
+        assert fill['cost'] == pytest.approx(cost)
+        assert fill['volume'] == pytest.approx(filled)
+
+
+def test_expected_fill_arguments():
+    book = make_book()
+    with pytest.raises(ValueError):
+        book.expected_fill('bid')
+    with pytest.raises(ValueError):
+        book.expected_fill('bid', amount=100.0, volume=1.0)
+    assert OrderBook('KRW-BTC').expected_fill('bid', amount=100.0) is None
+
+
+def test_apply_level_insert_update_delete():
+    book = make_book()
+    book.apply_level('ask', 100.5, 4.0)
+    book.apply_level('bid', 99.5, 0.5)
+    assert levels(book, 'ask') == [(100.0, 1.0), (100.5, 4.0), (101.0, 2.0), (102.0, 3.0)]
+    assert levels(book, 'bid') == [(99.5, 0.5), (99.0, 1.0), (98.0, 2.0), (97.0, 5.0)]
+
+    book.apply_level('ask', 101.0, 7.0)
+    book.apply_level('bid', 98.0, 0)
+    book.apply_level('bid', 50.0, 0)  # 없는 가격 삭제는 무시
+    assert levels(book, 'ask')[2] == (101.0, 7.0)
+    assert levels(book, 'bid') == [(99.5, 0.5), (99.0, 1.0), (97.0, 5.0)]
+    assert book.best_bid() == 99.5
+
+    with pytest.raises(ValueError):
+        book.apply_level('buy', 100.0, 1.0)
+
+
+def test_apply_level_keeps_depth():
+    book = make_book(depth=3)
+    # 가득 찬 호가창에 더 좋은 가격이 들어오면 가장 먼 호가가 밀려난다
+    book.apply_level('ask', 99.5, 1.0)
+    assert levels(book, 'ask') == [(99.5, 1.0), (100.0, 1.0), (101.0, 2.0)]
+    book.apply_level('ask', 105.0, 1.0)
+    assert levels(book, 'ask') == [(99.5, 1.0), (100.0, 1.0), (101.0, 2.0)]
+
+
+def test_depth_to_amount():
+    book = make_book()
+    assert book.depth_to_amount('ask', 250.0) == {'levels': 2, 'volume': 3.0, 'available': 608.0, 'enough': True}
+    assert book.depth_to_amount('ask', 302.0)['levels'] == 2
+    assert book.depth_to_amount('ask', 1000.0) == {'levels': 3, 'volume': 6.0, 'available': 608.0, 'enough': False}
+    assert book.depth_to_amount('bid', 99.0) == {'levels': 1, 'volume': 1.0, 'available': 99.0 + 196.0 + 485.0,
+                                                 'enough': True}
+    assert OrderBook('KRW-BTC').depth_to_amount('ask', 100.0) == \
+        {'levels': 0, 'volume': 0.0, 'available': 0.0, 'enough': False}
+
+
+def test_mirror_keeps_book_per_market():
+    mirror = OrderBookMirror(depth=5)
+    assert mirror.age('KRW-BTC') is None
+    mirror.on_orderbook(make_message())
+    mirror.on_orderbook(dict(make_message(asks=[(10.0, 1.0)], bids=[(9.0, 1.0)]), code=None, market='KRW-ETH'))
+    assert mirror.get('KRW-BTC').best_ask() == 100.0
+    assert mirror.get('KRW-ETH').best_bid() == 9.0
+    assert mirror.age('KRW-BTC') >= 0
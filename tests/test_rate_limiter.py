@@ -0,0 +1,168 @@
+import time
+import threading
+
+import pytest
+
+from modules.rate_limiter import (
+    RequestScheduler, TokenBucket, request_group, PRIORITY_ORDER, PRIORITY_UI
+)
+
+
+class TooManyRequests(Exception):
+    """429 응답 대신 쓰는 예외"""
+
+
+def make_scheduler(max_retries=3, backoff=0.01):
+    return RequestScheduler(limits={'default': 50, 'order': 50}, max_retries=max_retries, backoff=backoff)
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("대기 시간 초과")
+        time.sleep(0.001)
+
+
+@pytest.mark.parametrize('method, path, group', [
+    ('GET', '/v1/candles/minutes/5', 'candle'),
+    ('GET', '/v1/ticker', 'ticker'),
+    ('POST', '/v1/orders', 'order'),
+    ('DELETE', '/v1/order', 'order'),
+    ('GET', '/v1/order', 'default'),
+    ('GET', '/v1/accounts', 'default'),
+])
+def test_request_group(method, path, group):
+    assert request_group(method, path) == group
+
+
+def test_token_bucket_wait_time_and_block():
+    bucket = TokenBucket(10)
+    now = bucket.updated_at
+    for _ in range(10):
+        bucket.take()
+    # 토큰 1개가 다시 차기까지 1/10초
+    assert bucket.wait_time(now) == pytest.approx(0.1)
+    assert bucket.wait_time(now + 0.1) == 0.0
+
+    bucket.block(0.5)
+    assert bucket.tokens == 0.0
+    assert bucket.wait_time(bucket.blocked_until - 0.2) == pytest.approx(0.2)
+
+
+def test_submit_retries_after_429():
+    scheduler = make_scheduler()
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise TooManyRequests()
+        return 'ok'
+
+    assert scheduler.submit('candle', fn, retry_on=TooManyRequests) == 'ok'
+    assert len(calls) == 3
+    # 재시도마다 backoff * 시도 횟수만큼 그룹을 차단한다
+    assert calls[1] - calls[0] >= 0.01 * 0.9
+    assert calls[2] - calls[1] >= 0.02 * 0.9
+
+
+def test_submit_gives_up_after_max_retries():
+    scheduler = make_scheduler(max_retries=2)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise TooManyRequests()
+
+    with pytest.raises(TooManyRequests):
+        scheduler.submit('candle', fn, retry_on=TooManyRequests)
+    assert len(calls) == 3
+
+
+def test_submit_does_not_retry_other_errors():
+    scheduler = make_scheduler()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        scheduler.submit('candle', fn, retry_on=TooManyRequests)
+    assert len(calls) == 1
+
+
+def test_order_priority_is_served_before_waiting_ui_request():
+    scheduler = make_scheduler()
+    # 그룹을 막아 두고 UI 요청이 먼저 대기열에 들어간 뒤 주문 요청을 넣는다
+    scheduler.penalize('candle', 0.2)
+    served = []
+
+    def request(name, priority):
+        scheduler.submit('candle', lambda: served.append(name), priority=priority)
+
+    ui = threading.Thread(target=request, args=('ui', PRIORITY_UI))
+    ui.start()
+    wait_until(lambda: len(scheduler.waiting.get('candle', [])) == 1)
+    order = threading.Thread(target=request, args=('order', PRIORITY_ORDER))
+    order.start()
+    wait_until(lambda: len(scheduler.waiting.get('candle', [])) == 2)
+    ui.join(2)
+    order.join(2)
+
+    assert served == ['order', 'ui']
+    assert scheduler.get_status()['candle']['waiting'] == 0
+
+
+def test_groups_do_not_wait_on_each_other():
+    scheduler = make_scheduler()
+    # 시세 그룹이 막혀 대기 요청이 쌓여 있어도 주문 그룹 요청은 바로 토큰을 받는다
+    scheduler.penalize('candle', 0.3)
+    served = []
+    quote = threading.Thread(target=lambda: scheduler.submit('candle', lambda: served.append('quote'),
+                                                             priority=PRIORITY_ORDER))
+    quote.start()
+    wait_until(lambda: len(scheduler.waiting.get('candle', [])) == 1)
+
+    started = time.monotonic()
+    scheduler.submit('order', lambda: served.append('order'), priority=PRIORITY_UI)
+    assert time.monotonic() - started < 0.1
+    assert served == ['order']
+    quote.join(2)
+    assert served == ['order', 'quote']
+
+
+def test_thread_priority_context():
+    scheduler = make_scheduler()
+    assert scheduler.current_priority('order') == PRIORITY_ORDER
+    with scheduler.priority(PRIORITY_UI):
+        assert scheduler.current_priority('order') == PRIORITY_UI
+    assert scheduler.current_priority('order') == PRIORITY_ORDER
+
+
+def test_same_key_requests_share_one_call():
+    scheduler = make_scheduler()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def fn():
+        calls.append(1)
+        release.wait(2)
+        return 'snapshot'
+
+    def request():
+        results.append(scheduler.submit('ticker', fn, key=('ticker', 'KRW-BTC')))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: calls)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert results == ['snapshot'] * 4
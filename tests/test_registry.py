@@ -0,0 +1,42 @@
+import pytest
+
+from modules.registry import StrategyRegistry
+
+
+def test_defaults_resolve_for_every_key():
+    registry = StrategyRegistry()
+    for key in registry.keys():
+        registry.resolve_params(key)
+
+
+@pytest.mark.parametrize('key, params', [
+    ('MACD', {'fast': 26, 'slow': 12}),
+    ('MACD', {'fast': 20, 'slow': 20}),
+    ('TrendFollow', {'fast': 30}),
+    ('SMA', {'short_period': 20, 'long_period': 10}),
+    ('MultiMA', {'short_period': 30}),
+    ('MultiMA', {'mid_period': 70}),
+    ('RSI', {'oversold': 70, 'overbought': 30}),
+    ('RSI', {'oversold': 50, 'overbought': 50}),
+    ('Williams', {'oversold': -10}),
+    ('MomentumRev', {'overbought': 20}),
+])
+def test_ordered_params_rejected(key, params):
+    with pytest.raises(ValueError):
+        StrategyRegistry().resolve_params(key, params)
+
+
+def test_range_and_unknown_params_rejected():
+    registry = StrategyRegistry()
+    with pytest.raises(ValueError):
+        registry.resolve_params('RSI', {'period': 1})
+    with pytest.raises(ValueError):
+        registry.resolve_params('RSI', {'window': 14})
+
+
+def test_get_warms_new_instance_and_reuses_it(make_candles):
+    registry = StrategyRegistry()
+    strategy = registry.get('RSI', 'KRW-BTC', data=make_candles(200, frame=True))
+    assert strategy.rsi.value is not None
+    assert registry.get('RSI', 'KRW-BTC') is strategy
+    assert registry.get('RSI', 'KRW-ETH') is not strategy
@@ -0,0 +1,124 @@
+import pytest
+import requests
+
+from modules.exchange_client import UpbitClient, UpbitAPIError, TooManyRequestsError, parse_remaining_req
+from modules.rate_limiter import RequestScheduler
+from modules.sim_exchange import SimExchangeServer, SyntheticCandles
+
+START = 1735657200  # 모의 거래소 시계 (UTC epoch 초)
+FEE = 0.0005
+KRW = 1000000.0
+ACCESS_KEY = 'sim-access-key'
+SECRET_KEY = 'sim-secret-key-for-hs256-signing-0000'
+
+
+@pytest.fixture
+def server():
+    with SimExchangeServer(SyntheticCandles(seed=2), clock=lambda: START, krw=KRW, fee=FEE,
+                           access_key=ACCESS_KEY, secret_key=SECRET_KEY) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = UpbitClient(ACCESS_KEY, SECRET_KEY, base_url=server.base_url)
+    yield client
+    client.close()
+
+
+def balances(client):
+    return {item['currency']: (float(item['balance']), float(item['locked'])) for item in client.get_accounts()}
+
+
+def test_limit_order_is_placed_and_cancelled(server, client):
+    price = server.broker.price('KRW-BTC')
+    # 현재가보다 한참 낮은 매수 주문은 체결되지 않고 대기한다
+    bid_price = round(price * 0.5)
+    order = client.place_order('KRW-BTC', 'bid', volume=2.0, price=bid_price)
+    assert order['state'] == 'wait'
+    locked = bid_price * 2.0 * (1 + FEE)
+    assert balances(client)['KRW'] == pytest.approx((KRW - locked, locked))
+    assert [o['uuid'] for o in client.get_orders('KRW-BTC')] == [order['uuid']]
+
+    cancelled = client.cancel_order(order['uuid'])
+    assert cancelled['state'] == 'cancel'
+    assert client.get_order(order['uuid'])['state'] == 'cancel'
+    assert balances(client)['KRW'] == (KRW, 0.0)
+    assert client.get_orders('KRW-BTC') == []
+
+    with pytest.raises(UpbitAPIError) as error:
+        client.cancel_order(order['uuid'])
+    assert error.value.status == 400
+
+
+def test_market_orders_settle_with_fees(server, client):
+    bought = client.place_order('KRW-BTC', 'bid', price=100000, ord_type='price')
+    bought = client.get_order(bought['uuid'])
+    assert bought['state'] == 'done'
+    funds, fee, volume = (float(bought[key]) for key in ('executed_funds', 'paid_fee', 'executed_volume'))
+    assert fee == pytest.approx(funds * FEE)
+    after_buy = balances(client)
+    assert after_buy['KRW'] == pytest.approx((KRW - funds - fee, 0.0))
+    assert after_buy['BTC'] == pytest.approx((volume, 0.0))
+
+    sold = client.get_order(client.place_order('KRW-BTC', 'ask', volume=volume, ord_type='market')['uuid'])
+    sell_funds, sell_fee = float(sold['executed_funds']), float(sold['paid_fee'])
+    assert sell_fee == pytest.approx(sell_funds * FEE)
+    after_sell = balances(client)
+    assert after_sell['KRW'] == pytest.approx((KRW - funds - fee + sell_funds - sell_fee, 0.0))
+    assert 'BTC' not in after_sell
+    # 같은 시각의 호가에서 사고팔았으므로 호가 차이와 수수료만큼 줄어든다
+    assert after_sell['KRW'][0] < KRW
+
+
+def test_order_errors(server, client):
+    with pytest.raises(UpbitAPIError) as error:
+        client.place_order('KRW-BTC', 'bid', price=1000, ord_type='price')
+    assert error.value.name == 'under_min_total_bid'
+    with pytest.raises(UpbitAPIError) as error:
+        client.place_order('KRW-BTC', 'bid', price=KRW * 2, ord_type='price')
+    assert error.value.name == 'insufficient_funds_bid'
+
+
+def test_jwt_is_verified(server):
+    forged = UpbitClient(ACCESS_KEY, SECRET_KEY[::-1], base_url=server.base_url)
+    with pytest.raises(UpbitAPIError) as error:
+        forged.get_accounts()
+    assert (error.value.status, error.value.name) == (401, 'jwt_verification')
+    other_key = UpbitClient('other-access-key', SECRET_KEY, base_url=server.base_url)
+    with pytest.raises(UpbitAPIError) as error:
+        other_key.get_accounts()
+    assert error.value.name == 'invalid_access_key'
+    forged.close()
+    other_key.close()
+
+
+def test_rate_limit_returns_429_with_remaining_req():
+    with SimExchangeServer(clock=lambda: START, rate_limits={'default': 2, 'ticker': 2}) as server:
+        url = server.base_url + '/v1/ticker'
+        responses = [requests.get(url, params={'markets': 'KRW-BTC'}) for _ in range(3)]
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert [parse_remaining_req(r.headers['Remaining-Req'])['sec'] for r in responses] == [1, 0, 0]
+        assert parse_remaining_req(responses[2].headers['Remaining-Req'])['group'] == 'ticker'
+        assert responses[2].json()['error']['name'] == 'too_many_requests'
+        assert server.rejected_count == 1
+
+        # 재시도 없는 클라이언트는 429를 그대로 돌려받는다
+        client = UpbitClient(base_url=server.base_url,
+                             scheduler=RequestScheduler({'default': 100, 'ticker': 100}, max_retries=0))
+        with pytest.raises(TooManyRequestsError):
+            for _ in range(5):
+                client.get_ticker('KRW-BTC')
+        client.close()
+
+
+def test_client_retries_after_429():
+    with SimExchangeServer(clock=lambda: START, rate_limits={'default': 5, 'ticker': 5}) as server:
+        client = UpbitClient(base_url=server.base_url,
+                             scheduler=RequestScheduler({'default': 100, 'ticker': 100}, backoff=0.1))
+        tickers = [client.get_ticker(['KRW-BTC', 'KRW-ETH']) for _ in range(8)]
+        client.close()
+    assert all([t['market'] for t in ticker] == ['KRW-BTC', 'KRW-ETH'] for ticker in tickers)
+    assert server.rejected_count > 0
+    assert server.endpoint_counts['GET /v1/ticker'] == 8
+    assert client.last_remaining_req['ticker']['min'] == 1800
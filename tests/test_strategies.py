@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.candles import CandleWindow
+from modules.registry import strategy_registry
+from modules.indicators import RollingSum
+from modules.strategies import evaluate_strategy, StreamingStrategy, AIFullStrategy, BUY, SELL, HOLD
+
+
+@pytest.mark.parametrize('key', strategy_registry.keys())
+def test_bar_by_bar_decisions_match_vector_signals(key, make_candles):
+    # 닫힌 봉을 하나씩 반영한 판단이 전체 구간 벡터 신호와 같아야 한다
+    arrays = make_candles(600, seed=1)
+    buy, sell = strategy_registry.create(key).signals(arrays)
+    expected = np.where(buy, BUY, np.where(sell, SELL, HOLD)).tolist()
+
+    strategy = strategy_registry.create(key)
+    window = CandleWindow(arrays, 'KRW-BTC', 'minute5', closed=True)
+    actions = [evaluate_strategy(strategy, window.move(i + 1))['action'] for i in range(len(arrays['close']))]
+    assert actions == expected
+
+
+def test_ai_stream_matches_kernel_analysis(make_candles):
+    arrays = make_candles(400, seed=1)
+    strategy = AIFullStrategy()
+    expected = strategy.build_analysis(arrays, None)
+    window = CandleWindow(arrays, 'KRW-BTC', 'minute5')
+    for end in (50, 130, 250, 400):
+        # 열린 마지막 봉은 미리보기로 계산된다
+        last = strategy.latest(window.move(end))
+        for name, values in expected.items():
+            np.testing.assert_allclose(last[name], values[end - 1], rtol=1e-7, atol=1e-9, err_msg=name)
+
+
+def test_ai_latest_without_time_index_uses_kernels(make_candles):
+    arrays = make_candles(300, seed=1)
+    frame = pd.DataFrame({column: arrays[column] for column in ('open', 'high', 'low', 'close', 'volume')})
+    strategy = AIFullStrategy()
+    last = strategy.latest(frame)
+    assert last['market_phase'] == strategy.build_analysis(arrays, None)['market_phase'][-1]
+    assert strategy.stream.values is None
+
+
+class CrossStrategy(StreamingStrategy):
+    """_series 없이 스트리밍 지표만 있는 전략 (종가가 이동평균을 넘으면 매수)"""
+    def __init__(self, period=5):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.sums = RollingSum(self.period)
+
+    def _mean(self, total):
+        return None if total is None else total / self.period
+
+    def _update(self, bar):
+        return self._mean(self.sums.update(bar['close']))
+
+    def _peek(self, bar):
+        return self._mean(self.sums.peek(bar['close']))
+
+    def _buy(self, values, bar):
+        return bar['close'] > values
+
+    def _sell(self, values, bar):
+        return bar['close'] < values
+
+
+def test_streaming_hooks_are_abstract():
+    class Incomplete(StreamingStrategy):
+        def _update(self, bar):
+            return None
+
+        def _peek(self, bar):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_strategy_without_series_streams_signals(make_candles):
+    arrays = make_candles(200, seed=1)
+    strategy = CrossStrategy()
+    assert not strategy.supports_batch
+    assert all(strategy_registry.create(key).supports_batch for key in strategy_registry.keys()
+               if isinstance(strategy_registry.create(key), StreamingStrategy))
+
+    buy, sell = strategy.signals(arrays)
+    close = arrays['close']
+    sma = np.convolve(close, np.ones(5) / 5, mode='valid')
+    np.testing.assert_array_equal(buy[4:], close[4:] > sma)
+    np.testing.assert_array_equal(sell[4:], close[4:] < sma)
+    assert not buy[:4].any() and not sell[:4].any()
@@ -0,0 +1,104 @@
+import json
+import time
+import queue
+
+import pytest
+
+from modules.stream import MarketStream
+from modules.replay_server import ReplayServer, MessageRecorder, load_messages
+
+
+def make_messages(count=5, markets=('KRW-BTC', 'KRW-ETH'), types=('ticker', 'trade', 'orderbook')):
+    """유형/마켓마다 순번(seq)을 붙인 재생용 메시지"""
+    return [{'type': stream_type, 'code': market, 'seq': i, 'trade_price': 100.0 + i}
+            for i in range(count) for market in markets for stream_type in types]
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("대기 시간 초과")
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def run_stream():
+    streams = []
+
+    def run(server, markets, types, callbacks=None, **kwargs):
+        stream = MarketStream(markets, types=types, uri=server.uri, reconnect_delay=0.01, **kwargs)
+        received = []
+        stream.subscribe('*', received.append)
+        for stream_type, callback in (callbacks or {}).items():
+            stream.subscribe(stream_type, callback)
+        streams.append(stream)
+        stream.start()
+        return stream, received
+
+    yield run
+    for stream in streams:
+        stream.stop()
+
+
+def test_unknown_stream_type_is_rejected():
+    with pytest.raises(ValueError):
+        MarketStream(['KRW-BTC'], types=('candle',))
+
+
+def test_subscription_message_lists_types_and_codes():
+    request = json.loads(MarketStream(['KRW-BTC', 'KRW-ETH'], types=('ticker', 'trade')).subscription_message())
+    assert [item.get('type') for item in request[1:-1]] == ['ticker', 'trade']
+    assert all(item['codes'] == ['KRW-BTC', 'KRW-ETH'] for item in request[1:-1])
+    assert request[-1] == {'format': 'DEFAULT'}
+
+
+def test_server_filters_by_type_and_code(run_stream):
+    with ReplayServer(make_messages()) as server:
+        tickers = []
+        stream, received = run_stream(server, ['KRW-BTC'], ('ticker', 'trade'), {'ticker': tickers.append})
+        wait_until(lambda: len(received) == 10)
+        time.sleep(0.05)
+
+    assert len(received) == 10
+    assert {(m['type'], m['code']) for m in received} == {('ticker', 'KRW-BTC'), ('trade', 'KRW-BTC')}
+    assert [m['seq'] for m in received if m['type'] == 'trade'] == list(range(5))
+    assert [m['seq'] for m in tickers] == list(range(5))
+
+
+def test_reconnects_after_server_drops(run_stream):
+    messages = make_messages(count=5, markets=('KRW-BTC',), types=('trade',))
+    with ReplayServer(messages, drop_after=3) as server:
+        stream, received = run_stream(server, ['KRW-BTC'], ('trade',))
+        wait_until(lambda: stream.reconnect_count >= 2 and len(received) >= 9)
+        assert server.connection_count >= 3
+
+    # 연결마다 처음부터 drop_after개를 받는다
+    assert [m['seq'] for m in received[:9]] == [0, 1, 2] * 3
+
+
+def test_queue_keeps_latest_messages_on_overflow(run_stream):
+    messages = make_messages(count=10, markets=('KRW-BTC',), types=('ticker',))
+    message_queue = queue.Queue(maxsize=3)
+    with ReplayServer(messages) as server:
+        stream, received = run_stream(server, ['KRW-BTC'], ('ticker',), message_queue=message_queue)
+        wait_until(lambda: stream.message_count == 10)
+
+    # 콜백은 모든 메시지를 받고, 큐에는 가장 최근 3개만 남는다
+    assert len(received) == 10
+    assert [message_queue.get_nowait()['seq'] for _ in range(3)] == [7, 8, 9]
+    assert message_queue.empty()
+
+
+def test_recorded_messages_replay(tmp_path, run_stream):
+    path = tmp_path / 'stream.jsonl'
+    recorder = MessageRecorder(str(path))
+    messages = make_messages(count=3, markets=('KRW-BTC',), types=('ticker',))
+    for message in messages:
+        recorder(message)
+    assert load_messages(str(path)) == messages
+
+    with ReplayServer(path=str(path)) as server:
+        stream, received = run_stream(server, ['KRW-BTC'], ('ticker',))
+        wait_until(lambda: len(received) == 3)
+    assert received == messages
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.candle_db import from_timestamps
+from modules.walk_forward import make_folds, fold_bounds, stitch, walk_forward, SECONDS_PER_DAY
+
+DAY = SECONDS_PER_DAY
+START = 1704067200  # 2024-01-01 00:00 (KST epoch 초)
+
+
+@pytest.fixture
+def make_hourly(make_candles):
+    """days일 길이의 시간봉 캔들 배열 (ts 포함)"""
+    return lambda days, seed=0: make_candles(days * DAY // 3600, seed=seed, step=3600, start=START)
+
+
+def test_rolling_folds():
+    folds = make_folds(0, 10 * DAY, 4 * DAY, 2 * DAY)
+    assert folds == [
+        (0, 4 * DAY, 4 * DAY, 6 * DAY),
+        (2 * DAY, 6 * DAY, 6 * DAY, 8 * DAY),
+        (4 * DAY, 8 * DAY, 8 * DAY, 10 * DAY),
+    ]
+
+
+def test_anchored_folds_and_short_last_fold():
+    folds = make_folds(0, 9 * DAY, 4 * DAY, 2 * DAY, anchored=True)
+    assert folds == [
+        (0, 4 * DAY, 4 * DAY, 6 * DAY),
+        (0, 6 * DAY, 6 * DAY, 8 * DAY),
+        (0, 8 * DAY, 8 * DAY, 9 * DAY),
+    ]
+
+
+def test_no_folds_when_period_shorter_than_train():
+    assert make_folds(0, 4 * DAY, 4 * DAY, 1 * DAY) == []
+
+
+def test_fold_bounds_are_bar_positions():
+    ts = np.arange(0, 10 * DAY, DAY, dtype=np.int64)
+    folds = make_folds(0, 10 * DAY, 4 * DAY, 3 * DAY)
+    bounds = fold_bounds({'KRW-BTC': {'ts': ts}}, folds)
+    assert bounds == {'KRW-BTC': [(0, 4, 4, 7), (3, 7, 7, 10)]}
+
+
+def test_stitch_chains_equity_levels():
+    pieces = [
+        (np.array([0, 60]), np.array([1.0, 1.1])),
+        (np.array([120, 180]), np.array([1.0, 0.5])),
+        (np.array([240]), np.array([2.0])),
+    ]
+    curve = stitch(pieces)
+    np.testing.assert_allclose(curve.to_numpy(), [1.0, 1.1, 1.1, 0.55, 1.1])
+    assert curve.index.equals(from_timestamps(np.array([0, 60, 120, 180, 240])))
+
+
+def test_walk_forward_requires_candles():
+    empty = {'ts': np.array([], dtype=np.int64), 'close': np.array([])}
+    with pytest.raises(ValueError, match="캔들"):
+        walk_forward('RSI', [{'period': 14}], {}, 4, 2, workers=1)
+    with pytest.raises(ValueError, match="캔들"):
+        walk_forward('RSI', [{'period': 14}], {'KRW-BTC': empty}, 4, 2, workers=1)
+
+
+def test_walk_forward_requires_period_longer_than_train(make_hourly):
+    with pytest.raises(ValueError, match="학습 구간"):
+        walk_forward('RSI', [{'period': 14}], {'KRW-BTC': make_hourly(5)}, 10, 2, workers=1)
+
+
+def test_walk_forward_single_process(make_hourly):
+    data = {'KRW-BTC': make_hourly(40, seed=1), 'KRW-ETH': make_hourly(40, seed=2)}
+    candidates = [{'period': period} for period in (7, 14, 21)]
+    result = walk_forward('RSI', candidates, data, train_days=10, test_days=10, workers=1,
+                          stop_loss=0, take_profit=0)
+
+    folds = result['folds']
+    assert list(folds['fold']) == [0, 1, 2]
+    assert set(folds['period']) <= {7, 14, 21}
+    assert (folds['test_start'] == folds['train_end']).all()
+    equity = result['equity']
+    assert list(equity.columns) == ['KRW-BTC', 'KRW-ETH', 'portfolio']
+    # 검증 구간(10~40일)만 이어 붙인다
+    assert equity.index[0] == from_timestamps([START + 10 * DAY])[0]
+    assert len(equity) == 30 * 24
+    np.testing.assert_allclose(equity['portfolio'], equity[['KRW-BTC', 'KRW-ETH']].mean(axis=1))
+    assert isinstance(result['stability'], pd.DataFrame)
+    assert list(result['stability']['param']) == ['period']